@@ -15,6 +15,8 @@
 #include <stdbool.h>
 #define DISTRIBUTION_BOUND 1024
 #define BM_PRINT_DELIMITER ';'
+/* version of the JSON record, incremented when its members change */
+#define BM_RECORD_VERSION 2
 
 /**
  * parameters
@@ -32,16 +34,20 @@ pthread_barrier_t g_stop_barrier;
 bm_stat_t g_stats;
 bm_params_t g_params;
 size_t g_ops[DISTRIBUTION_BOUND];
+/* when the process started, after the start signal */
+uint64_t g_start_ts_ns;
 
 /* functions prototypes */
 void bm_phase_warmup(void);
 void bm_phase_run(void);
 void bm_phase_conclude(void);
 void bm_phase_cooldown(void);
+void bm_print_record(void);
 
 int
 main(int argc, char *argv[])
 {
+    g_start_ts_ns = read_boottime_ns();
     bm_error_t ret =
         bm_params_extract(argc, argv, &g_params, bm_target_op_count());
     if (ret != BM_ERR_NONE) {
@@ -218,11 +224,26 @@ void
 bm_phase_conclude(void)
 {
     bm_target_destroy(g_params.num_threads);
-    bm_print_params(&g_params, BM_PRINT_DELIMITER);
-    bm_print_stats(&g_stats, BM_PRINT_DELIMITER, bm_target_op_count());
+    if (g_params.output == BM_OUTPUT_JSON) {
+        bm_print_record();
+    } else {
+        bm_print_params(&g_params, BM_PRINT_DELIMITER);
+        bm_print_stats(&g_stats, BM_PRINT_DELIMITER, bm_target_op_count());
+    }
     printf("\n");
 }
 
+/* prints the parameters and the stats of the run as a JSON object on one line */
+void
+bm_print_record(void)
+{
+    printf("{\"version\":%d,\"params\":", BM_RECORD_VERSION);
+    bm_print_params_json(&g_params);
+    printf(",\"start_ts_ns\":%llu,", (unsigned long long)g_start_ts_ns);
+    bm_print_stats_json(&g_stats, bm_target_op_count());
+    printf("}");
+}
+
 void
 bm_phase_cooldown(void)
 {
@@ -21,8 +21,18 @@
 #define PARAM_DURATION  "-d=([0-9]+)"
 #define PARAM_INIT_SIZE "-s=([0-9]+)"
 #define PARAM_OP_DIST   "-op([0-9]+)=([0-9]+)"
+#define PARAM_OUTPUT    "-o="
 
-#define PARAM_FIXED_LEN 5
+#define PARAM_FIXED_LEN    5
+#define PARAM_OPTIONAL_LEN 1
+
+/* format of the results printed at the end of the run */
+typedef enum bm_output_e {
+    /* a line of `<key>=<val>;` pairs */
+    BM_OUTPUT_TEXT = 0,
+    /* a line with a JSON object, see bm_print_record */
+    BM_OUTPUT_JSON,
+} bm_output_t;
 
 typedef struct bm_params_s {
     uint32_t num_threads;
@@ -31,6 +41,7 @@ typedef struct bm_params_s {
     uint32_t duration;
     uint32_t *op_dist;
     uint32_t op_dist_len;
+    bm_output_t output;
 } bm_params_t;
 
 static inline bm_error_t
@@ -93,6 +104,22 @@ _bm_param_check_match_op(char *param, char *regex, uint32_t *output,
     return false;
 }
 
+static inline bool
+_bm_param_check_output(char *param, bm_output_t *output)
+{
+    if (strncmp(param, PARAM_OUTPUT, strlen(PARAM_OUTPUT)) != 0)
+        return false;
+
+    char *format = param + strlen(PARAM_OUTPUT);
+    if (strcmp(format, "text") == 0)
+        *output = BM_OUTPUT_TEXT;
+    else if (strcmp(format, "json") == 0)
+        *output = BM_OUTPUT_JSON;
+    else
+        return false;
+    return true;
+}
+
 static inline bool
 _bm_params_match_field(bm_params_t *out_params, char *param)
 {
@@ -112,6 +139,9 @@ _bm_params_match_field(bm_params_t *out_params, char *param)
                                  out_params->op_dist_len))
         return true;
 
+    if (_bm_param_check_output(param, &out_params->output))
+        return true;
+
     return false;
 }
 
@@ -128,6 +158,22 @@ bm_print_params(bm_params_t *out_params, char delimiter)
     }
 }
 
+static inline void
+bm_print_params_json(bm_params_t *out_params)
+{
+    printf("{\"num_threads\":%u,", out_params->num_threads);
+    printf("\"init_sz\":%u,", out_params->init_sz);
+    printf("\"max_noise\":%u,", out_params->max_noise);
+    printf("\"duration\":%u,", out_params->duration);
+
+    printf("\"op_dist\":[");
+    for (size_t i = 0; i < out_params->op_dist_len; i++) {
+        printf(i + 1 < out_params->op_dist_len ? "%u," : "%u",
+               out_params->op_dist[i]);
+    }
+    printf("]}");
+}
+
 static inline void
 _bm_params_init(bm_params_t *out_params)
 {
@@ -135,6 +181,7 @@ _bm_params_init(bm_params_t *out_params)
     out_params->init_sz     = PARAM_VAL_NONE;
     out_params->max_noise   = PARAM_VAL_NONE;
     out_params->duration    = PARAM_VAL_NONE;
+    out_params->output      = BM_OUTPUT_TEXT;
 
     for (size_t i = 0; i < out_params->op_dist_len; i++) {
         out_params->op_dist[i] = PARAM_VAL_NONE;
@@ -167,17 +214,29 @@ bm_params_extract(int argc, char *argv[], bm_params_t *out_params,
     assert(out_params);
 
     int expected_num_params = PARAM_FIXED_LEN + num_ops;
-    if (argc != expected_num_params) {
+    /* the optional parameters, e.g. the output format, may be omitted but
+     * cannot replace a required one */
+    int num_optional_params = 0;
+    for (int i = 1; i < argc; i++) {
+        if (strncmp(argv[i], PARAM_OUTPUT, strlen(PARAM_OUTPUT)) == 0)
+            num_optional_params++;
+    }
+    if (num_optional_params > PARAM_OPTIONAL_LEN ||
+        argc - num_optional_params != expected_num_params) {
         return BM_ERR_PARAMS_INCORRECT_COUNT;
     }
 
-    out_params->op_dist = malloc(sizeof(uint32_t) * num_ops);
+    out_params->op_dist     = malloc(sizeof(uint32_t) * num_ops);
+    out_params->op_dist_len = num_ops;
     // init params
     _bm_params_init(out_params);
-    out_params->op_dist_len = num_ops;
 
     for (int i = 1; i < argc; i++) {
-        _bm_params_match_field(out_params, argv[i]);
+        if (!_bm_params_match_field(out_params, argv[i]) &&
+            strncmp(argv[i], PARAM_OUTPUT, strlen(PARAM_OUTPUT)) == 0) {
+            /* unknown output format */
+            return BM_ERR_PARAMS_CANNOT_PARSE;
+        }
     }
 
     // check all parameters have been set
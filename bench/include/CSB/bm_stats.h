@@ -7,6 +7,7 @@
 
 #include <stdlib.h>
 #include <stdint.h>
+#include <math.h>
 #include "bm_target.h"
 #include "math.h"
 
@@ -146,47 +147,57 @@ bm_stat_add_spent_time(bm_stat_t *stats, uint64_t min_duration_clk,
     stats->max_duration_ms  = max_duration_ms;
 }
 
+/* stats of all the threads, per operation and regardless of the operation */
+typedef struct bm_stat_summary_s {
+    bm_op_stat_t *ops;
+    size_t len;
+    bm_op_stat_t univ;
+    double throughput_max;
+    double throughput_min;
+    double throughput_max_ts;
+    double throughput_min_ts;
+    uint64_t ticks_to_ms;
+    uint64_t sys_time;
+    uint64_t usr_time;
+    uint64_t max_rss_kb;
+} bm_stat_summary_t;
+
+static inline double
+_bm_stat_avg(const bm_op_stat_t *op_stat)
+{
+    /* average operation time */
+    return op_stat->count != 0 ?
+               ((double)op_stat->sum) / ((double)op_stat->count) :
+               0;
+}
+
+static inline double
+_bm_stat_succ_percent(const bm_op_stat_t *op_stat)
+{
+    /* success percent of operations */
+    return op_stat->count != 0 ?
+               ((double)op_stat->succ_count * 100U) / ((double)op_stat->count) :
+               0;
+}
+
+/**
+ * Merges the stats of all threads, `summary->ops` must hold `op_len` elements.
+ */
 static inline void
-bm_print_stats(bm_stat_t *stats, char delimiter, const size_t op_len)
+bm_stat_summarize(bm_stat_t *stats, const size_t op_len,
+                  bm_stat_summary_t *summary)
 {
     assert(stats);
-    char op_name[STAT_OP_NAME_op_name_MAX_LEN] = {0};
-    /* stats per operation type */
-    uint64_t max[op_len]; /* max operation time */
-    uint64_t min[op_len]; /* min operation time */
-    uint64_t sum[op_len]; /* sum of time for all operations of the same type */
-    uint64_t count[op_len];      /* count of operations of a certain type */
-    uint64_t succ_count[op_len]; /* count of successful (returned true)
-                                     operations of a certain type */
-    uint64_t skipped_count[op_len];
-    uint64_t histogram_data[op_len]
-                           [STAT_MAX_NUM_BUCKETS]; /* merge threads data */
-    double avg[op_len];          /* average operation time of certain type */
-    double succ_percent[op_len]; /* success percent of operations */
-
-    /* universal stats regardless of operation type */
-    uint64_t univ_max           = 0;
-    uint64_t univ_min           = UINT64_MAX;
-    uint64_t univ_sum           = 0;
-    uint64_t univ_count         = 0;
-    uint64_t univ_succ_count    = 0;
-    uint64_t univ_skipped_count = 0;
-    double univ_succ_percent    = 0;
-    double univ_avg             = 0;
     bm_thread_stat_t *thrd_stat = NULL;
+    bm_op_stat_t *univ          = &summary->univ;
 
-    /* init op stats arrays */
+    /* init op stats */
+    summary->len = op_len;
+    memset(summary->ops, 0, op_len * sizeof(bm_op_stat_t));
+    memset(univ, 0, sizeof(bm_op_stat_t));
+    univ->min = UINT64_MAX;
     for (size_t op = 0; op < op_len; op++) {
-        max[op]           = 0;
-        min[op]           = UINT64_MAX;
-        sum[op]           = 0;
-        count[op]         = 0;
-        avg[op]           = 0;
-        succ_percent[op]  = 0;
-        succ_count[op]    = 0;
-        skipped_count[op] = 0;
-        for (size_t i = 0; i < STAT_MAX_NUM_BUCKETS; i++)
-            histogram_data[op][i] = 0;
+        summary->ops[op].min = UINT64_MAX;
     }
 
     /* collect stats from all threads */
@@ -195,19 +206,75 @@ bm_print_stats(bm_stat_t *stats, char delimiter, const size_t op_len)
         assert(thrd_stat->len == op_len);
 
         for (size_t op = 0; op < op_len; op++) {
-            max[op] = VMAX(max[op], thrd_stat->ops[op].max);
-            min[op] = VMIN(min[op], thrd_stat->ops[op].min);
-            sum[op] += thrd_stat->ops[op].sum;
-            count[op] += thrd_stat->ops[op].count;
-            succ_count[op] += thrd_stat->ops[op].succ_count;
-            skipped_count[op] += thrd_stat->ops[op].skipped_count;
+            bm_op_stat_t *op_stat = &summary->ops[op];
+            op_stat->max = VMAX(op_stat->max, thrd_stat->ops[op].max);
+            op_stat->min = VMIN(op_stat->min, thrd_stat->ops[op].min);
+            op_stat->sum += thrd_stat->ops[op].sum;
+            op_stat->count += thrd_stat->ops[op].count;
+            op_stat->succ_count += thrd_stat->ops[op].succ_count;
+            op_stat->skipped_count += thrd_stat->ops[op].skipped_count;
 
             for (size_t j = 0; j < STAT_MAX_NUM_BUCKETS; j++) {
-                histogram_data[op][j] += thrd_stat->ops[op].histogram_data[j];
+                op_stat->histogram_data[j] +=
+                    thrd_stat->ops[op].histogram_data[j];
             }
         }
     }
 
+    /* collect universal stats */
+    for (size_t op = 0; op < op_len; op++) {
+        bm_op_stat_t *op_stat = &summary->ops[op];
+        univ->max             = VMAX(univ->max, op_stat->max);
+        univ->min             = VMIN(univ->min, op_stat->min);
+        univ->sum += op_stat->sum;
+        univ->count += op_stat->count;
+        univ->succ_count += op_stat->succ_count;
+        univ->skipped_count += op_stat->skipped_count;
+
+        /* overwrite with zero if no real min was found */
+        op_stat->min = ((op_stat->min == UINT64_MAX) ? 0 : op_stat->min);
+    }
+
+    // calculate #of operations per milliseconds
+    summary->throughput_max =
+        (double)(univ->count * 1000.0f) / (double)(stats->min_duration_ms);
+    summary->throughput_min =
+        (double)(univ->count * 1000.0f) / (double)(stats->max_duration_ms);
+    summary->ticks_to_ms = calc_ticks_in_ms();
+    summary->throughput_min_ts =
+        (double)(univ->count * 1000.0f * summary->ticks_to_ms) /
+        (double)(stats->max_duration_clk);
+    summary->throughput_max_ts =
+        (double)(univ->count * 1000.0f * summary->ticks_to_ms) /
+        (double)(stats->min_duration_clk);
+
+    summary->sys_time   = 0;
+    summary->usr_time   = 0;
+    summary->max_rss_kb = 0;
+    get_usr_sys_time(&summary->sys_time, &summary->usr_time,
+                     &summary->max_rss_kb);
+}
+
+static inline void
+bm_print_stats(bm_stat_t *stats, char delimiter, const size_t op_len)
+{
+    assert(stats);
+    char op_name[STAT_OP_NAME_op_name_MAX_LEN] = {0};
+    bm_op_stat_t ops[op_len];
+    bm_stat_summary_t summary = {.ops = ops};
+    bm_stat_summarize(stats, op_len, &summary);
+
+    /* stats per operation type */
+    uint64_t max[op_len]; /* max operation time */
+    uint64_t min[op_len]; /* min operation time */
+    uint64_t sum[op_len]; /* sum of time for all operations of the same type */
+    uint64_t count[op_len];      /* count of operations of a certain type */
+    uint64_t succ_count[op_len]; /* count of successful (returned true)
+                                     operations of a certain type */
+    uint64_t skipped_count[op_len];
+    double avg[op_len];          /* average operation time of certain type */
+    double succ_percent[op_len]; /* success percent of operations */
+
     char *algo_name = bm_target_get_name();
     char info[1000] = {0};
     BM_PRINT_UNIV_STAT("%s", algo_name, delimiter);
@@ -217,26 +284,19 @@ bm_print_stats(bm_stat_t *stats, char delimiter, const size_t op_len)
         BM_PRINT_EXTRA_STAT(info, delimiter);
     }
 
-    /* collect universal stats, print operation stats */
+    /* print operation stats */
     for (size_t op = 0; op < op_len; op++) {
-        univ_max = VMAX(univ_max, max[op]);
-        univ_min = VMIN(univ_min, min[op]);
-        univ_sum += sum[op];
-        univ_count += count[op];
-        univ_succ_count += succ_count[op];
-        univ_skipped_count += skipped_count[op];
-
-        /* calculate operation average time */
-        if (count[op] != 0) {
-            avg[op] = ((double)sum[op]) / ((double)count[op]);
-            succ_percent[op] =
-                ((double)succ_count[op] * 100U) / ((double)count[op]);
-        }
+        max[op]           = ops[op].max;
+        min[op]           = ops[op].min;
+        sum[op]           = ops[op].sum;
+        count[op]         = ops[op].count;
+        succ_count[op]    = ops[op].succ_count;
+        skipped_count[op] = ops[op].skipped_count;
+        avg[op]           = _bm_stat_avg(&ops[op]);
+        succ_percent[op]  = _bm_stat_succ_percent(&ops[op]);
 
         bm_target_get_op_name(op_name, STAT_OP_NAME_op_name_MAX_LEN, op);
 
-        /* overwrite with zero if no real min was found */
-        min[op] = ((min[op] == UINT64_MAX) ? 0 : min[op]);
         BM_PRINT_OP_STAT(op_name, op, "%lu", max, delimiter);
         BM_PRINT_OP_STAT(op_name, op, "%lu", min, delimiter);
         BM_PRINT_OP_STAT(op_name, op, "%lu", sum, delimiter);
@@ -249,19 +309,22 @@ bm_print_stats(bm_stat_t *stats, char delimiter, const size_t op_len)
         printf("%s_histogram=", op_name);
         for (size_t j = 0; j < STAT_MAX_NUM_BUCKETS; j++) {
             if (j + 1 < STAT_MAX_NUM_BUCKETS)
-                printf("%lu,", histogram_data[op][j]);
+                printf("%lu,", ops[op].histogram_data[j]);
             else
-                printf("%lu", histogram_data[op][j]);
+                printf("%lu", ops[op].histogram_data[j]);
         }
         printf("%c", delimiter);
     }
 
-    /* calculate universal average */
-    if (univ_count != 0) {
-        univ_avg = ((double)univ_sum) / ((double)univ_count);
-        univ_succ_percent =
-            ((double)univ_succ_count * 100U) / ((double)univ_count);
-    }
+    /* universal stats regardless of operation type */
+    uint64_t univ_max           = summary.univ.max;
+    uint64_t univ_min           = summary.univ.min;
+    uint64_t univ_sum           = summary.univ.sum;
+    uint64_t univ_count         = summary.univ.count;
+    uint64_t univ_succ_count    = summary.univ.succ_count;
+    uint64_t univ_skipped_count = summary.univ.skipped_count;
+    double univ_avg             = _bm_stat_avg(&summary.univ);
+    double univ_succ_percent    = _bm_stat_succ_percent(&summary.univ);
 
     /* print universal stats */
     BM_PRINT_UNIV_STAT("%zu", univ_max, delimiter);
@@ -273,16 +336,11 @@ bm_print_stats(bm_stat_t *stats, char delimiter, const size_t op_len)
     BM_PRINT_UNIV_STAT("%.2f", univ_avg, delimiter);
     BM_PRINT_UNIV_STAT("%.2f", univ_succ_percent, delimiter);
 
-    // calculate #of operations per milliseconds
-    double throughput_max =
-        (double)(univ_count * 1000.0f) / (double)(stats->min_duration_ms);
-    double throughput_min =
-        (double)(univ_count * 1000.0f) / (double)(stats->max_duration_ms);
-    uint64_t ticks_to_ms     = calc_ticks_in_ms();
-    double throughput_min_ts = (double)(univ_count * 1000.0f * ticks_to_ms) /
-                               (double)(stats->max_duration_clk);
-    double throughput_max_ts = (double)(univ_count * 1000.0f * ticks_to_ms) /
-                               (double)(stats->min_duration_clk);
+    double throughput_max    = summary.throughput_max;
+    double throughput_min    = summary.throughput_min;
+    double throughput_max_ts = summary.throughput_max_ts;
+    double throughput_min_ts = summary.throughput_min_ts;
+    uint64_t ticks_to_ms     = summary.ticks_to_ms;
 
     BM_PRINT_UNIV_STAT("%.8f", throughput_max, delimiter);
     BM_PRINT_UNIV_STAT("%.8f", throughput_min, delimiter);
@@ -300,13 +358,107 @@ bm_print_stats(bm_stat_t *stats, char delimiter, const size_t op_len)
     BM_PRINT_UNIV_STAT("%zu", duration_min_ms, delimiter);
     BM_PRINT_UNIV_STAT("%zu", duration_min_clk, delimiter);
 
-    uint64_t sys_time   = 0;
-    uint64_t usr_time   = 0;
-    uint64_t max_rss_kb = 0;
-    get_usr_sys_time(&sys_time, &usr_time, &max_rss_kb);
+    uint64_t sys_time   = summary.sys_time;
+    uint64_t usr_time   = summary.usr_time;
+    uint64_t max_rss_kb = summary.max_rss_kb;
     BM_PRINT_UNIV_STAT("%lu", sys_time, delimiter);
     BM_PRINT_UNIV_STAT("%lu", usr_time, delimiter);
     BM_PRINT_UNIV_STAT("%lu", max_rss_kb, delimiter);
 }
 
+/* JSON has no representation for infinity and NaN */
+static inline void
+_bm_print_json_double(const char *name, const char *fmt, double value)
+{
+    printf("\"%s\":", name);
+    if (isfinite(value))
+        printf(fmt, value);
+    else
+        printf("null");
+}
+
+static inline void
+_bm_print_json_str(const char *str)
+{
+    printf("\"");
+    for (const char *c = str; *c != '\0'; c++) {
+        if (*c == '"' || *c == '\\')
+            printf("\\%c", *c);
+        else if ((unsigned char)*c < 0x20)
+            printf("\\u%04x", *c);
+        else
+            printf("%c", *c);
+    }
+    printf("\"");
+}
+
+static inline void
+_bm_print_json_op_stat(const bm_op_stat_t *op_stat)
+{
+    printf("\"max\":%lu,\"min\":%lu,\"sum\":%lu,\"count\":%lu,"
+           "\"succ_count\":%lu,\"skipped_count\":%lu,",
+           op_stat->max, op_stat->min, op_stat->sum, op_stat->count,
+           op_stat->succ_count, op_stat->skipped_count);
+    _bm_print_json_double("avg", "%.2f", _bm_stat_avg(op_stat));
+    printf(",");
+    _bm_print_json_double("succ_percent", "%.2f",
+                          _bm_stat_succ_percent(op_stat));
+}
+
+/**
+ * Prints the stats as the members of a JSON object: the counters of each operation
+ * with its histogram as an array, the universal counters, the throughput, the
+ * durations and the resource usage.
+ */
+static inline void
+bm_print_stats_json(bm_stat_t *stats, const size_t op_len)
+{
+    assert(stats);
+    char op_name[STAT_OP_NAME_op_name_MAX_LEN] = {0};
+    bm_op_stat_t ops[op_len];
+    bm_stat_summary_t summary = {.ops = ops};
+    bm_stat_summarize(stats, op_len, &summary);
+
+    char info[1000] = {0};
+    printf("\"target\":");
+    _bm_print_json_str(bm_target_get_name());
+    bm_target_extra_info(info, sizeof(info));
+    printf(",\"extra\":");
+    _bm_print_json_str(info);
+
+    printf(",\"ops\":[");
+    for (size_t op = 0; op < op_len; op++) {
+        bm_target_get_op_name(op_name, STAT_OP_NAME_op_name_MAX_LEN, op);
+        printf("{\"name\":");
+        _bm_print_json_str(op_name);
+        printf(",");
+        _bm_print_json_op_stat(&ops[op]);
+        printf(",\"histogram\":[");
+        for (size_t j = 0; j < STAT_MAX_NUM_BUCKETS; j++) {
+            printf(j + 1 < STAT_MAX_NUM_BUCKETS ? "%lu," : "%lu",
+                   ops[op].histogram_data[j]);
+        }
+        printf("]}%s", op + 1 < op_len ? "," : "");
+    }
+    printf("],\"univ\":{");
+    _bm_print_json_op_stat(&summary.univ);
+
+    printf("},\"throughput\":{");
+    _bm_print_json_double("max", "%.8f", summary.throughput_max);
+    printf(",");
+    _bm_print_json_double("min", "%.8f", summary.throughput_min);
+    printf(",");
+    _bm_print_json_double("max_ts", "%.8f", summary.throughput_max_ts);
+    printf(",");
+    _bm_print_json_double("min_ts", "%.8f", summary.throughput_min_ts);
+    printf("},\"ticks_to_ms\":%lu", summary.ticks_to_ms);
+
+    printf(",\"duration\":{\"max_ms\":%lu,\"max_clk\":%lu,\"min_ms\":%lu,"
+           "\"min_clk\":%lu}",
+           stats->max_duration_ms, stats->max_duration_clk,
+           stats->min_duration_ms, stats->min_duration_clk);
+    printf(",\"rusage\":{\"sys_time\":%lu,\"usr_time\":%lu,\"max_rss_kb\":%lu}",
+           summary.sys_time, summary.usr_time, summary.max_rss_kb);
+}
+
 #endif
@@ -73,6 +73,18 @@ record_time(cpu_time_t *_time)
     clock_gettime(CLOCK_REALTIME, _time);
 }
 
+/**
+ * Returns the time since boot in nanoseconds, the clock of the start stamps
+ * of the execution units, which is not changed by NTP and shared by containers.
+ */
+static inline uint64_t
+read_boottime_ns(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_BOOTTIME, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ULL + (uint64_t)ts.tv_nsec;
+}
+
 /**
  * Reads user and system time for the calling process.
  *
@@ -10,16 +10,26 @@ from benchkit.benchmark import (
     CommandAttachment,
     RecordResult,
 )
+import json
+import math
 import sys
+from statistics import mean
 from benchkit.dependencies.packages import PackageDependency
 from typing import Iterable, Optional, Dict, Any, List
 import bm_utils
+import bm_snapshot
 from bm_container import Containers
 from bm_process import Processes
+from bm_cgroup import CgroupProcesses
+from bm_namespace import NamespaceProcesses
+from config.application import Application
 from config.benchmark import ExecutionType
 import bm_config
 from bm_executer import Executer
 from utils.logger import bm_log, LogType
+from utils.stats import relative_ci
+import utils.partition
+from utils import columnar
 
 
 class ScalabilityBenchmark(Benchmark):
@@ -35,11 +45,16 @@ class ScalabilityBenchmark(Benchmark):
             command_wrappers=command_wrappers,
             command_attachments=command_attachments,
             shared_libs=shared_libs,
-            post_run_hooks=post_run_hooks,
+            post_run_hooks=list(post_run_hooks) + [self.store_columnar],
             pre_run_hooks=[],
         )
         self.csb_dir = csb_dir
         self.multi_app = False
+        # adaptive repetitions: per campaign point, the value of the metric in each repetition,
+        # the number of repetitions run, and the points that need no further repetition
+        self.adaptive_samples: dict[str, list[float]] = {}
+        self.adaptive_repeats: dict[str, int] = {}
+        self.adaptive_done: set[str] = set()
 
     def dependencies(self) -> list[PackageDependency]:
         return super().dependencies() + [
@@ -47,10 +62,33 @@ class ScalabilityBenchmark(Benchmark):
             PackageDependency("cmake"),
         ]
 
+    def get_bench_targets(self) -> list[str]:
+        """
+        Returns the builtin benchmarks used by the configuration, including the client
+        binary when a plugin uses the builtin benchmarks directory.
+        """
+        assert bm_config.g_config is not None
+        available = bm_utils.get_bench_targets(self.csb_dir)
+        targets = [
+            app.name
+            for app in bm_config.g_config.get_apps()
+            if app.path is None and app.name in available
+        ]
+        if any(
+            Application.BUILTIN_APP_DIR in arg
+            for plugin in bm_config.g_config.get_plugins()
+            for arg in plugin.args
+        ):
+            targets.append("client")
+        return list(dict.fromkeys(targets))
+
     def prebuild_bench(self, **_kwargs):
-        bm_utils.build_bench(self.csb_dir)
-        bm_utils.save_sys_config(self._base_data_dir)
-        bm_utils.save_docker_daemon_config(self._base_data_dir)
+        # in throughput mode the benchmarks are built once, before the partitions are started
+        if utils.partition.g_partition is None:
+            bm_utils.build_bench(self.csb_dir, self.get_bench_targets(), self._base_data_dir)
+        bm_snapshot.save_host_snapshot(self._base_data_dir)
+        if not columnar.is_available():
+            bm_log("pyarrow is not installed, the results are only stored in CSV", LogType.WARNING)
         # copy the configuration file and map it to the same name
         # as the csv.
         assert bm_config.g_config is not None
@@ -70,6 +108,7 @@ class ScalabilityBenchmark(Benchmark):
         noise: int,
         initial_size: int,
         container_cnt: int,
+        namespaces: str = "none",
         cpu_order: Optional[str] = None,
         master_thread_core: Optional[int] = None,
         record_data_dir: Optional[str] = None,
@@ -119,11 +158,32 @@ class ScalabilityBenchmark(Benchmark):
                     record_data_dir=record_data_dir,
                     apps=apps,
                     core_affinity_offset_list=container_cfg.get_core_affinity_offset_list(),
+                    parallelism=container_cfg.parallelism,
+                    placement=container_cfg.placement,
+                    bind_memory=container_cfg.bind_memory,
+                )
+            case ExecutionType.CGROUP:
+                executer = CgroupProcesses(
+                    config=container_cfg,
+                    count=container_cnt,
+                    home_dir=self.csb_dir,
+                    apps=apps,
+                    record_data_dir=record_data_dir,
+                )
+            case ExecutionType.NAMESPACE:
+                executer = NamespaceProcesses(
+                    config=container_cfg,
+                    namespaces=namespaces,
+                    count=container_cnt,
+                    home_dir=self.csb_dir,
+                    apps=apps,
+                    record_data_dir=record_data_dir,
                 )
             case _:
                 bm_log(f"Unsupported execution type = {execution_type}", LogType.FATAL)
                 sys.exit(1)
         assert executer is not None
+        executer.save_placement(container_cfg.placement)
         executer.exec_all(
             threads=nb_threads,
             duration=benchmark_duration_seconds,
@@ -156,11 +216,78 @@ class ScalabilityBenchmark(Benchmark):
             dicts.append(result_dict)
 
         if self.multi_app:
-            return bm_utils.dict_intersect(
+            dicts = bm_utils.dict_intersect(
                 dicts=dicts, save_dir=record_data_dir, header_dict=run_variables
             )
+        assert bm_config.g_config is not None
+        if bm_config.g_config.get_benchmark_cfg().adaptive is not None:
+            self.__record_repeat(dicts, run_variables)
+        return dicts
+
+    def store_columnar(self, experiment_results_lines: List[Dict[str, Any]], **_kwargs):
+        """
+        Post run hook appending the results of the run to the columnar store of the campaign,
+        next to its CSV.
+        """
+        if self._base_data_dir is None or not columnar.is_available():
+            return None
+        import pyarrow as pa
+
+        try:
+            columnar.append_rows(
+                columnar.get_store_path(self._base_data_dir), experiment_results_lines
+            )
+        except (pa.ArrowException, OSError) as e:
+            bm_log(f"cannot store the results of the run in the columnar store: {e}", LogType.ERROR)
+        return None
+
+    @classmethod
+    def __point_key(cls, variables: Dict[str, Any]) -> str:
+        point = {k: variables[k] for k in cls.get_run_var_names() if k in variables}
+        return json.dumps(point, sort_keys=True, default=str)
+
+    def __record_repeat(self, results: list[dict], run_variables: Dict[str, Any]):
+        """
+        Records the metric of a repetition of a campaign point, adds `rel_ci` and `repeats_used`
+        to its results, and marks the point as done once it is stable.
+        """
+        assert bm_config.g_config is not None
+        cfg = bm_config.g_config.get_benchmark_cfg().adaptive
+        assert cfg is not None
+        key = self.__point_key(run_variables)
+        values = []
+        for result in results:
+            try:
+                values.append(float(result[cfg.metric]))
+            except (KeyError, ValueError):
+                pass
+        samples = self.adaptive_samples.setdefault(key, [])
+        if values:
+            samples.append(mean(values))
         else:
-            return dicts
+            bm_log(f"{cfg.metric} is missing from the results of the run", LogType.WARNING)
+        repeats = self.adaptive_repeats.get(key, 0) + 1
+        self.adaptive_repeats[key] = repeats
+        rel_ci = relative_ci(samples, cfg.confidence)
+        stable = repeats >= cfg.min_repeat and rel_ci <= cfg.max_rel_ci
+        done = stable or repeats >= cfg.max_repeat
+        if done:
+            self.adaptive_done.add(key)
+            bm_log(
+                f"point {'stable' if stable else 'not stable'} after {repeats} repetitions, "
+                f"{cfg.metric} +/-{rel_ci * 100:.2f}%",
+                LogType.INFO,
+            )
+        for result in results:
+            # undefined with less than 2 repetitions
+            result["rel_ci"] = round(rel_ci, 4) if math.isfinite(rel_ci) else math.nan
+            result["repeats_used"] = repeats
+
+    def valid_experiment_parameters(self, **kwargs) -> bool:
+        # the remaining repetitions of a stable point are skipped
+        if self.__point_key(kwargs) in self.adaptive_done:
+            return False
+        return super().valid_experiment_parameters(**kwargs)
 
     @staticmethod
     def get_build_var_names():
@@ -177,6 +304,7 @@ class ScalabilityBenchmark(Benchmark):
             "master_thread_core",
             "container_cnt",
             "execution_type",
+            "namespaces",
         ]
 
     @staticmethod
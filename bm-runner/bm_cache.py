@@ -0,0 +1,139 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import json
+import os
+from typing import Any, Optional
+import docker.errors
+import requests.exceptions
+import bm_config
+import bm_snapshot
+import bm_utils
+from config.benchmark import ExecutionType
+from utils.docker_client import get_docker_client
+from utils.logger import bm_log, LogType
+from utils.results import read_results
+
+# Cache of the results of the campaign points, shared by all the campaigns
+CACHE_DIR = "results/points"
+
+Point = dict[str, Any]
+
+
+def get_image_digest(image: str) -> Optional[str]:
+    try:
+        return get_docker_client().images.get(image).id
+    except (docker.errors.DockerException, requests.exceptions.ConnectionError) as e:
+        bm_log(f"cannot get the digest of image {image}: {e}", LogType.WARNING)
+        return None
+
+
+def get_campaign_inputs(csb_dir, bench_targets: list[str]) -> dict[str, Any]:
+    """
+    Returns the resolved inputs of the campaign that the results of all its points depend on:
+    the applications, the configuration of the execution units, the image, the benchmark
+    binaries and the host.
+    """
+    assert bm_config.g_config is not None
+    container_cfg = bm_config.g_config.get_container_config()
+    benchmark_cfg = bm_config.g_config.get_benchmark_cfg()
+    return {
+        "apps": [
+            {
+                "name": app.name,
+                "path": str(app.path) if app.path is not None else None,
+                "args": app.args,
+                "operations": app.operations,
+                "cd": app.cd,
+            }
+            for app in bm_config.g_config.get_apps()
+        ],
+        "plugins": [dict(plugin) for plugin in bm_config.g_config.get_plugins()],
+        "duration": benchmark_cfg.duration,
+        "repeat": benchmark_cfg.repeat,
+        "adaptive": benchmark_cfg.adaptive,
+        "units": {
+            "core_count": container_cfg.core_count,
+            "core_affinity_offsets": container_cfg.get_core_affinity_offset_list(),
+            "placement": container_cfg.placement,
+            "bind_memory": container_cfg.bind_memory,
+            "parallelism": container_cfg.parallelism,
+            "cpu_max": container_cfg.cpu_max,
+            "memory_max": container_cfg.memory_max,
+        },
+        "image": {
+            "name": container_cfg.image,
+            "digest": (
+                get_image_digest(container_cfg.image)
+                if ExecutionType.CONTAINER in benchmark_cfg.exec_env
+                else None
+            ),
+        },
+        "bench": bm_utils.get_bench_hashes(csb_dir, bench_targets),
+        "host": bm_snapshot.fingerprint(bm_snapshot.get_snapshot()),
+    }
+
+
+def get_point_key(inputs: dict[str, Any], point: Point) -> str:
+    """
+    Returns the hash of the inputs of a campaign point. The image is only part of the key of
+    the points run in containers.
+    """
+    data = {k: v for k, v in inputs.items() if k != "image"}
+    if point.get("execution_type") == ExecutionType.CONTAINER:
+        data["image"] = inputs.get("image")
+    # the values are compared as they are written in the results
+    data["point"] = {k: str(v) for k, v in sorted(point.items())}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class PointCache:
+    """
+    Content-addressed store of the result rows of the campaign points. The rows of a point
+    are stored in `<key>.csv`, with its inputs in `<key>.json`.
+    """
+
+    def __init__(self, inputs: dict[str, Any], cache_dir: str = CACHE_DIR):
+        self.inputs = inputs
+        self.cache_dir = str(bm_utils.resolve_path(cache_dir))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, point: Point) -> str:
+        return os.path.join(self.cache_dir, f"{get_point_key(self.inputs, point)}.csv")
+
+    def contains(self, point: Point) -> bool:
+        return os.path.exists(self.path(point))
+
+    def missing(self, points: list[Point]) -> list[Point]:
+        return [point for point in points if not self.contains(point)]
+
+    def store(self, csv_file: str, points: list[Point]) -> int:
+        """
+        Stores the result rows of each point from the results of a campaign,
+        returns the number of points stored.
+        """
+        if not os.path.exists(csv_file):
+            return 0
+        df = read_results(csv_file, dtype=str)
+        stored = 0
+        for point in points:
+            if any(k not in df.columns for k in point):
+                continue
+            rows = df
+            for k, v in point.items():
+                rows = rows[rows[k] == str(v)]
+            if rows.empty:
+                continue
+            path = self.path(point)
+            rows.to_csv(path, sep=";", index=False)
+            with open(f"{os.path.splitext(path)[0]}.json", "w") as f:
+                json.dump(
+                    {"point": point, "inputs": self.inputs, "campaign": csv_file},
+                    f,
+                    indent=2,
+                    sort_keys=True,
+                    default=str,
+                )
+            stored += 1
+        return stored
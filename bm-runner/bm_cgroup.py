@@ -0,0 +1,137 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import sys
+from typing import Optional
+import bm_utils
+from bm_process import Process, Processes
+from config.application import Application
+from config.benchmark import ExecutionType
+from config.container import ContainersConfig
+from utils.cgroup import Cgroup, is_cgroup2, CGROUP_MOUNT
+from utils.logger import bm_log, LogType
+
+
+class CgroupProcess(Process):
+    """
+    A process launched in its own cgroup v2. The cpus, memory nodes, CPU bandwidth and memory
+    of the process are limited by the cgroup, which is removed when the process is stopped.
+    """
+
+    MEMBIND_WITH_NUMACTL = False
+
+    def __init__(
+        self,
+        idx,
+        home_dir,
+        record_data_dir,
+        core_set,
+        app: Application,
+        cgroup_root: str,
+        mems: Optional[str] = None,
+        cpu_max: Optional[str] = None,
+        memory_max: Optional[str] = None,
+    ):
+        super().__init__(
+            idx=idx,
+            home_dir=home_dir,
+            record_data_dir=record_data_dir,
+            core_set=core_set,
+            app=app,
+            mems=mems,
+            type=ExecutionType.CGROUP,
+        )
+        self.cgroup = Cgroup(os.path.join(CGROUP_MOUNT, cgroup_root, self.name))
+        self.cpu_max = cpu_max
+        self.memory_max = memory_max
+
+    def pin_cmd(self) -> str:
+        # the cpuset of the cgroup restricts the cpus and memory nodes
+        return ""
+
+    def exec(self, command):
+        try:
+            self.cgroup.create()
+            self.cgroup.write("cpuset.cpus", self.core_set)
+            if self.mems:
+                self.cgroup.write("cpuset.mems", self.mems)
+            if self.cpu_max is not None:
+                self.cgroup.write("cpu.max", self.cpu_max)
+            if self.memory_max is not None:
+                self.cgroup.write("memory.max", self.memory_max)
+        except OSError as e:
+            bm_log(f"cannot set up cgroup {self.cgroup.path}: {e}", LogType.ERROR)
+            return False
+        if not super().exec(command):
+            return False
+        # the process is blocked on the start signal, the processes of the benchmark
+        # are started after it is moved and stay in the cgroup
+        try:
+            self.cgroup.attach(self.process.pid)
+        except OSError as e:
+            bm_log(f"cannot move {self.name} to cgroup {self.cgroup.path}: {e}", LogType.ERROR)
+            Process.stop(self)
+            return False
+        return True
+
+    def harvest(self) -> dict[str, int]:
+        """
+        Returns the CPU and memory statistics of the cgroup, as `<controller>.<key>`.
+        """
+        stats = {f"cpu.{k}": v for k, v in self.cgroup.read_stat("cpu.stat").items()}
+        stats.update({f"memory.{k}": v for k, v in self.cgroup.read_stat("memory.stat").items()})
+        peak = self.cgroup.read("memory.peak")
+        if peak is not None and peak.isdigit():
+            stats["memory.peak"] = int(peak)
+        return stats
+
+    def stop(self):
+        if not os.path.exists(self.cgroup.path):
+            return
+        self.cgroup.kill()
+        super().stop()
+        self.cgroup_stats = self.harvest()
+        if not self.cgroup.remove():
+            bm_log(f"cgroup {self.cgroup.path} is still populated, not removed", LogType.WARNING)
+
+
+class CgroupProcesses(Processes):
+    UNIT = CgroupProcess
+
+    def __init__(
+        self,
+        config: ContainersConfig,
+        home_dir,
+        count,
+        record_data_dir,
+        apps: list[Application],
+    ):
+        if not is_cgroup2():
+            bm_log(
+                f"the cgroup execution type requires cgroup v2 mounted at {CGROUP_MOUNT}",
+                LogType.FATAL,
+            )
+            sys.exit(1)
+        super().__init__(
+            home_dir=home_dir,
+            count=count,
+            record_data_dir=record_data_dir,
+            cpus_per_proc=config.core_count,
+            core_affinity_offset_list=config.get_core_affinity_offset_list(),
+            apps=apps,
+            parallelism=config.parallelism,
+            placement=config.placement,
+            bind_memory=config.bind_memory,
+            cgroup_root=config.cgroup_root,
+            cpu_max=config.cpu_max,
+            memory_max=config.memory_max,
+        )
+
+    def cleanup(self):
+        super().cleanup()
+        if bm_utils.check_data_directory(self.results_dir):
+            stats = {eu.name: eu.cgroup_stats for eu in self.exec_units}
+            with open(os.path.join(self.results_dir, "cgroup-stats.json"), "w") as f:
+                json.dump(stats, f, indent=2, sort_keys=True)
@@ -4,7 +4,10 @@
 ### Reference: https://docker-py.readthedocs.io/en/stable/containers.html
 import docker
 import docker.errors
+import requests.exceptions
+import atexit
 import os
+import threading
 import time
 import sys
 from benchkit.shell.shell import shell_out
@@ -12,15 +15,160 @@ from bm_executer import Executer
 from bm_executer import ExecutionUnit
 import bm_utils
 from textwrap import indent
-from typing import Optional
+from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from config.application import Application
 from config.container import ContainersConfig
 from config.nics import NicsConfig, ContainerNicConfig
 from config.benchmark import ExecutionType
 from utils.logger import bm_log, LogType
+from utils.docker_client import get_docker_client
 from bm_utils import resolve_path
 
 
+class ContainerPool:
+    """
+    Keeps track of the idle containers that are reused between campaign points and
+    repetitions when `pool` is enabled, and removes them when bm-runner exits.
+    """
+
+    LABEL = "csb.pool"
+    # PID 1 of a pooled container. bash reaps the orphans of the benchmark runs and
+    # survives the `kill -9 -1` issued between runs, as the init of the PID namespace.
+    IDLE_CMD = ["bash", "-c", "trap 'exit 0' TERM; while true; do sleep infinity & wait $!; done"]
+
+    __lock = threading.Lock()
+    __containers: dict[str, bool] = {}
+
+    @classmethod
+    def add(cls, name: str, nic: bool):
+        with cls.__lock:
+            if not cls.__containers:
+                atexit.register(cls.release_all)
+            cls.__containers[name] = nic
+
+    @classmethod
+    def release_all(cls):
+        with cls.__lock:
+            containers = dict(cls.__containers)
+            cls.__containers.clear()
+        if not containers:
+            return
+        client = get_docker_client()
+        for name in containers:
+            try:
+                client.containers.get(name).remove(force=True)
+            except docker.errors.NotFound:
+                pass
+            bm_log(f"Pooled container: {name} has been removed")
+        bm_utils.delete_netns([name for name, nic in containers.items() if nic])
+
+
+class ContainerEvents:
+    """
+    Tracks the lifecycle of a set of containers from a single docker events stream,
+    instead of polling the daemon for each container.
+    Containers and execs are identified by their docker ids, so that the events of a
+    removed container with the same name are not mistaken for the current one.
+    """
+
+    ACTIONS = ["start", "die", "oom", "exec_die"]
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.started: set[str] = set()
+        self.exits: dict[str, int] = {}  # container/exec id => exit code
+        self.oom: set[str] = set()
+        self.closed = True
+        self.stopping = False
+        self.stream = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, names: list[str]):
+        # The subscription is active once events() returns, before any container is launched
+        self.stream = get_docker_client().events(
+            decode=True,
+            filters={"type": "container", "container": names, "event": self.ACTIONS},
+        )
+        self.closed = False
+        self.stopping = False
+        self.thread = threading.Thread(target=self.__watch, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping = True
+        if self.stream is not None:
+            # ends the iteration of the stream in the watcher thread
+            self.stream.close()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+
+    def __watch(self):
+        # the waiters are woken up when the stream ends, they do not wait for their timeout
+        try:
+            for event in self.stream:
+                self.__handle(event)
+            if not self.stopping:
+                bm_log("docker events stream ended unexpectedly", LogType.ERROR)
+        except (docker.errors.APIError, requests.exceptions.ConnectionError) as e:
+            bm_log(f"docker events stream failed: {e}", LogType.ERROR)
+        finally:
+            with self.cond:
+                self.closed = True
+                self.cond.notify_all()
+
+    def __handle(self, event: dict):
+        action = event.get("Action", "")
+        actor = event.get("Actor", {})
+        attrs = actor.get("Attributes", {})
+        with self.cond:
+            if action == "start":
+                self.started.add(actor["ID"])
+            elif action == "die":
+                self.exits[actor["ID"]] = int(attrs.get("exitCode", -1))
+            elif action == "exec_die":
+                self.exits[attrs["execID"]] = int(attrs.get("exitCode", -1))
+            elif action == "oom":
+                self.oom.add(actor["ID"])
+            self.cond.notify_all()
+
+    def wait_started(self, container_id: str, timeout: int) -> bool:
+        """Returns whether the container has started and is still running."""
+        with self.cond:
+            self.cond.wait_for(
+                lambda: container_id in self.started or container_id in self.exits or self.closed,
+                timeout=timeout,
+            )
+            return container_id in self.started and container_id not in self.exits
+
+    def __finished(self, unit: "Container") -> Optional[Tuple["Container", Optional[int]]]:
+        if unit.container_id in self.oom:
+            return unit, None
+        # a pooled container runs the benchmark as an exec, the container itself keeps running
+        key = unit.exec_id if unit.pooled else unit.container_id
+        if key in self.exits:
+            return unit, self.exits[key]
+        if unit.pooled and unit.container_id in self.exits:
+            return unit, self.exits[unit.container_id]
+        return None
+
+    def next_exit(self, units: list["Container"]) -> Optional[Tuple["Container", Optional[int]]]:
+        """
+        Blocks until one of the units finishes, and returns it with its exit code.
+        The exit code is None when the unit has been OOM killed.
+        Returns None if the events stream is closed.
+        """
+        with self.cond:
+            while True:
+                for unit in units:
+                    finished = self.__finished(unit)
+                    if finished is not None:
+                        return finished
+                if self.closed:
+                    return None
+                self.cond.wait()
+
+
 class Container(ExecutionUnit):
     def __init__(
         self,
@@ -32,18 +180,41 @@ class Container(ExecutionUnit):
         app: Application,
         port: Optional[int] = None,
         nic: Optional[ContainerNicConfig] = None,
+        pooled: bool = False,
+        events: Optional[ContainerEvents] = None,
+        stop_timeout: int = 10,
+        mems: Optional[str] = None,
     ):
         super().__init__(idx=idx, type=ExecutionType.CONTAINER, home_dir=home_dir, app=app)
-        self.client = docker.from_env()  # Initialize Docker client
         self.image = image
         self.core_set = core_set
         self.record_data_dir = record_data_dir
         self.port = port + self.idx if port else None
         self.nic = nic
+        self.pooled = pooled
+        self.events = events
+        self.stop_timeout = stop_timeout
+        self.mems = mems
+        self.container_id = None
+        self.exec_id = None
+
+    @property
+    def client(self) -> docker.DockerClient:
+        return get_docker_client()
+
+    @property
+    def pool_key(self) -> str:
+        # Pooled containers are only reused by units created with the same parameters.
+        # The port is only known once the ports have been allocated.
+        return f"{self.image}:{self.port}:{self.nic.nic if self.nic else ''}"
 
     def get_results_dir(self) -> str:
         return str(resolve_path(self.record_data_dir, use_in_container=True))
 
+    def holds_port(self, port: int) -> bool:
+        # The port of a pooled container stays published between runs
+        return self.pooled and port == self.port
+
     def __log_status(self, container):
         exit_code = container.attrs["State"].get("ExitCode")
         logs = container.logs().decode(errors="replace").strip()
@@ -71,11 +242,27 @@ class Container(ExecutionUnit):
 
             time.sleep(0.1)
 
+    def __wait_exec(self, timeout):
+        #
+        # Wait for the benchmark command of a pooled container to finish, the
+        # container itself keeps running.
+        #
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while deadline is None or time.monotonic() < deadline:
+            result = self.client.api.exec_inspect(self.exec_id)
+            if not result["Running"]:
+                return result["ExitCode"]
+            time.sleep(0.1)
+        return None
+
     def wait(self, timeout=None):
-        container = self.client.containers.get(self.name)
         bm_log(f"Waiting for Container: {self.name} to stop")
-        result = container.wait(timeout=timeout)
-        exit_code = result["StatusCode"]
+        if self.pooled:
+            exit_code = self.__wait_exec(timeout)
+        else:
+            container = self.client.containers.get(self.name)
+            result = container.wait(timeout=timeout)
+            exit_code = result["StatusCode"]
         if exit_code != 0:
             bm_log(
                 f"Container: {self.name} has failed/or crashed with exit code {exit_code}",
@@ -83,26 +270,55 @@ class Container(ExecutionUnit):
             )
             sys.exit(1)
 
-    def stop(self):
+    def __recycle(self):
+        #
+        # Kill every process of the run, except the PID 1 of the container, so
+        # that the container can be reused by the next run.
+        #
+        if self.exec_id is None:
+            return
+        try:
+            container = self.client.containers.get(self.name)
+            container.exec_run(["kill", "-9", "-1"])
+            bm_log(f"Container: {self.name} has been recycled")
+        except docker.errors.NotFound:
+            pass
+        self.exec_id = None
+
+    def stop(self, del_netns: bool = True):
         bm_log(f"Stopping Container {self.name}")
+        if self.pooled:
+            self.__recycle()
+            return None
         try:
             container = self.client.containers.get(self.name)
 
             self.__log_status(container)
 
-            container.stop()
-            container.remove()
-            # Remove network namespace as well
-            if self.nic:
+            container.stop(timeout=self.stop_timeout)
+            container.remove(force=True)
+            # Remove network namespace as well, unless the caller batches it
+            if self.nic and del_netns:
                 shell_out(f"sudo ip netns del {self.name}", ignore_any_error_code=True)
             bm_log(f"Container: {self.name} has been stopped and removed")
         except docker.errors.NotFound:
             pass  # Container does not exist, nothing to do
 
+    def get_config(self) -> dict:
+        """
+        Returns the configuration of the running container: its docker inspect data, where
+        the values specific to this instance are masked, and its cgroup limits.
+        """
+        attrs = self.client.api.inspect_container(self.container_id)
+        return {
+            "inspect": bm_utils.mask_keys(attrs, bm_utils.CONTAINER_SPECIFIC_KEYS),
+            "cgroup": bm_utils.read_cgroup_config(attrs["State"]["Pid"]),
+        }
+
     def add_nic(self, container):
         assert self.nic is not None
         # find the PID of the initial task of a container.
-        pid = docker.APIClient().inspect_container(container.id)["State"]["Pid"]
+        pid = self.client.api.inspect_container(container.id)["State"]["Pid"]
         netcfg = self.nic
         smp_irq_affinity = (
             netcfg.core_affinity_offset
@@ -159,9 +375,7 @@ class Container(ExecutionUnit):
         )
         return None
 
-    def __start(self, commands):
-        self.stop()
-
+    def __create(self, command, labels=None):
         host_home_dir = self._host_home_dir()
 
         volumes = {
@@ -172,32 +386,70 @@ class Container(ExecutionUnit):
             "/etc": {"bind": "/etc", "mode": "rw"},
         }
 
-        bm_log(f"Starting Container: {self.name}")
-        try:
-            ports = {f"{self.port}/tcp": ("0.0.0.0", self.port)} if self.port else None
-            container = self.client.containers.run(
-                image=self.image,
-                command=["bash", "-c", commands],
-                name=self.name,
-                cpuset_cpus=self.core_set,
-                volumes=volumes,
-                privileged=True,  # privileged mode
-                detach=True,  # detach mode
-                working_dir="/home",
-                ports=ports,
-            )
+        ports = {f"{self.port}/tcp": ("0.0.0.0", self.port)} if self.port else None
+        container = self.client.containers.run(
+            image=self.image,
+            command=command,
+            name=self.name,
+            cpuset_cpus=self.core_set,
+            cpuset_mems=self.mems,
+            volumes=volumes,
+            privileged=True,  # privileged mode
+            detach=True,  # detach mode
+            working_dir="/home",
+            ports=ports,
+            labels=labels,
+        )
 
-            timeout = 20
+        self.container_id = container.id
+        timeout = 20
+        if self.events is not None:
+            running = self.events.wait_started(container.id, timeout)
+            if running:
+                bm_log(f"Container {self.name}\n  Status      : running")
+            else:
+                container.reload()
+                self.__log_status(container)
+        else:
             self.__wait_status(container, timeout)
             self.__log_status(container)
+            running = container.status == "running"
 
-            if container.status != "running":
-                bm_log(
-                    f"Container {self.name} did not reach 'running' status in {timeout}s.",
-                    LogType.ERROR,
-                )
+        if not running:
+            bm_log(
+                f"Container {self.name} did not reach 'running' status in {timeout}s.",
+                LogType.ERROR,
+            )
+            return None
+
+        return container
+
+    def __get_pooled(self):
+        try:
+            container = self.client.containers.get(self.name)
+        except docker.errors.NotFound:
+            return None
+        if container.status == "running" and container.labels.get(ContainerPool.LABEL) == (
+            self.pool_key
+        ):
+            return container
+        # Left over by a non pooled run or created with other parameters
+        container.remove(force=True)
+        if self.nic:
+            shell_out(f"sudo ip netns del {self.name}", ignore_any_error_code=True)
+        return None
 
-            bm_utils.save_container_config(self.record_data_dir, self.name)
+    def __start(self, commands):
+        if self.pooled:
+            return self.__start_pooled(commands)
+
+        self.stop()
+
+        bm_log(f"Starting Container: {self.name}")
+        try:
+            container = self.__create(["bash", "-c", commands])
+            if container is None:
+                return False
 
             if self.nic:
                 self.add_nic(container)
@@ -211,11 +463,46 @@ class Container(ExecutionUnit):
 
         return True
 
+    def __start_pooled(self, commands):
+        try:
+            container = self.__get_pooled()
+            if container is None:
+                bm_log(f"Starting pooled Container: {self.name}")
+                container = self.__create(
+                    ContainerPool.IDLE_CMD, labels={ContainerPool.LABEL: self.pool_key}
+                )
+                if container is None:
+                    return False
+                if self.nic:
+                    self.add_nic(container)
+            else:
+                host_config = container.attrs["HostConfig"]
+                if host_config["CpusetCpus"] != self.core_set or (
+                    self.mems and host_config["CpusetMems"] != self.mems
+                ):
+                    container.update(cpuset_cpus=self.core_set, cpuset_mems=self.mems)
+            self.container_id = container.id
+            ContainerPool.add(self.name, self.nic is not None)
+
+            self.exec_id = self.client.api.exec_create(
+                container.id, ["bash", "-c", commands], workdir="/home"
+            )["Id"]
+            self.client.api.exec_start(self.exec_id, detach=True)
+
+            bm_log(
+                f"Pooled Container {self.name} will run on {self.idx} => {self.port}, and will run on cores={self.core_set} and waiting for start signal"
+            )
+        except docker.errors.APIError as e:
+            bm_log(f"Could not start container {self.name}: {str(e)}", LogType.ERROR)
+            return False
+
+        return True
+
     def exec(self, command):
         if self.app.cd:
             assert self.app.path is not None, "path is not set while change directory is requested!"
             command = f"cd {self.app.path} && {command}"
-        commands = f"{self.CMD_WHILE_NOT_START} {command} > {resolve_path(self.output_file, use_in_container=True)}"  # same as self.output_file outside container.
+        commands = f"{self.wait_for_start_cmd()} {command} > {resolve_path(self.output_file, use_in_container=True)}"  # same as self.output_file outside container.
         return self.__start(commands)
 
 
@@ -229,20 +516,90 @@ class Containers(Executer):
         record_data_dir,
         nics: Optional[NicsConfig] = None,
     ):
-        super().__init__(home_dir, results_dir=record_data_dir)
+        super().__init__(home_dir, results_dir=record_data_dir, parallelism=config.parallelism)
         assert len(apps) == count, "[BUG] Application list length must be equal to count"
+        self.events = ContainerEvents()
         bm_log(f"Initializing {count} containers with config: {config}")
-        core_offsets = config.get_core_affinity_offset_list()
+        placements = bm_utils.get_placements(
+            policy=config.placement,
+            count=count,
+            core_count=config.core_count,
+            offsets=config.get_core_affinity_offset_list(),
+            exclude=set(self.housekeeping_cores),
+            allowed=self.partition.cpus if self.partition is not None else None,
+        )
         for i in range(count):
-            core_set = bm_utils.get_cpu_set(start=core_offsets[i], core_cnt=config.core_count)
             container = Container(
                 idx=i,
                 home_dir=home_dir,
                 image=config.image,
-                core_set=core_set,
+                core_set=placements[i].cpuset,
+                mems=placements[i].cpuset_mems if config.bind_memory else None,
                 record_data_dir=record_data_dir,
                 port=config.port,
                 app=apps[i],
                 nic=self.nics.get_cfg(i) if self.nics else None,
+                pooled=config.pool,
+                events=self.events,
+                stop_timeout=config.stop_timeout,
             )
             self.add_exec_unit(container)
+
+    def launch_all(self, commands: list[str]):
+        self.events.start([eu.name for eu in self.exec_units])
+        super().launch_all(commands)
+        self.save_config()
+
+    def save_config(self):
+        """
+        Saves the configuration of all the containers, once they are all up, in a single file.
+        """
+        workers = max(1, min(self.BULK_WORKERS, len(self.exec_units)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            configs = dict(
+                zip(
+                    [eu.name for eu in self.exec_units],
+                    pool.map(Container.get_config, self.exec_units),
+                )
+            )
+        bm_utils.save_containers_config(self.results_dir, configs)
+
+    def wait_all(self):
+        pending = list(self.exec_units)
+        while pending:
+            finished = self.events.next_exit(pending)
+            if finished is None:
+                bm_log("docker events stream closed, waiting for each container", LogType.WARNING)
+                for eu in pending:
+                    eu.wait()
+                return
+            eu, exit_code = finished
+            pending.remove(eu)
+            if exit_code != 0:
+                reason = "has been OOM killed" if exit_code is None else f"exit code {exit_code}"
+                bm_log(
+                    f"Container: {eu.name} has failed/or crashed with {reason}, aborting the run",
+                    LogType.FATAL,
+                )
+                sys.exit(1)
+            bm_log(f"Container: {eu.name} has finished")
+
+    def stop_unit(self, eu: ExecutionUnit):
+        assert isinstance(eu, Container)
+        eu.stop(del_netns=False)
+
+    def stop_all(self):
+        super().stop_all()
+        bm_utils.delete_netns(
+            [
+                eu.name
+                for eu in self.exec_units
+                if isinstance(eu, Container) and eu.nic and not eu.pooled
+            ]
+        )
+
+    def cleanup(self):
+        try:
+            super().cleanup()
+        finally:
+            self.events.stop()
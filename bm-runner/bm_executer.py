@@ -2,40 +2,119 @@
 # SPDX-License-Identifier: MIT
 
 from benchkit.shell.shell import shell_out
+import json
 import os
+import shutil
 import sys
 import time
 from typing import Optional
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from config.plugin import ExecutionTime
 import bm_config
 from config.application import Application
 from config.benchmark import ExecutionType
-from bm_utils import is_port_free_to_use
+from config.container import PlacementPolicy
+from bm_utils import get_used_ports, find_free_port_range
+from bm_utils import pin_current_process, read_busy_cpu_time
 from monitors.monitor_factory import MonitorFactory
+from utils.adapters import BENCH_RECORD_PREFIX, adapt_bench_json
+from utils.results import get_point_id, save_table
 from utils.logger import bm_log, LogType
+from utils.docker_client import get_docker_api_stats
+import utils.partition
 from bm_utils import resolve_path
 
 
 class ExecutionUnit:
     START_FILE = f"{Application.BUILTIN_APP_DIR}/start"
-    RETRY_COUNT = 16 * 60  # 16 mins
-    CMD_WHILE_NOT_START = f"for i in $(seq 1 $((10 * RETRY_COUNT))); do if [ -e {START_FILE} ]; then break; fi; sleep 0.1; done;"
+    # each unit touches its own ready file in this directory once it waits for the start signal
+    SYNC_DIR = f"{Application.BUILTIN_APP_DIR}/sync"
+    # units block on reading one byte from this FIFO, the start signal writes one byte per unit
+    START_FIFO = f"{SYNC_DIR}/start"
+    START_TIMEOUT_IN_SEC = 16 * 60  # 16 mins
+    NAME_PREFIX = {
+        ExecutionType.CONTAINER: "C",
+        ExecutionType.CGROUP: "G",
+        ExecutionType.NAMESPACE: "U",
+    }
+    # resource usage reported for every unit, -1 when the execution type does not measure it
+    CGROUP_STATS = ["cpu.usage_usec", "cpu.throttled_usec", "memory.peak"]
 
     def __init__(self, idx, home_dir, app: Application, type: ExecutionType):
         self.app = app
         self.idx = idx
         self.type = type
         self.home_dir = home_dir
-        self.name = "C" if type == ExecutionType.CONTAINER else "N"
-        self.name += f"{idx:03d}_{app.name}"
+        # name of the unit in the results, the same in all partitions
+        self.unit_name = self.NAME_PREFIX.get(type, "N") + f"{idx:03d}_{app.name}"
+        partition = utils.partition.g_partition
+        self.name = self.unit_name + (f"_p{partition.index}" if partition is not None else "")
         self.output_file = os.path.join(Application.BUILTIN_APP_DIR, self.name)
+        self.ready_file = os.path.join(self.SYNC_DIR, f"{self.name}.ready")
+        # wall clock time in ns at which the unit received the start signal
+        self.start_ts_file = f"{self.output_file}.start"
+        # seconds between the launch of the unit and the unit reporting ready
+        self.launch_time: Optional[float] = None
+        self.ready_time: Optional[float] = None
+        # first port used by the unit, for networking benchmarks
+        self.port: Optional[int] = None
+        # cpus and NUMA nodes the unit is restricted to
+        self.core_set = ""
+        self.mems: Optional[str] = None
+        # statistics of the cgroup of the unit, harvested when the unit is stopped
+        self.cgroup_stats: dict[str, int] = {}
+
+    @classmethod
+    def use_partition(cls, index: int):
+        """
+        Gives the units of the partition of the current process their own start file and
+        synchronization directory.
+        """
+        cls.START_FILE = f"{Application.BUILTIN_APP_DIR}/start.p{index}"
+        cls.SYNC_DIR = f"{Application.BUILTIN_APP_DIR}/sync.p{index}"
+        cls.START_FIFO = f"{cls.SYNC_DIR}/start"
+
+    def wait_for_start_cmd(self) -> str:
+        """
+        Returns the shell commands that report this unit as ready, block
+        until the start signal is given, and record when the unit woke up.
+        The time since boot is read with shell builtins, without forking.
+        """
+        return (
+            f"touch {self.ready_file}; "
+            f"timeout {self.START_TIMEOUT_IN_SEC} dd if={self.START_FIFO} of=/dev/null bs=1 count=1 status=none; "
+            f"read -r up _ < /proc/uptime; echo $up > {self.start_ts_file};"
+        )
+
+    def read_start_ts(self) -> Optional[int]:
+        """
+        Returns when the unit woke up, in nanoseconds since boot (CLOCK_BOOTTIME). The builtin
+        benchmarks take it themselves when they start, the other units have the stamp of the
+        shell, with the 10ms resolution of `/proc/uptime`.
+        """
+        try:
+            with open(resolve_path(self.output_file), "r") as f:
+                for line in f:
+                    if line.startswith(BENCH_RECORD_PREFIX):
+                        return int(json.loads(line)["start_ts_ns"])
+        except (OSError, ValueError, KeyError):
+            pass
+        try:
+            with open(resolve_path(self.start_ts_file), "r") as f:
+                return round(float(f.read().strip()) * 1e9)
+        except (FileNotFoundError, ValueError):
+            return None
 
     @abstractmethod
     def get_results_dir(self) -> str:
         pass
 
+    def holds_port(self, port: int) -> bool:
+        """Whether the unit keeps the port bound between runs, e.g. a pooled container."""
+        return False
+
     @abstractmethod
     def exec(self, command: str) -> bool:
         return False
@@ -48,27 +127,59 @@ class ExecutionUnit:
     def stop(self):
         pass
 
-    def get_output(self) -> str:
-        line = open(resolve_path(self.output_file), "r").read()
-        # If there is an adapter, it means that
-        # the applications' output needs to be transformed
-        # after collection. This is important to have
-        # a format complying to dict `key=val;...`
-        if self.app.adapter is not None:
-            line = self.app.adapter.adapt(line)
-        return f"execution_unit={self.name};app={self.app.name};{line}"
+    def get_output(self, start_ref_ns: Optional[int] = None) -> str:
+        with open(resolve_path(self.output_file), "r") as output:
+            # If there is an adapter, it means that
+            # the applications' output needs to be transformed
+            # after collection. This is important to have
+            # a format complying to dict `key=val;...`
+            if self.app.adapter is not None:
+                line = self.app.adapter.adapt(output)
+            else:
+                # decodes the JSON records of the builtin benchmarks, if any
+                line = adapt_bench_json(output)
+        ready_ms = self.ready_time * 1000 if self.ready_time is not None else -1
+        start_ts = self.read_start_ts()
+        # delay of this unit's start with respect to the first unit that started
+        skew_us = (start_ts - start_ref_ns) / 1000 if start_ts and start_ref_ns else -1
+        cgroup_stats = "".join(
+            f"cgroup_{key.replace('.', '_')}={self.cgroup_stats.get(key, -1)};"
+            for key in self.CGROUP_STATS
+        )
+        return (
+            f"execution_unit={self.unit_name};app={self.app.name};cpuset={self.core_set};"
+            f"ready_time_ms={ready_ms:.2f};"
+            f"start_ts_ns={start_ts if start_ts is not None else -1};"
+            f"start_skew_us={skew_us:.1f};{cgroup_stats}{line}"
+        )
 
 
 class Executer:
-    SLEEP_IN_SEC = 5
+    READY_POLL_IN_SEC = 0.01
+    # maximum number of execution units stopped, inspected or collected concurrently
+    BULK_WORKERS = 32
 
-    def __init__(self, home_dir, results_dir):
+    def __init__(self, home_dir, results_dir, parallelism: int = 1):
         assert bm_config.g_config
         self.home_dir = home_dir
         self.results_dir = results_dir
+        # maximum number of execution units launched concurrently
+        self.parallelism = parallelism
         self.exec_units = []
         self.plugins = bm_config.g_config.get_plugins()
         self.nics = bm_config.g_config.get_nics()
+        self.ready_timeout = bm_config.g_config.get_benchmark_cfg().ready_timeout
+        self.housekeeping_cores = bm_config.g_config.get_benchmark_cfg().housekeeping_cores
+        self.housekeeping_cpu_time: Optional[float] = None
+        if self.housekeeping_cores:
+            # monitors and plugins are started by the runner and inherit its pinning
+            pin_current_process(self.housekeeping_cores)
+        self.start_fifo_fd: Optional[int] = None
+        self.teardown_time: Optional[float] = None
+        self.port_start: Optional[int] = None
+        self.partition = utils.partition.g_partition
+        # docker API usage is reported per run, as a delta from the creation of the executer
+        self.docker_api_stats = get_docker_api_stats()
         self.monitors = [
             MonitorFactory.create(monitor_type=type, results_dir=results_dir, args=args)
             for type, args in bm_config.g_config.get_benchmark_cfg().monitors.items()
@@ -82,6 +193,8 @@ class Executer:
                 n_units=len(self.exec_units),
                 homedir=self.home_dir,
                 res_dir=self.results_dir,
+                port=self.port_start,
+                start_file=ExecutionUnit.START_FILE,
             )
 
     def __wrap_plugins(self) -> str:
@@ -110,23 +223,92 @@ class Executer:
         for monitor in self.monitors:
             monitor.stop()
 
+    @staticmethod
+    def __launch(eu: ExecutionUnit, command: str) -> bool:
+        eu.launch_time = time.time()
+        eu.ready_time = None
+        return eu.exec(command)
+
+    def launch_all(self, commands: list[str]):
+        """
+        Launches every execution unit with its command using at most
+        `self.parallelism` concurrent launches. The benchmark is aborted
+        as soon as one of the units fails to start.
+        """
+        assert len(commands) == len(self.exec_units)
+        sync_dir = resolve_path(ExecutionUnit.SYNC_DIR)
+        # drop ready files left over by an interrupted run
+        shutil.rmtree(sync_dir, ignore_errors=True)
+        os.makedirs(sync_dir)
+        os.mkfifo(resolve_path(ExecutionUnit.START_FIFO))
+        bm_log(f"Launching {len(self.exec_units)} units, {self.parallelism} at a time")
+        with ThreadPoolExecutor(max_workers=self.parallelism) as pool:
+            futures = {
+                pool.submit(self.__launch, eu, cmd): eu
+                for eu, cmd in zip(self.exec_units, commands)
+            }
+            for future in as_completed(futures):
+                if not future.result():
+                    # do not launch the units that are still waiting in the queue
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    bm_log(
+                        f"{futures[future].name} could not be started, aborting the benchmark!",
+                        LogType.FATAL,
+                    )
+                    sys.exit(1)
+
+    def save_placement(self, policy: PlacementPolicy):
+        """
+        Saves the cores and memory nodes assigned to each unit in `placement.json`.
+        """
+        if not self.results_dir:
+            return
+        placement = {
+            "policy": policy.value,
+            "units": {eu.name: {"cpus": eu.core_set, "mems": eu.mems} for eu in self.exec_units},
+        }
+        with open(os.path.join(self.results_dir, "placement.json"), "w") as f:
+            json.dump(placement, f, indent=2)
+
+    def allocate_ports(self, port_start: int) -> int:
+        """
+        Assigns one port per unit from the first free range of ports starting at `port_start`,
+        and returns the first port of the range.
+        The ports in use are read once, the ports held by the units themselves are free to use.
+        """
+        count = len(self.exec_units)
+        used = get_used_ports()
+        used -= {eu.port for eu in self.exec_units if eu.port and eu.holds_port(eu.port)}
+        start = find_free_port_range(port_start, count, used)
+        if start is None:
+            bm_log(f"No range of {count} free ports from port {port_start}!", LogType.FATAL)
+            sys.exit(1)
+        if start != port_start:
+            bm_log(
+                f"Ports [{port_start}:{port_start + count - 1}] are not free to use, using [{start}:{start + count - 1}] instead",
+                LogType.WARNING,
+            )
+        for idx, eu in enumerate(self.exec_units):
+            eu.port = start + idx
+        self.port_start = start
+        return start
+
     def exec_all(self, threads, duration, noise, initial_size, port_start: Optional[int]):
         try:
+            if port_start is not None:
+                if self.partition is not None:
+                    port_start += self.partition.port_offset
+                port_start = self.allocate_ports(port_start)
+            commands = []
             for idx, eu in enumerate(self.exec_units):
                 if port_start is not None:
-                    sz = idx + port_start
                     # TODO: At the moment initial_size is exploited to pass the port number,
                     # make sure that initial_size is not used when port is available
                     # or find a proper way to pass the port number to the micro-bm
-                    if not is_port_free_to_use(sz):
-                        bm_log(
-                            f"Port {sz} is already in use!, make sure ports in this range [{port_start}:{len(self.exec_units)-1}] are free to use.",
-                            LogType.FATAL,
-                        )
-                        sys.exit(1)
+                    sz = eu.port
                 else:
                     sz = initial_size
-                ret = eu.exec(
+                commands.append(
                     eu.app.get_cmd(
                         plugins_cmds=self.__wrap_plugins(),
                         threads=threads,
@@ -140,27 +322,106 @@ class Executer:
                         res_dir=eu.get_results_dir(),
                     )
                 )
-                if not ret:
-                    break
+            self.launch_all(commands)
 
+            busy_time = (
+                read_busy_cpu_time(self.housekeeping_cores) if self.housekeeping_cores else None
+            )
             # give start signal
             self.signal_start()
             # wait for all containers to finish
-            for eu in self.exec_units:
-                eu.wait()
+            self.wait_all()
+            if busy_time is not None:
+                self.housekeeping_cpu_time = read_busy_cpu_time(self.housekeeping_cores) - busy_time
         finally:
             self.cleanup()
 
+    def wait_all(self):
+        for eu in self.exec_units:
+            eu.wait()
+
     def collect_results(self) -> str:
-        stat_prefix = "".join([monitor.collect_results().strip() for monitor in self.monitors])
-        result = "".join(f"{stat_prefix}{eu.get_output()}" for eu in self.exec_units)
+        # the per cpu stats of the monitors are stored once in tables joined by the point id
+        stat_prefix = f"point_id={get_point_id(self.results_dir)};"
+        stat_prefix += "".join([monitor.collect_results().strip() for monitor in self.monitors])
+        for monitor in self.monitors:
+            table = monitor.collect_table()
+            if table is not None and monitor.TABLE_NAME is not None and self.results_dir:
+                save_table(self.results_dir, monitor.TABLE_NAME, table)
+        api_calls, api_time_sec = get_docker_api_stats()
+        api_calls -= self.docker_api_stats[0]
+        api_time_sec -= self.docker_api_stats[1]
+        bm_log(f"docker API: {api_calls} calls, {api_time_sec * 1000:.1f}ms", LogType.INFO)
+        stat_prefix += f"docker_api_calls={api_calls};docker_api_ms={api_time_sec * 1000:.1f};"
+        teardown_ms = self.teardown_time * 1000 if self.teardown_time is not None else -1
+        stat_prefix += f"teardown_ms={teardown_ms:.1f};"
+        housekeeping = self.housekeeping_cpu_time
+        stat_prefix += (
+            f"housekeeping_cpu_sec={housekeeping if housekeeping is not None else -1:.2f};"
+        )
+        if self.partition is not None:
+            stat_prefix += self.partition.get_flags()
+        start_stamps = [ts for ts in (eu.read_start_ts() for eu in self.exec_units) if ts]
+        start_ref = min(start_stamps) if start_stamps else None
+        if start_ref is not None:
+            bm_log(
+                f"start skew between units: {(max(start_stamps) - start_ref) / 1000:.1f}us",
+                LogType.INFO,
+            )
+        # the outputs are read and adapted concurrently, the order of the units is kept
+        workers = max(1, min(self.BULK_WORKERS, len(self.exec_units)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outputs = pool.map(lambda eu: eu.get_output(start_ref), self.exec_units)
+            result = "".join(f"{stat_prefix}{output}" for output in outputs)
         return result
 
+    def wait_ready(self):
+        """
+        Blocks until every execution unit has reported ready, and records
+        for each unit how long it took from its launch to become ready.
+        The benchmark is aborted if not all units are ready within `self.ready_timeout`.
+        """
+        sync_dir = resolve_path(ExecutionUnit.SYNC_DIR)
+        pending = {os.path.basename(eu.ready_file): eu for eu in self.exec_units}
+        deadline = time.time() + self.ready_timeout
+        while pending:
+            # a single directory listing per poll, regardless of the number of units
+            for fname in set(pending).intersection(os.listdir(sync_dir)):
+                eu = pending.pop(fname)
+                ready_at = os.stat(os.path.join(sync_dir, fname)).st_mtime
+                assert eu.launch_time is not None
+                eu.ready_time = max(0.0, ready_at - eu.launch_time)
+            if not pending:
+                break
+            if time.time() > deadline:
+                names = ", ".join(eu.name for eu in pending.values())
+                bm_log(
+                    f"{len(pending)} units are not ready after {self.ready_timeout}s: {names}",
+                    LogType.FATAL,
+                )
+                sys.exit(1)
+            time.sleep(self.READY_POLL_IN_SEC)
+        slowest = max(self.exec_units, key=lambda eu: eu.ready_time or 0.0)
+        bm_log(
+            f"All {len(self.exec_units)} units are ready, slowest {slowest.name} took {slowest.ready_time:.3f}s",
+            LogType.INFO,
+        )
+
+    def __release_units(self):
+        """
+        Wakes up all units blocked on the start FIFO at once by writing one byte per unit.
+        The FIFO stays open until cleanup, so a unit that opens it late still finds its byte.
+        """
+        # opening a FIFO read-write never blocks on Linux, even without readers
+        self.start_fifo_fd = os.open(resolve_path(ExecutionUnit.START_FIFO), os.O_RDWR)
+        os.write(self.start_fifo_fd, b"s" * len(self.exec_units))
+
     def signal_start(self):
-        bm_log(f"Waiting for {self.SLEEP_IN_SEC}, before giving the start signal")
-        time.sleep(self.SLEEP_IN_SEC)
+        self.wait_ready()
         self.__call_plugins(ExecutionTime.PRE)
         self.__start_monitors()
+        self.__release_units()
+        # the start file is kept for plugins that wait on it
         shell_out(
             f"touch {ExecutionUnit.START_FILE}",
             current_dir=self.home_dir,
@@ -168,13 +429,37 @@ class Executer:
         )
         self.__call_plugins(ExecutionTime.POST)
 
+    def stop_unit(self, eu: ExecutionUnit):
+        eu.stop()
+
+    def stop_all(self):
+        """
+        Stops all the execution units concurrently, an error while stopping a unit
+        does not prevent the others from being stopped.
+        """
+        workers = max(1, min(self.BULK_WORKERS, len(self.exec_units)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self.stop_unit, eu): eu for eu in self.exec_units}
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    bm_log(
+                        f"Could not stop {futures[future].name}: {future.exception()}",
+                        LogType.ERROR,
+                    )
+
     def cleanup(self):
         bm_log("cleaning up, stopping all processes/containers")
-        for eu in self.exec_units:
-            eu.stop()
+        start = time.monotonic()
+        self.stop_all()
+        self.teardown_time = time.monotonic() - start
+        bm_log(f"teardown of {len(self.exec_units)} units took {self.teardown_time:.2f}s")
         start_file = resolve_path(ExecutionUnit.START_FILE)
         if os.path.exists(start_file):
             os.remove(start_file)
+        if self.start_fifo_fd is not None:
+            os.close(self.start_fifo_fd)
+            self.start_fifo_fd = None
+        shutil.rmtree(resolve_path(ExecutionUnit.SYNC_DIR), ignore_errors=True)
         self.__stop_monitors()
         self.__call_plugins(ExecutionTime.CLEANUP)
         self.__stop_plugins()
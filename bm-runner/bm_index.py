@@ -0,0 +1,268 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import argparse
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Any, Optional
+import pandas as pd
+import bm_utils
+from config.benchmark import ExecutionType
+from utils.logger import bm_log, LogType
+from utils.results import read_results
+
+# Index of the results of all the campaigns, next to them
+INDEX_DB = "results/index.db"
+RESULTS_DIR = "results"
+# e.g. v_campaign_host_20260101_120000_000000, see benchkit's campaign naming
+TIMESTAMP_RE = re.compile(r"_(\d{8})_(\d{6})_(\d{6})$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    path TEXT NOT NULL,
+    started TEXT,
+    mtime REAL,
+    host TEXT,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    hostname TEXT,
+    app TEXT,
+    execution_unit TEXT,
+    execution_type TEXT,
+    container_cnt INTEGER,
+    nb_threads INTEGER,
+    noise INTEGER
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (result_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS campaigns_started ON campaigns(started);
+CREATE INDEX IF NOT EXISTS campaigns_host ON campaigns(host);
+CREATE INDEX IF NOT EXISTS results_campaign ON results(campaign_id);
+CREATE INDEX IF NOT EXISTS results_app ON results(app);
+CREATE INDEX IF NOT EXISTS results_execution_type ON results(execution_type);
+CREATE INDEX IF NOT EXISTS results_container_cnt ON results(container_cnt);
+CREATE INDEX IF NOT EXISTS results_nb_threads ON results(nb_threads);
+CREATE INDEX IF NOT EXISTS results_hostname ON results(hostname);
+"""
+
+# columns of the results table, the numeric values of the other columns are metrics
+RESULT_COLUMNS = [
+    "hostname",
+    "app",
+    "execution_unit",
+    "execution_type",
+    "container_cnt",
+    "nb_threads",
+    "noise",
+]
+
+
+def get_started(name: str) -> Optional[str]:
+    m = TIMESTAMP_RE.search(name)
+    if m is None:
+        return None
+    date, time, us = m.groups()
+    return f"{date[:4]}-{date[4:6]}-{date[6:]}T{time[:2]}:{time[2:4]}:{time[4:]}.{us}"
+
+
+def normalize_execution_type(value: Any) -> Any:
+    # the CSV holds the enum name, e.g. `ExecutionType.CONTAINER`
+    name = str(value).split(".")[-1]
+    return ExecutionType[name].value if name in ExecutionType.__members__ else value
+
+
+def _to_sql(value: Any) -> Any:
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+class ResultsIndex:
+    """
+    SQLite index of the results of finished campaigns: their rows, the numeric metrics of the
+    rows, the copied configuration and the fingerprint of the host.
+    """
+
+    def __init__(self, db_path: str = INDEX_DB):
+        self.db_path = str(bm_utils.resolve_path(db_path))
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def ingest(self, csv_file: str) -> bool:
+        """
+        Ingests a finished campaign from its results CSV, with the copied configuration
+        `<campaign>.json` next to it. Returns False if it is already indexed and unchanged.
+        """
+        base = os.path.splitext(csv_file)[0]
+        name = os.path.basename(base)
+        mtime = os.path.getmtime(csv_file)
+        row = self.conn.execute("SELECT mtime FROM campaigns WHERE name = ?", (name,)).fetchone()
+        if row is not None and row[0] == mtime:
+            return False
+
+        config = None
+        if os.path.exists(f"{base}.json"):
+            with open(f"{base}.json") as f:
+                config = f.read()
+        host = None
+        sys_config = os.path.join(base, "sys-config.json")
+        if os.path.exists(sys_config):
+            with open(sys_config) as f:
+                host = json.load(f).get("fingerprint")
+        df = read_results(csv_file)
+        if "execution_type" in df.columns:
+            df["execution_type"] = df["execution_type"].map(normalize_execution_type)
+        metric_cols = [
+            col
+            for col in df.columns
+            if col not in RESULT_COLUMNS and pd.api.types.is_numeric_dtype(df[col])
+        ]
+
+        with self.conn:
+            self.conn.execute("DELETE FROM campaigns WHERE name = ?", (name,))
+            campaign_id = self.conn.execute(
+                "INSERT INTO campaigns (name, path, started, mtime, host, config) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    name,
+                    os.path.abspath(base),
+                    get_started(name) or datetime.fromtimestamp(mtime).isoformat(),
+                    mtime,
+                    host,
+                    config,
+                ),
+            ).lastrowid
+            for record in df.to_dict("records"):
+                result_id = self.conn.execute(
+                    f"INSERT INTO results (campaign_id, {', '.join(RESULT_COLUMNS)}) "
+                    f"VALUES (?, {', '.join('?' * len(RESULT_COLUMNS))})",
+                    [campaign_id] + [_to_sql(record.get(col)) for col in RESULT_COLUMNS],
+                ).lastrowid
+                self.conn.executemany(
+                    "INSERT INTO metrics (result_id, name, value) VALUES (?, ?, ?)",
+                    [
+                        (result_id, col, _to_sql(record[col]))
+                        for col in metric_cols
+                        if not pd.isna(record[col])
+                    ],
+                )
+        return True
+
+    def ingest_dir(self, results_dir: str = RESULTS_DIR) -> int:
+        """
+        Ingests the finished campaigns of the directory, i.e. those with a copied configuration.
+        The merged results of several campaigns are skipped. Returns the number ingested.
+        """
+        results_dir = str(bm_utils.resolve_path(results_dir))
+        count = 0
+        for csv_file in sorted(glob.glob(os.path.join(results_dir, "*.csv"))):
+            if os.path.exists(f"{os.path.splitext(csv_file)[0]}.json") and self.ingest(csv_file):
+                count += 1
+        return count
+
+    def query(
+        self,
+        metric: str,
+        app: Optional[str] = None,
+        execution_type: Optional[str] = None,
+        container_cnt: Optional[int] = None,
+        nb_threads: Optional[int] = None,
+        host: Optional[str] = None,
+        last: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Returns the value of a metric in the rows matching the filters, from the `last` most
+        recent matching campaigns. `host` is a hostname or a prefix of a host fingerprint.
+        """
+        filters = []
+        params: list[Any] = []
+        for col, value in (
+            ("r.app", app),
+            ("r.execution_type", execution_type),
+            ("r.container_cnt", container_cnt),
+            ("r.nb_threads", nb_threads),
+        ):
+            if value is not None:
+                filters.append(f"{col} = ?")
+                params.append(value)
+        if host is not None:
+            filters.append("(r.hostname = ? OR c.host LIKE ? || '%')")
+            params += [host, host]
+        where = " AND ".join(filters) if filters else "1"
+        column = '"{}"'.format(metric.replace('"', '""'))
+        campaigns = (
+            "SELECT c.id FROM campaigns c WHERE EXISTS (SELECT 1 FROM results r "
+            f"WHERE r.campaign_id = c.id AND {where}) ORDER BY c.started DESC LIMIT ?"
+        )
+        sql = (
+            "SELECT c.name AS campaign, c.started, r.hostname, r.app, r.execution_unit, "
+            "r.execution_type, r.container_cnt, r.nb_threads, r.noise, m.value AS "
+            f"{column} FROM results r "
+            "JOIN campaigns c ON c.id = r.campaign_id "
+            "JOIN metrics m ON m.result_id = r.id AND m.name = ? "
+            f"WHERE r.campaign_id IN ({campaigns}) AND {where} ORDER BY c.started, r.id"
+        )
+        limit = last if last is not None else -1
+        return pd.read_sql_query(sql, self.conn, params=[metric] + params + [limit] + params)
+
+
+###########################################################################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index and query the results of campaigns")
+    parser.add_argument("--db", help="Path of the index database.", default=INDEX_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Ingest the finished campaigns.")
+    ingest.add_argument("paths", nargs="*", help="Results directories or CSV files.")
+    query = commands.add_parser("query", help="Query a metric across the campaigns.")
+    query.add_argument("metric", help="Column of the results, e.g. throughput_min.")
+    query.add_argument("--app")
+    query.add_argument("--exec-type", choices=[t.value for t in ExecutionType])
+    query.add_argument("--container-cnt", type=int)
+    query.add_argument("--threads", type=int)
+    query.add_argument("--host", help="Hostname or prefix of the host fingerprint.")
+    query.add_argument("--last", type=int, help="Only the last N matching campaigns.")
+    args = parser.parse_args()
+
+    index = ResultsIndex(args.db)
+    if args.command == "ingest":
+        count = 0
+        for path in args.paths or [RESULTS_DIR]:
+            if os.path.isdir(path):
+                count += index.ingest_dir(path)
+            elif not os.path.exists(path):
+                bm_log(f"{path} does not exist", LogType.FATAL)
+                sys.exit(1)
+            else:
+                count += int(index.ingest(path))
+        bm_log(f"{count} campaigns ingested in {index.db_path}", LogType.INFO)
+    else:
+        df = index.query(
+            args.metric,
+            app=args.app,
+            execution_type=args.exec_type,
+            container_cnt=args.container_cnt,
+            nb_threads=args.threads,
+            host=args.host,
+            last=args.last,
+        )
+        print(df.to_string(index=False))
+    index.close()
@@ -0,0 +1,104 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+from typing import Optional, Tuple
+import pandas as pd
+from config.knee import KneeSearchConfig
+from utils.linearity import compute_linearity
+from utils.results import read_results, merge_results
+from utils.logger import bm_log, LogType
+
+COUNT_COL = "container_cnt"
+# campaign variables the linearity is computed separately for
+GROUP_COLS = ["execution_type", "nb_threads", "noise", "initial_size", "namespaces"]
+
+
+class KneeSearch:
+    """
+    Bisection of the container count at which the linearity of a metric drops below a threshold,
+    from the results of successive campaigns.
+    """
+
+    def __init__(self, config: KneeSearchConfig):
+        self.config = config
+        self.results: list[pd.DataFrame] = []
+        self.csv_files: list[str] = []
+        # lowest linearity among the groups, per container count
+        self.linearity: dict[int, float] = {}
+
+    def anchors(self) -> list[int]:
+        n = self.config.anchors
+        counts = {1 + round(i * (self.config.max - 1) / (n - 1)) for i in range(n)}
+        return sorted(counts)
+
+    def add_results(self, csv_file: str):
+        """
+        Adds the results of a campaign and updates the linearity of every count run so far.
+        """
+        self.csv_files.append(csv_file)
+        self.results.append(read_results(csv_file))
+        df = pd.concat(self.results, ignore_index=True)
+        groups = [col for col in GROUP_COLS if col in df.columns]
+        lin_df = compute_linearity(df, COUNT_COL, self.config.metric, groups)
+        if lin_df is None:
+            return
+        self.linearity = {
+            int(count): float(lin)
+            for count, lin in lin_df.groupby(COUNT_COL)["linearity"].min().items()
+        }
+        measured = ", ".join(f"{c}: {lin:.2f}" for c, lin in sorted(self.linearity.items()))
+        bm_log(f"linearity of {self.config.metric} per container count: {measured}", LogType.INFO)
+
+    def knee(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns the last count above the threshold and the first count below it,
+        None if the linearity stays above the threshold.
+        """
+        counts = sorted(self.linearity)
+        below = [c for c in counts if self.linearity[c] < self.config.threshold]
+        if not below:
+            return None
+        first_below = below[0]
+        above = [c for c in counts if c < first_below]
+        return (above[-1] if above else first_below, first_below)
+
+    def next_counts(self) -> list[int]:
+        """
+        Returns the count to run next, or an empty list once the knee is found.
+        """
+        knee = self.knee()
+        if knee is None or knee[1] - knee[0] <= self.config.tolerance:
+            return []
+        return [(knee[0] + knee[1]) // 2]
+
+    def save(self, output_dir: str):
+        """
+        Saves the results of all the campaigns of the search in `<output_dir>.csv`, to visualize
+        them together, and the search itself in `<output_dir>/knee.json`.
+        """
+        merge_results(self.csv_files, output_dir)
+        knee = self.knee()
+        with open(os.path.join(output_dir, "knee.json"), "w") as f:
+            json.dump(
+                {
+                    "config": self.config,
+                    "campaigns": self.csv_files,
+                    "linearity": self.linearity,
+                    "knee": knee,
+                },
+                f,
+                indent=2,
+            )
+        if knee is None:
+            bm_log(
+                f"linearity stays above {self.config.threshold} up to {max(self.linearity, default=0)} containers",
+                LogType.INFO,
+            )
+        else:
+            bm_log(
+                f"linearity drops below {self.config.threshold} between {knee[0]} and {knee[1]} containers, "
+                f"found with {len(self.linearity)} counts in {len(self.csv_files)} campaigns",
+                LogType.INFO,
+            )
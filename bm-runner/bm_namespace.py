@@ -0,0 +1,98 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import shlex
+import sys
+from typing import Optional
+import bm_utils
+from bm_process import Process, Processes
+from config.application import Application
+from config.benchmark import ExecutionType, Namespace
+from config.container import ContainersConfig
+from utils.logger import bm_log, LogType
+
+# unshare(1) options creating each namespace
+UNSHARE_OPTIONS = {
+    Namespace.PID: "--pid --fork",
+    Namespace.MNT: "--mount",
+    Namespace.NET: "--net",
+    Namespace.IPC: "--ipc",
+    Namespace.UTS: "--uts",
+    Namespace.USER: "--user --map-root-user",
+}
+
+
+def get_unshare_cmd(namespaces: list[Namespace]) -> str:
+    """
+    Returns the unshare command line that creates the given namespaces.
+    """
+    options = [UNSHARE_OPTIONS[ns] for ns in Namespace if ns in namespaces]
+    if Namespace.PID in namespaces and Namespace.MNT in namespaces:
+        # let tools reading /proc see the pid namespace
+        options.append("--mount-proc")
+    return " ".join(["unshare"] + options)
+
+
+class NamespaceProcess(Process):
+    """
+    A process launched in new namespaces with `unshare`, without the cgroups, filesystem,
+    seccomp profile and network setup of a container. It isolates the cost of namespaces.
+    """
+
+    def __init__(
+        self,
+        idx,
+        home_dir,
+        record_data_dir,
+        core_set,
+        app: Application,
+        namespaces: list[Namespace],
+        mems: Optional[str] = None,
+    ):
+        super().__init__(
+            idx=idx,
+            home_dir=home_dir,
+            record_data_dir=record_data_dir,
+            core_set=core_set,
+            app=app,
+            mems=mems,
+            type=ExecutionType.NAMESPACE,
+        )
+        self.namespaces = namespaces
+
+    def wrap_cmd(self, commands: str) -> str:
+        if not self.namespaces:
+            return commands
+        if Namespace.NET in self.namespaces:
+            # a new network namespace only has a loopback interface, and it is down
+            commands = f"ip link set lo up; {commands}"
+        return f"{get_unshare_cmd(self.namespaces)} sh -c {shlex.quote(commands)}"
+
+
+class NamespaceProcesses(Processes):
+    UNIT = NamespaceProcess
+
+    def __init__(
+        self,
+        config: ContainersConfig,
+        namespaces: str,
+        home_dir,
+        count,
+        record_data_dir,
+        apps: list[Application],
+    ):
+        if not bm_utils.exists_system_wide("unshare"):
+            bm_log("the namespace execution type requires unshare (util-linux)", LogType.FATAL)
+            sys.exit(1)
+        super().__init__(
+            home_dir=home_dir,
+            count=count,
+            record_data_dir=record_data_dir,
+            cpus_per_proc=config.core_count,
+            core_affinity_offset_list=config.get_core_affinity_offset_list(),
+            apps=apps,
+            parallelism=config.parallelism,
+            placement=config.placement,
+            bind_memory=config.bind_memory,
+            namespaces=Namespace.parse_set(namespaces),
+        )
@@ -10,26 +10,61 @@ from bm_executer import ExecutionUnit
 from bm_utils import stop_process
 from bm_config import Application
 from config.benchmark import ExecutionType
+from config.container import PlacementPolicy
+from typing import Optional
 from utils.logger import bm_log, LogType
 from bm_utils import resolve_path
 
 
 class Process(ExecutionUnit):
-    def __init__(self, idx, home_dir, record_data_dir, core_set, app: Application):
-        super().__init__(idx=idx, home_dir=home_dir, app=app, type=ExecutionType.NATIVE)
+    # whether the memory of the process is bound with numactl
+    MEMBIND_WITH_NUMACTL = True
+
+    def __init__(
+        self,
+        idx,
+        home_dir,
+        record_data_dir,
+        core_set,
+        app: Application,
+        mems: Optional[str] = None,
+        type: ExecutionType = ExecutionType.NATIVE,
+    ):
+        super().__init__(idx=idx, home_dir=home_dir, app=app, type=type)
         self.record_data_dir = record_data_dir
         self.core_set = core_set
+        self.mems = mems
+        self.process: Optional[subprocess.Popen] = None
 
     def get_results_dir(self) -> str:
         return str(resolve_path(self.record_data_dir, use_in_container=False))
 
+    def pin_cmd(self) -> str:
+        """
+        Returns the command prefix that restricts the process to its cpus and memory nodes.
+        """
+        membind = f"numactl --membind={self.mems} " if self.mems else ""
+        return f"{membind}taskset --cpu-list {self.core_set} "
+
+    def wrap_cmd(self, commands: str) -> str:
+        """
+        Returns the shell command line that runs `commands`, the whole life of the unit.
+        """
+        return commands
+
+    def preexec(self):
+        """
+        Runs in the child process before the command is executed.
+        """
+        os.setpgrp()
+
     def exec(self, command):
         change_dir = ""
         if self.app.cd:
             assert self.app.path is not None, "path is not set while change directory is requested!"
             change_dir = f" cd {self.app.path} && "
-        commands = (
-            f"{self.CMD_WHILE_NOT_START}{change_dir}taskset --cpu-list {self.core_set} {command}"
+        commands = self.wrap_cmd(
+            f"{self.wait_for_start_cmd()}{change_dir}{self.pin_cmd()}{command}"
         )
         with open(resolve_path(self.output_file), "w") as outfile:
             self.process = subprocess.Popen(
@@ -37,7 +72,7 @@ class Process(ExecutionUnit):
                 shell=True,
                 stdout=outfile,
                 stderr=subprocess.DEVNULL,
-                preexec_fn=os.setpgrp,
+                preexec_fn=self.preexec,
                 cwd=self.home_dir,
             )
         bm_log(f"launched process {self.name} with {commands}")
@@ -58,6 +93,8 @@ class Process(ExecutionUnit):
 
 
 class Processes(Executer):
+    UNIT = Process
+
     def __init__(
         self,
         home_dir,
@@ -66,18 +103,38 @@ class Processes(Executer):
         cpus_per_proc,
         core_affinity_offset_list,
         apps: list[Application],
+        parallelism: int = 1,
+        placement: PlacementPolicy = PlacementPolicy.OFFSETS,
+        bind_memory: bool = False,
+        **unit_kwargs,
     ):
-        super().__init__(home_dir=home_dir, results_dir=record_data_dir)
+        super().__init__(home_dir=home_dir, results_dir=record_data_dir, parallelism=parallelism)
         assert len(apps) == count, "[BUG] Application list length must be equal to count"
-        for i in range(count):
-            core_set = bm_utils.get_cpu_set(
-                start=core_affinity_offset_list[i], core_cnt=cpus_per_proc
+        if (
+            bind_memory
+            and self.UNIT.MEMBIND_WITH_NUMACTL
+            and not bm_utils.exists_system_wide("numactl")
+        ):
+            bm_log(
+                "numactl is not available, the memory of processes is not bound", LogType.WARNING
             )
-            proc = Process(
+            bind_memory = False
+        placements = bm_utils.get_placements(
+            policy=placement,
+            count=count,
+            core_count=cpus_per_proc,
+            offsets=core_affinity_offset_list,
+            exclude=set(self.housekeeping_cores),
+            allowed=self.partition.cpus if self.partition is not None else None,
+        )
+        for i in range(count):
+            proc = self.UNIT(
                 idx=i,
                 home_dir=home_dir,
-                core_set=core_set,
+                core_set=placements[i].cpuset,
+                mems=placements[i].cpuset_mems if bind_memory else None,
                 record_data_dir=record_data_dir,
                 app=apps[i],
+                **unit_kwargs,
             )
             self.add_exec_unit(proc)
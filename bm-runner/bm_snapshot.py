@@ -0,0 +1,300 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+import platform
+import re
+import psutil
+import docker.errors
+import requests.exceptions
+from typing import Optional
+import bm_utils
+from utils.logger import bm_log, LogType
+from utils.docker_client import get_docker_client
+
+# Content-addressed cache of the host snapshots, shared by all the campaigns
+SNAPSHOT_DIR = "results/snapshots"
+LATEST_FILE = "latest"
+
+# Keys whose values change without any change of the host configuration.
+# They are recorded but excluded from the fingerprint.
+VOLATILE_PREFIXES = (
+    "loadavg",
+    "sysctl.fs.aio-nr",
+    "sysctl.fs.dentry-state",
+    "sysctl.fs.file-nr",
+    "sysctl.fs.inode-nr",
+    "sysctl.fs.inode-state",
+    "sysctl.fs.quota.",
+    "sysctl.kernel.hung_task_detect_count",
+    "sysctl.kernel.ns_last_pid",
+    "sysctl.kernel.oops_count",
+    # lowered by the kernel itself when the perf interrupts take too long
+    "sysctl.kernel.perf_event_max_sample_rate",
+    "sysctl.kernel.pty.nr",
+    "sysctl.kernel.random.",
+    "sysctl.kernel.tainted",
+    "sysctl.kernel.warn_count",
+    "sysctl.net.netfilter.nf_conntrack_count",
+    "docker.Containers",
+    "docker.Images",
+    "docker.NEventsListener",
+    "docker.NFd",
+    "docker.NGoroutines",
+    "docker.SystemTime",
+)
+# Keys that come and go with the containers and the runs, e.g. the mounts and the sysctls of
+# the veth interfaces of containers, or that irqbalance keeps changing.
+VOLATILE_PATTERNS = (
+    re.compile(r"^irq\.\d+\.smp_affinity$"),
+    re.compile(
+        r"^mount\./(var/lib/docker|var/lib/containerd|run/docker|run/containerd|run/netns)/"
+    ),
+    # per interface settings, only those applied to all and new interfaces are kept
+    re.compile(r"^sysctl\.net\.[^.]+\.(conf|neigh)\.(?!(all|default)\.)"),
+)
+
+Snapshot = dict[str, str]
+
+g_snapshot: Optional[Snapshot] = None
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _flatten(prefix: str, data, snapshot: Snapshot):
+    if isinstance(data, dict):
+        for k, v in data.items():
+            _flatten(f"{prefix}.{k}", v, snapshot)
+    elif isinstance(data, list):
+        snapshot[prefix] = json.dumps(data, sort_keys=True)
+    else:
+        snapshot[prefix] = str(data)
+
+
+def _capture_kernel(snapshot: Snapshot):
+    uname = platform.uname()
+    snapshot["kernel.release"] = uname.release
+    snapshot["kernel.version"] = uname.version
+    snapshot["kernel.machine"] = uname.machine
+    snapshot["kernel.cmdline"] = _read("/proc/cmdline") or ""
+    snapshot["hostname"] = uname.node
+    snapshot["loadavg"] = _read("/proc/loadavg") or ""
+
+    for root, _, files in os.walk("/proc/sys"):
+        for fname in files:
+            path = os.path.join(root, fname)
+            value = _read(path)
+            if value is not None:
+                key = os.path.relpath(path, "/proc/sys").replace("/", ".")
+                snapshot[f"sysctl.{key}"] = " ".join(value.split())
+
+    kconfig = None
+    try:
+        with gzip.open("/proc/config.gz", "rt") as f:
+            kconfig = f.read()
+    except OSError:
+        kconfig = _read(f"/boot/config-{uname.release}")
+    for line in (kconfig or "").splitlines():
+        if line.startswith("CONFIG_"):
+            key, _, value = line.partition("=")
+            snapshot[f"kconfig.{key}"] = value
+
+    for line in (_read("/proc/modules") or "").splitlines():
+        snapshot[f"module.{line.split()[0]}"] = "loaded"
+
+
+def _capture_cpu(snapshot: Snapshot):
+    snapshot["cpu.count"] = str(os.cpu_count())
+    for line in (_read("/proc/cpuinfo") or "").splitlines():
+        if line.startswith("model name"):
+            snapshot["cpu.model"] = line.split(":", 1)[1].strip()
+            break
+    for cpu_dir in sorted(glob.glob("/sys/devices/system/cpu/cpu[0-9]*")):
+        cpu = os.path.basename(cpu_dir)
+        for fname in ("scaling_governor", "scaling_driver", "scaling_min_freq", "scaling_max_freq"):
+            value = _read(os.path.join(cpu_dir, "cpufreq", fname))
+            if value is not None:
+                snapshot[f"{cpu}.{fname}"] = value
+        online = _read(os.path.join(cpu_dir, "online"))
+        if online is not None:
+            snapshot[f"{cpu}.online"] = online
+    for path in ("intel_pstate/no_turbo", "cpufreq/boost", "smt/control"):
+        value = _read(f"/sys/devices/system/cpu/{path}")
+        if value is not None:
+            snapshot[f"cpu.{path.replace('/', '.')}"] = value
+    for irq_dir in glob.glob("/proc/irq/[0-9]*"):
+        value = _read(os.path.join(irq_dir, "smp_affinity"))
+        if value is not None:
+            snapshot[f"irq.{os.path.basename(irq_dir)}.smp_affinity"] = value
+
+
+def _capture_system(snapshot: Snapshot):
+    for line in (_read("/etc/os-release") or "").splitlines():
+        key, _, value = line.partition("=")
+        if value:
+            snapshot[f"os.{key}"] = value.strip('"')
+    for part in psutil.disk_partitions(all=True):
+        snapshot[f"mount.{part.mountpoint}"] = f"{part.device} {part.fstype} {part.opts}"
+    snapshot["memory.total"] = str(psutil.virtual_memory().total)
+
+
+def _capture_docker(snapshot: Snapshot):
+    try:
+        _flatten("docker", get_docker_client().info(), snapshot)
+    except (docker.errors.DockerException, requests.exceptions.ConnectionError) as e:
+        bm_log(f"docker daemon information will not be recorded: {e}", LogType.WARNING)
+        return
+    daemon_json = _read("/etc/docker/daemon.json")
+    if daemon_json:
+        _flatten("dockerd.config", json.loads(daemon_json), snapshot)
+    for proc in psutil.process_iter(["name", "cmdline"]):
+        if proc.info["name"] == "dockerd":
+            snapshot["dockerd.cmdline"] = " ".join(proc.info["cmdline"] or [])
+            break
+
+
+def capture() -> Snapshot:
+    """
+    Captures the host and docker daemon configuration that may influence the
+    performance of the benchmark, as a flat dictionary.
+    """
+    snapshot: Snapshot = {}
+    _capture_kernel(snapshot)
+    _capture_cpu(snapshot)
+    _capture_system(snapshot)
+    _capture_docker(snapshot)
+    return snapshot
+
+
+def get_snapshot() -> Snapshot:
+    """
+    Returns the snapshot of the host, captured once per bm-runner run and shared by the cache
+    of the campaign points and the records of the campaigns.
+    """
+    global g_snapshot
+    if g_snapshot is None:
+        g_snapshot = capture()
+    return g_snapshot
+
+
+def is_volatile(key: str) -> bool:
+    return key.startswith(VOLATILE_PREFIXES) or any(p.match(key) for p in VOLATILE_PATTERNS)
+
+
+def fingerprint(snapshot: Snapshot) -> str:
+    """
+    Returns a hash of the non volatile part of the snapshot.
+    """
+    stable = {k: v for k, v in snapshot.items() if not is_volatile(k)}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True).encode()).hexdigest()
+
+
+def diff(old: Snapshot, new: Snapshot) -> dict[str, list[Optional[str]]]:
+    """
+    Returns the non volatile keys that differ between the two snapshots as
+    key => [old value, new value], where None stands for a missing key.
+    """
+    keys = set(old).union(new)
+    return {
+        k: [old.get(k), new.get(k)]
+        for k in sorted(keys)
+        if not is_volatile(k) and old.get(k) != new.get(k)
+    }
+
+
+class SnapshotCache:
+    """
+    Content-addressed store of host snapshots. A snapshot is stored in full the first time,
+    later snapshots are stored as the changes against the full snapshot they derive from.
+    """
+
+    def __init__(self, cache_dir: str = SNAPSHOT_DIR):
+        self.cache_dir = str(bm_utils.resolve_path(cache_dir))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __path(self, fp: str) -> str:
+        return os.path.join(self.cache_dir, f"{fp}.json")
+
+    def contains(self, fp: str) -> bool:
+        return os.path.exists(self.__path(fp))
+
+    def latest(self) -> Optional[str]:
+        return _read(os.path.join(self.cache_dir, LATEST_FILE))
+
+    def load(self, fp: str) -> Snapshot:
+        with open(self.__path(fp)) as f:
+            entry = json.load(f)
+        if entry.get("base") is None:
+            return entry["snapshot"]
+        snapshot = self.load(entry["base"])
+        for key, (_, value) in entry["changes"].items():
+            if value is None:
+                snapshot.pop(key, None)
+            else:
+                snapshot[key] = value
+        return snapshot
+
+    def store(self, snapshot: Snapshot) -> str:
+        fp = fingerprint(snapshot)
+        if not self.contains(fp):
+            latest = self.latest()
+            entry: dict = {"fingerprint": fp, "base": None}
+            if latest is not None and self.contains(latest):
+                with open(self.__path(latest)) as f:
+                    base = json.load(f).get("base") or latest
+                entry["base"] = base
+                entry["changes"] = diff(self.load(base), snapshot)
+            else:
+                entry["snapshot"] = {k: v for k, v in snapshot.items() if not is_volatile(k)}
+            with open(self.__path(fp), "w") as f:
+                json.dump(entry, f, indent=2, sort_keys=True)
+        with open(os.path.join(self.cache_dir, LATEST_FILE), "w") as f:
+            f.write(fp)
+        return fp
+
+
+def save_host_snapshot(output_dir):
+    """
+    Records the host configuration of a campaign in `sys-config.json`. The file references the
+    snapshot in the cache by its fingerprint, and lists what changed since the previous campaign.
+    The full system dumps of the scripts are only collected when the host configuration changed.
+    """
+    if not bm_utils.check_data_directory(output_dir):
+        return
+    cache = SnapshotCache()
+    snapshot = get_snapshot()
+    fp = fingerprint(snapshot)
+    previous = cache.latest()
+    changed = not cache.contains(fp)
+    cache.store(snapshot)
+
+    changes = {}
+    if previous is not None and previous != fp and cache.contains(previous):
+        changes = diff(cache.load(previous), snapshot)
+    record = {
+        "fingerprint": fp,
+        "previous": previous,
+        "changes": changes,
+        "volatile": {k: v for k, v in snapshot.items() if is_volatile(k)},
+    }
+    with open(os.path.join(output_dir, "sys-config.json"), "w") as f:
+        json.dump(record, f, indent=2, sort_keys=True)
+
+    if changed:
+        bm_log(f"new host configuration {fp[:12]}, {len(changes)} changes", LogType.INFO)
+        dump_dir = os.path.join(cache.cache_dir, fp)
+        os.makedirs(dump_dir, exist_ok=True)
+        bm_utils.save_sys_config(dump_dir)
+        bm_utils.save_docker_daemon_config(dump_dir)
+    else:
+        bm_log(f"host configuration {fp[:12]} unchanged, reusing the snapshot", LogType.INFO)
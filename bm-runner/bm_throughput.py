@@ -0,0 +1,67 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import multiprocessing
+import sys
+from typing import Any
+from benchkit.campaign import Campaign
+from bm_container import ContainerPool
+from bm_executer import ExecutionUnit
+from utils.docker_client import reset_docker_client
+from utils.logger import bm_log, LogType
+import utils.partition
+from utils.partition import Partition
+
+
+def point_weight(point: dict[str, Any]) -> int:
+    """
+    Estimated cost of a campaign point, the number of cores it keeps busy.
+    """
+    return int(point.get("container_cnt", 1)) * int(point.get("nb_threads", 1))
+
+
+def split_points(points: list[dict[str, Any]], count: int) -> list[list[dict[str, Any]]]:
+    """
+    Splits the campaign points in `count` groups of similar total weight,
+    assigning the heaviest points first to the least loaded group.
+    """
+    groups: list[list[dict[str, Any]]] = [[] for _ in range(count)]
+    loads = [0] * count
+    for point in sorted(points, key=point_weight, reverse=True):
+        i = loads.index(min(loads))
+        groups[i].append(point)
+        loads[i] += point_weight(point)
+    return groups
+
+
+def _run_partition(campaign: Campaign, partition: Partition):
+    utils.partition.g_partition = partition
+    ExecutionUnit.use_partition(partition.index)
+    # the connections of the docker client cannot be shared with the parent process
+    reset_docker_client()
+    bm_log(f"partition {partition.index} runs on cores {partition.cpus}", LogType.INFO)
+    try:
+        campaign.campaign_run(other_campaigns_seconds=0, barrier=None)
+    finally:
+        # the forked process exits with `os._exit`, without running the atexit handlers
+        ContainerPool.release_all()
+
+
+def run_partitioned(campaigns: list[Campaign], partitions: list[Partition]):
+    """
+    Runs each campaign in its own process, restricted to its partition, all at the same time.
+    """
+    assert len(campaigns) == len(partitions)
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_run_partition, args=(campaign, partition))
+        for campaign, partition in zip(campaigns, partitions)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    failed = [p.index for p, process in zip(partitions, processes) if process.exitcode != 0]
+    if failed:
+        bm_log(f"the campaigns of partitions {failed} have failed", LogType.FATAL)
+        sys.exit(1)
@@ -1,11 +1,12 @@
 # Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
 # SPDX-License-Identifier: MIT
 
+import glob
+import hashlib
 import os
 import sys
-import socket
+import time
 from benchkit.shell.shell import shell_out
-from benchkit.utils.dir import get_curdir
 import psutil
 import shutil
 from typing import Optional
@@ -14,6 +15,8 @@ import json
 from utils.logger import bm_log, LogType
 from benchkit.utils.types import PathType
 from config.env_config import EnvUniversalConfig, UniversalConfig
+from config.container import PlacementPolicy
+from utils.topology import Placement, Topology, parse_cpu_list, place
 
 
 def resolve_path(path: PathType, use_in_container: bool = False) -> PathType:
@@ -32,26 +35,123 @@ def resolve_path(path: PathType, use_in_container: bool = False) -> PathType:
     return new_path
 
 
+BUILD_STATE_FILE = "csb-build.json"
+BUILD_TYPE = "Release"
+
+
+def _hash_files(paths: list[str]) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(path.encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def get_bench_targets(bench_src_dir) -> dict[str, list[str]]:
+    """
+    Returns the builtin benchmark targets that can be built, with the source files
+    each of them depends on.
+    """
+    bench_dir = os.path.join(bench_src_dir, "bench")
+    include_dir = os.path.join(bench_dir, "include", "CSB")
+    common = sorted(os.path.join(include_dir, f) for f in os.listdir(include_dir))
+    targets = {"client": common + [os.path.join(bench_dir, "client.c")]}
+    for header in sorted(glob.glob(os.path.join(bench_dir, "targets", "*.h"))):
+        # cmake names the targets after the lower case name of the header
+        name = Path(header).stem.lower()
+        targets[name] = common + [header, os.path.join(bench_dir, "benchmark.c")]
+    return targets
+
+
+def _get_configure_cmd(bench_src_dir) -> str:
+    build_dir = os.path.join(bench_src_dir, "build")
+    return f"cmake -DCMAKE_BUILD_TYPE={BUILD_TYPE} -S{bench_src_dir} -B{build_dir}"
+
+
+def _get_configure_hash(bench_src_dir) -> str:
+    # the compile flags are set by the cmake files and the environment
+    cmake_files = [
+        os.path.join(bench_src_dir, "CMakeLists.txt"),
+        os.path.join(bench_src_dir, "bench", "CMakeLists.txt"),
+    ]
+    env_flags = [f"{k}={os.getenv(k, '')}" for k in ("CC", "CFLAGS", "LDFLAGS")]
+    return hashlib.sha256(
+        " ".join(
+            [_get_configure_cmd(bench_src_dir)] + env_flags + [_hash_files(cmake_files)]
+        ).encode()
+    ).hexdigest()
+
+
+def get_bench_hashes(bench_src_dir, targets: list[str]) -> dict[str, str]:
+    """
+    Returns the hash of the sources and compile flags of each target, which identifies
+    its binary without building it.
+    """
+    configure_hash = _get_configure_hash(bench_src_dir)
+    sources = get_bench_targets(bench_src_dir)
+    return {
+        target: hashlib.sha256((configure_hash + _hash_files(sources[target])).encode()).hexdigest()
+        for target in targets
+    }
+
+
 # Builds the C micro-benchmarks
 # bench_src_dir should be the project folder of bench
-def build_bench(bench_src_dir):
+def build_bench(bench_src_dir, targets: list[str], output_dir=None):
+    """
+    Builds the given targets. A target is only rebuilt when the hash of its sources and
+    compile flags differs from the one of its previous build.
+    The build time of each target is saved in `build.json` in output_dir.
+    """
     build_dir = os.path.join(bench_src_dir, "build")
-    config_cmd = f"cmake -DCMAKE_BUILD_TYPE=Release -S{bench_src_dir} -B{build_dir}"
-    build_cmd = f"cmake --build {build_dir} -j"
+    bench_build_dir = os.path.join(build_dir, "bench")
+    state_file = os.path.join(build_dir, BUILD_STATE_FILE)
+    config_cmd = _get_configure_cmd(bench_src_dir)
     if not EnvUniversalConfig.is_on(UniversalConfig.CSB_NO_CLEAN_BENCH):
         bm_log("Cleaning previous bench build...", LogType.INFO)
         shell_out(
             f"rm -rf {build_dir}/*",
             output_is_log=True,
         )
-    shell_out(
-        f"{config_cmd}",
-        output_is_log=True,
-    )
-    shell_out(
-        f"{build_cmd}",
-        output_is_log=True,
-    )
+
+    state = {}
+    if os.path.exists(state_file):
+        with open(state_file) as f:
+            state = json.load(f)
+
+    configure_hash = _get_configure_hash(bench_src_dir)
+    if state.get("configure") != configure_hash or not os.path.exists(
+        os.path.join(build_dir, "CMakeCache.txt")
+    ):
+        shell_out(
+            f"{config_cmd}",
+            output_is_log=True,
+        )
+        state = {"configure": configure_hash, "targets": {}}
+
+    report = {}
+    for target, target_hash in get_bench_hashes(bench_src_dir, targets).items():
+        built = state["targets"].get(target)
+        if built == target_hash and os.path.exists(os.path.join(bench_build_dir, target)):
+            bm_log(f"{target} is up to date, skipping its build", LogType.INFO)
+            report[target] = {"hash": target_hash, "cached": True, "build_time_sec": 0.0}
+            continue
+        start = time.monotonic()
+        shell_out(
+            f"cmake --build {build_dir} --target {target} -j",
+            output_is_log=True,
+        )
+        build_time = time.monotonic() - start
+        bm_log(f"{target} built in {build_time:.2f}s", LogType.INFO)
+        state["targets"][target] = target_hash
+        report[target] = {"hash": target_hash, "cached": False, "build_time_sec": build_time}
+        with open(state_file, "w") as f:
+            json.dump(state, f, indent=2)
+
+    if output_dir is not None and check_data_directory(output_dir):
+        with open(os.path.join(output_dir, "build.json"), "w") as f:
+            json.dump(report, f, indent=2)
 
 
 def check_data_directory(output_dir):
@@ -108,33 +208,155 @@ def save_docker_daemon_config(output_dir):
             )
 
 
-# save all configuration specific to an individual container that
+# docker inspect keys that differ between containers and runs with the same configuration
+CONTAINER_SPECIFIC_KEYS = {
+    "Id",
+    "ID",
+    "Pid",
+    "LogPath",
+    "Created",
+    "StartedAt",
+    "FinishedAt",
+    "ResolvConfPath",
+    "HostnamePath",
+    "HostsPath",
+    "LowerDir",
+    "MergedDir",
+    "UpperDir",
+    "WorkDir",
+    "Hostname",
+    "SandboxID",
+    "SandboxKey",
+}
+
+# cgroup v2 and v1 interface files that limit the resources of a container
+CGROUP_FILES = [
+    "cpu.max",
+    "cpu.weight",
+    "cpuset.cpus",
+    "cpuset.cpus.effective",
+    "cpuset.mems",
+    "cpuset.mems.effective",
+    "memory.max",
+    "memory.high",
+    "memory.swap.max",
+    "pids.max",
+    "io.max",
+    "cpu.cfs_quota_us",
+    "cpu.cfs_period_us",
+    "cpu.shares",
+    "memory.limit_in_bytes",
+]
+
+
+def mask_keys(data, keys: set[str], mask: str = "CONTAINER-SPECIFIC"):
+    """
+    Returns a copy of the given JSON like data where the values of the given keys are replaced
+    by `mask`, at any depth.
+    """
+    if isinstance(data, dict):
+        return {k: mask if k in keys else mask_keys(v, keys, mask) for k, v in data.items()}
+    if isinstance(data, list):
+        return [mask_keys(v, keys, mask) for v in data]
+    return data
+
+
+def read_cgroup_config(pid: int) -> dict[str, str]:
+    """
+    Reads the cgroup limits applied to the given process from cgroupfs.
+    """
+    try:
+        with open(f"/proc/{pid}/cgroup") as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        return {"error": str(e)}
+
+    config = {}
+    for line in lines:
+        _, controllers, path = line.split(":", 2)
+        # cgroup v2 has a single hierarchy without controllers
+        base = "/sys/fs/cgroup" if controllers == "" else f"/sys/fs/cgroup/{controllers}"
+        for fname in CGROUP_FILES:
+            try:
+                with open(os.path.join(f"{base}{path}", fname)) as f:
+                    config[fname] = f.read().strip()
+            except OSError:
+                pass
+    return config
+
+
+# save the configuration of the containers of a run that
 # might influence the performance of the benchmark
-def save_container_config(output_dir, container_name):
+def save_containers_config(output_dir, configs: dict[str, dict]):
     if check_data_directory(output_dir):
-        container_config_dir = os.path.join(output_dir)
-        script_path = "../scripts/get-docker-container-info.sh"
-
         assert os.path.exists(output_dir), f"output dir {output_dir} does not exist!"
-        if os.path.exists(script_path):
-            shell_out(
-                [
-                    script_path,
-                    container_config_dir,
-                    container_name,
-                ],
-                current_dir=get_curdir(__file__),
-                output_is_log=True,
-            )
-            bm_log(
-                f"container configuration saved in {container_config_dir}.",
-                LogType.INFO,
-            )
+        config_file = os.path.join(output_dir, "containers-config.json")
+        with open(config_file, "w") as f:
+            json.dump(configs, f, indent=2, sort_keys=True)
+        bm_log(f"container configuration saved in {config_file}.", LogType.INFO)
+
+
+def get_placements(
+    policy: PlacementPolicy,
+    count: int,
+    core_count: int,
+    offsets: list[int],
+    exclude: Optional[set[int]] = None,
+    allowed: Optional[list[int]] = None,
+) -> list[Placement]:
+    """
+    Returns the cores and memory nodes of `count` execution units, each with `core_count` cores.
+    The `offsets` are the first core of each unit, they are only used by the OFFSETS policy.
+    The cores in `exclude` are not used, except when they are explicitly given by the offsets.
+    When `allowed` is given, only these cores are used and the offsets index them.
+    """
+    exclude = exclude or set()
+    topology = Topology()
+    if policy != PlacementPolicy.OFFSETS:
+        if allowed is not None:
+            exclude = exclude | (set(topology.cpus) - set(allowed))
+        return place(topology, policy, count, core_count, exclude)
+    placements = []
+    for i in range(count):
+        if allowed is not None:
+            cpus = [allowed[(offsets[i] + k) % len(allowed)] for k in range(core_count)]
         else:
+            cpus = parse_cpu_list(get_cpu_set(start=offsets[i], core_cnt=core_count))
+        if exclude.intersection(cpus):
             bm_log(
-                f"`get-docker-container-info.sh` script does not exist in: {script_path}. docker container information will not be recorded.",
-                LogType.ERROR,
+                f"cores {sorted(exclude.intersection(cpus))} of unit {i} are housekeeping cores",
+                LogType.WARNING,
             )
+        placements.append(Placement(cpus=cpus, mems=topology.nodes_of(cpus)))
+    return placements
+
+
+def pin_current_process(cpus: list[int]):
+    """
+    Pins all the threads of the current process to the given cpus. Threads and
+    processes created afterwards inherit the pinning.
+    """
+    for tid in os.listdir("/proc/self/task"):
+        try:
+            os.sched_setaffinity(int(tid), cpus)
+        except ProcessLookupError:
+            pass  # the thread has exited
+
+
+def read_busy_cpu_time(cpus: list[int]) -> float:
+    """
+    Returns the time in seconds the given cpus have spent outside of idle and iowait
+    since boot, read from /proc/stat.
+    """
+    busy = 0
+    with open("/proc/stat") as f:
+        for line in f:
+            name, *fields = line.split()
+            if name.startswith("cpu") and name[3:].isdigit() and int(name[3:]) in cpus:
+                # user nice system idle iowait irq softirq steal
+                values = [int(v) for v in fields[:8]]
+                busy += sum(values) - values[3] - values[4]
+    return busy / os.sysconf("SC_CLK_TCK")
 
 
 def get_cpu_set(start: int, core_cnt: int) -> str:
@@ -162,14 +384,56 @@ def get_cpu_set(start: int, core_cnt: int) -> str:
     return cores
 
 
-def is_port_free_to_use(port, host="127.0.0.1"):
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(1)
+# TCP states of /proc/net/tcp that do not prevent binding the local port
+TCP_STATES_FREE = {"06", "07"}  # TIME_WAIT, CLOSE
+MAX_PORT = 65535
+
+
+def get_used_ports() -> set[int]:
+    """
+    Returns the local TCP ports that are in use, read in one pass from
+    /proc/net/tcp and /proc/net/tcp6.
+    """
+    used = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
         try:
-            s.connect((host, port))
-            return False  # connection succeeded → port is in use
-        except (ConnectionRefusedError, OSError):
-            return True  # connection failed → port is free
+            with open(table) as f:
+                lines = f.read().splitlines()[1:]  # skip the header
+        except OSError:
+            continue
+        for line in lines:
+            fields = line.split()
+            if fields[3] not in TCP_STATES_FREE:
+                used.add(int(fields[1].rsplit(":", 1)[1], 16))
+    return used
+
+
+def find_free_port_range(start: int, count: int, used: set[int]) -> Optional[int]:
+    """
+    Returns the first port p >= start such that [p, p + count) contains no used port,
+    or None if there is no such range.
+    """
+    port = start
+    while port + count - 1 <= MAX_PORT:
+        busy = [p for p in range(port, port + count) if p in used]
+        if not busy:
+            return port
+        port = busy[-1] + 1
+    return None
+
+
+def delete_netns(names: list[str]):
+    """
+    Deletes the given network namespaces with a single `ip` invocation,
+    the namespaces that do not exist are ignored.
+    """
+    if not names:
+        return
+    shell_out(
+        "sudo ip -force -batch -",
+        std_input="".join(f"netns del {name}\n" for name in names),
+        ignore_any_error_code=True,
+    )
 
 
 def stop_process(pid: int):
@@ -1,6 +1,7 @@
 # Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
 # SPDX-License-Identifier: MIT
 
+import copy
 import os
 import datetime
 import glob
@@ -11,7 +12,6 @@ from pandas import DataFrame
 import seaborn as sns
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-import base64
 import statistics
 import math
 from benchkit.utils.dir import parentdir
@@ -19,8 +19,11 @@ from config.plot import PlotConfig
 from config.plot import PlotType
 import time
 from pathlib import Path
+from typing import Optional
 import re
 from utils.logger import bm_log, LogType
+from utils.linearity import compute_linearity
+from utils import columnar
 
 # TODO: refactor histogram building not to use global vars
 # TODO: document functions
@@ -128,39 +131,47 @@ def _add_css_style(doc: document):
 
 
 ###########################################################################
-def embed_img(path) -> div:
-    data_uri = base64.b64encode(open(path, "rb").read()).decode("utf-8")
-    img_tag = f"data:image/png;base64,{data_uri}"
-    return div(img(src=img_tag))
+# the figures are linked from the HTML document, relative to it, and only loaded when shown
+def link_img(path, html_dir) -> div:
+    return div(img(src=os.path.relpath(path, html_dir), loading="lazy"))
 
 
-def embed_svg(path) -> div:
+def link_svg(path, html_dir) -> div:
+    # the height is given by the svg header
     with open(path, "r") as file:
-        svg_content = file.read()
-    # extract height from svg content
-    height = re.search(r'height="([^"]+)"', svg_content)
+        header = file.read(4096)
+    height = re.search(r'height="([^"]+)"', header)
     h = height.group(1) if height else "1200"
     # Note that we put each svg into an iframe to avoid all types of conflicts
     # on IDs, styles, global variable names etc.
     # The content of iframe will be rendered as a separate html document
-    return div(iframe(srcdoc=svg_content, width="100%", height=f"{h}px"))
+    return div(
+        iframe(src=os.path.relpath(path, html_dir), width="100%", height=f"{h}px", loading="lazy")
+    )
 
 
 ###########################################################################
 def get_common_fields(df: DataFrame) -> list[str]:
-    return [col for col in df.columns if df[col].nunique() == 1]
+    # the histograms loaded from the columnar store are lists, never constant
+    return [
+        col
+        for col in df.columns
+        if not col.endswith(columnar.HISTOGRAM_SUFFIX) and df[col].nunique() == 1
+    ]
 
 
 ###########################################################################
-def add_info_tbl(df, doc: document, result_file: str):
-    info_points = get_common_fields(df)
+def add_info_tbl(df, doc: document, result_file: str, constants: Optional[dict] = None):
+    # the constant columns that are not loaded are given with their value
+    constants = constants or {}
+    info_points = [c for c in constants if c not in df.columns] + get_common_fields(df)
     tbl = table()
     r = tr()
     r.add(td("Results file name:"))
     r.add(td(result_file))
     tbl.add(r)
     for info in info_points:
-        value = df[info].unique()
+        value = df[info].unique() if info in df.columns else [constants[info]]
         r = tr()
         r.add(td(info))
         if len(value) == 1:
@@ -175,7 +186,7 @@ def add_info_tbl(df, doc: document, result_file: str):
 
 
 ###########################################################################
-def create_success_rate_plot(org_df, config: PlotConfig, dir):
+def create_success_rate_plot(org_df, config: PlotConfig, dir, info: str):
     prefix = config.y
     count_col = f"{prefix}_count"
     succ_col = f"{prefix}_succ_count"
@@ -187,11 +198,11 @@ def create_success_rate_plot(org_df, config: PlotConfig, dir):
     )
     # overwrite
     config.y = succ_percent
-    plot_chart(plot=config, df=df, out_fig_name=f"{dir}/{prefix}_succ_percent")
+    plot_chart(plot=config, df=df, out_fig_name=f"{dir}/{prefix}_succ_percent_{info}")
 
 
 ###########################################################################
-def create_min_max_avg_plot(org_df, config: PlotConfig, dir: str):
+def create_min_max_avg_plot(org_df, config: PlotConfig, dir: str, info: str):
     """
     Treats `config.y` as a prefix and look for min, max, and avg values
     It assumes such columns exist in the dataframe <config.y>_min,
@@ -201,6 +212,7 @@ def create_min_max_avg_plot(org_df, config: PlotConfig, dir: str):
         org_df: dataframe
         config (PlotConfig): plot configuration.
         dir (str): where to store the plot.
+        info (str): the section of the plot, part of its file name.
     """
     prefix = config.y
     min_col = f"{prefix}_min"
@@ -230,7 +242,7 @@ def create_min_max_avg_plot(org_df, config: PlotConfig, dir: str):
     plot_chart(
         plot=config,
         df=transformed_data,
-        out_fig_name=f"{dir}/{config.y}_min_avg_max",
+        out_fig_name=f"{dir}/{config.y}_min_avg_max_{info}",
         estimator="median",
     )
 
@@ -255,7 +267,7 @@ def log_scale(cnt):
 def gen_rows_from_histogram(smr, threads, histogram):
     # split the column value into an array
     # map bucket i to the number of elements of the bucket
-    buckets = histogram.split(",")
+    buckets = histogram.split(",") if isinstance(histogram, str) else histogram
     return [
         # add the row log_scale(int(count)] times
         # to not use log_scale just use count directly
@@ -279,7 +291,7 @@ def implicit_add_columns(trans_df, subdf, histo, x_col, gp_name):
 
 
 ###########################################################
-def create_histogram_plot(df, plot: PlotConfig, dir):
+def create_histogram_plot(df, plot: PlotConfig, dir, info: str):
     col_prefix = plot.y
     histo = f"{col_prefix}_histogram"
     subdf = df[[plot.x, plot.hue, histo]].copy()
@@ -301,46 +313,51 @@ def create_histogram_plot(df, plot: PlotConfig, dir):
     implicit_add_columns(trans_df, subdf, histo, plot.x, plot.hue)
     ############################################################
     plot.y = "latency"  # TODO configure
-    plot_chart(plot=plot, df=trans_df, out_fig_name=f"{dir}/{histo}_boxplot")
+    plot_chart(plot=plot, df=trans_df, out_fig_name=f"{dir}/{histo}_boxplot_{info}")
 
 
 ###########################################################################
 def create_plots(df, plots: list[PlotConfig], dir, info: str):
     for plot in plots:
+        # the plot functions change the configuration, e.g. `y`, it is used by every section
+        plot = copy.deepcopy(plot)
         match plot.type:
             case PlotType.NORMAL:
                 fig_name = f"{dir}/{plot.x}_vs_{plot.y}_{info}"
                 with sns.axes_style("ticks", {"axes.grid": True}):
                     plot_chart(plot=plot, df=df, out_fig_name=fig_name)
             case PlotType.MIN_MAX_AVG:
-                create_min_max_avg_plot(org_df=df, config=plot, dir=dir)
+                create_min_max_avg_plot(org_df=df, config=plot, dir=dir, info=info)
             case PlotType.SUCCESS_PERCENT:
-                create_success_rate_plot(org_df=df, config=plot, dir=dir)
+                create_success_rate_plot(org_df=df, config=plot, dir=dir, info=info)
             case PlotType.HISTOGRAM:
-                create_histogram_plot(df=df, plot=plot, dir=dir)
+                create_histogram_plot(df=df, plot=plot, dir=dir, info=info)
             case PlotType.LINEARITY:
-                create_linearity_plot(df=df, plot=plot, dir=dir)
+                create_linearity_plot(df=df, plot=plot, dir=dir, info=info)
             case _:
                 bm_log(f"unsupported plot type: {plot.type} skipped!", LogType.WARNING)
 
 
 ###########################################################################
-def dump_graphs_to_doc(dir, doc: document, num_plot_in_row=2):
-    # find all generated plots and embed them into the HTML document
+def find_graphs(dir) -> set[str]:
+    # all the generated plots and the figures of the monitors, e.g. flamegraphs
     png = glob.glob(os.path.join(dir, "**", "*.png"), recursive=True)
     svg = glob.glob(os.path.join(dir, "**", "*.svg"), recursive=True)
-    graphs = png + svg
-    graphs.sort()
+    return set(png + svg)
+
+
+def dump_graphs_to_doc(graphs, doc: document, html_dir, num_plot_in_row=2):
+    # link the given plots from the HTML document
     tbl = table()
-    for i, graph in enumerate(graphs):
+    for i, graph in enumerate(sorted(graphs)):
         if graph.endswith(".svg"):
-            img_div = embed_svg(graph)
+            img_div = link_svg(graph, html_dir)
         else:
-            img_div = embed_img(graph)
+            img_div = link_img(graph, html_dir)
         if i % num_plot_in_row == 0:
             line = tr()
             tbl.add(line)
-        clickable_path = os.path.relpath(graph, "./results")
+        clickable_path = os.path.relpath(graph, html_dir)
         line.add(
             td(
                 img_div,
@@ -364,47 +381,62 @@ def split_data_frame(df: DataFrame) -> dict:
     return frames
 
 
-def create_linearity_plot(df: DataFrame, plot: PlotConfig, dir):
+def create_linearity_plot(df: DataFrame, plot: PlotConfig, dir, info: str):
     count_col: str = plot.x  # e.g. container count
     subject_col: str = plot.y  # e.g. throughput
     group_col: str = plot.hue  # e.g. execution env native/container
 
-    assert pd.api.types.is_integer_dtype(df[count_col]), f"{count_col} column must be integer dtype"
-    assert pd.api.types.is_numeric_dtype(df[subject_col]), f"{subject_col} must be a number"
-
-    envs = df[group_col].unique()
-    counts = df[count_col].unique()
-
-    cols = [group_col, count_col, "linearity"]
-    lin_df = pd.DataFrame(columns=cols)  # ty: ignore[invalid-argument-type]
-    for e in envs:
-        for c in counts:
-            # calculate the avg/mean for the given count and group
-            n_avg = df.loc[(df[count_col] == c) & (df[group_col] == e), subject_col].mean()
-            # get the values mapped to one execution unit
-            one_eu = df.loc[(df[count_col] == 1) & (df[group_col] == e), subject_col].values
-            # deduce the performance of one container/execution unit
-            if len(one_eu) == 0:
-                bm_log(
-                    "Cannot generate linearity plot. Make sure to add 1 to the container count in `container_list`",
-                    LogType.ERROR,
-                )
-                return
-            one_avg = one_eu[0]
-            if one_avg == 0.0:
-                bm_log(
-                    "Cannot generate linearity plot. Result for 1 container is 0.0, avoiding division by zero.",
-                    LogType.ERROR,
-                )
-                return
-            # calculate linearity
-            lin = n_avg / one_avg
-            # add a row to the data frame
-            lin_df.loc[len(lin_df)] = {group_col: e, count_col: c, "linearity": lin}
+    lin_df = compute_linearity(df, count_col, subject_col, [group_col])
+    if lin_df is None:
+        return
 
     plot.y = "linearity"
     plot.y_lbl = "Linearity"
-    plot_chart(plot=plot, df=lin_df, out_fig_name=f"{dir}/linearity")
+    plot_chart(plot=plot, df=lin_df, out_fig_name=f"{dir}/linearity_{info}")
+
+
+###########################################################################
+def get_plot_columns(plots: list[PlotConfig]) -> list[str]:
+    """
+    Returns the columns of the results needed by the plots.
+    """
+    columns = ["hostname", "noise", "nb_threads"]
+    for plot in plots:
+        columns += [plot.x, plot.hue]
+        match plot.type:
+            case PlotType.MIN_MAX_AVG:
+                columns += [f"{plot.y}_min", f"{plot.y}_max", f"{plot.y}_avg"]
+            case PlotType.SUCCESS_PERCENT:
+                columns += [f"{plot.y}_count", f"{plot.y}_succ_count"]
+            case PlotType.HISTOGRAM:
+                columns.append(f"{plot.y}_histogram")
+            case _:
+                columns.append(plot.y)
+    return list(dict.fromkeys(columns))
+
+
+def load_results(output_dir: Path, plots: list[PlotConfig]) -> tuple[DataFrame, str, dict]:
+    """
+    Loads the results needed by the plots, from the columnar store when there is one, otherwise
+    from the CSV. Returns them with the file they are loaded from, and the constant columns.
+    """
+    store_path = columnar.get_store_path(output_dir)
+    if os.path.isdir(store_path) and columnar.is_available():
+        import pyarrow as pa
+
+        try:
+            return (
+                columnar.read_columns(store_path, get_plot_columns(plots)),
+                store_path,
+                columnar.read_constant_columns(store_path),
+            )
+        except (pa.ArrowException, OSError) as e:
+            bm_log(f"cannot read {store_path}, falling back to the CSV: {e}", LogType.WARNING)
+    result_file = f"{output_dir}.csv"
+    data_frame = pd.read_csv(
+        result_file, sep=";", comment="#", engine="python", on_bad_lines="error"
+    )
+    return data_frame, result_file, {}
 
 
 ###########################################################################
@@ -433,22 +465,28 @@ def visualize_in_html(output_dir: Path, title: str, plots: list[PlotConfig]):
     doc.add(h2(f"Datetime: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M:%S.%f')}"))
     hostname = ""
     # load data frame
-    result_file = f"{output_dir}.csv"
-    data_frame = pd.read_csv(
-        result_file, sep=";", comment="#", engine="python", on_bad_lines="error"
-    )
+    data_frame, result_file, constants = load_results(output_dir, plots)
     hostname = data_frame["hostname"].unique()
     # we split the data-frame into multiple data frames to help with visualization
     data_frames = split_data_frame(data_frame)
+    output_file_name = os.path.join(parentdir(output_dir), f"{output_dir}.html")
+    html_dir = os.path.dirname(output_file_name)
+    # the figures of the runs, e.g. the flamegraphs, exist before the plots are generated
+    run_graphs = find_graphs(output_dir)
+    graphs = set(run_graphs)
     # For each data frame we'll generate the related graphs
     # and print related information
     for key, df in data_frames.items():
-        add_info_tbl(df, doc, result_file)
+        add_info_tbl(df, doc, result_file, constants)
         create_plots(df, plots, output_dir, info=key)
-        # dump graphs to HTML document
-        dump_graphs_to_doc(output_dir, doc, NUM_PLOTS_PER_ROW)
+        # dump the graphs of this data frame only to HTML document
+        new_graphs = find_graphs(output_dir) - graphs
+        graphs |= new_graphs
+        dump_graphs_to_doc(new_graphs, doc, html_dir, NUM_PLOTS_PER_ROW)
+    if run_graphs:
+        doc.add(h2("Runs"))
+        dump_graphs_to_doc(run_graphs, doc, html_dir, NUM_PLOTS_PER_ROW)
 
-    output_file_name = os.path.join(parentdir(output_dir), f"{output_dir}.html")
     doc.title = f"Results of: {hostname[0]}({title})"
     with open(output_file_name, "w") as f:
         f.write(doc.render())
@@ -2,9 +2,10 @@
 # SPDX-License-Identifier: MIT
 
 import subprocess
-from typing import Optional
+from typing import Optional, TextIO
 from pathlib import Path
 from bm_utils import ensure_exists
+from utils.adapters import get_adapter
 
 
 class Adapter(dict):
@@ -15,22 +16,30 @@ class Adapter(dict):
         Adapters used to transform the output of an external benchmark into
         the format understood by the framework: a line of `<key>:<val>;`
         pairs e.g. `throughput:1000;latency:20;`.
-        If an adapter is used the output of the benchmark is piped
-        to the adapter script. See scripts/adapters for examples.
+        The adapters of fio, stress-ng, will-it-scale, byte-unixbench and redis-server
+        are builtin Python functions, see utils/adapters.py. Any other adapter is a script
+        the output of the benchmark is piped to. See scripts/adapters for examples.
 
         Parameters
         ----------
         name: str
-            Adapter script filename.
+            Builtin adapter name, e.g. `fio`, or adapter script filename.
+            The filenames of the scripts in scripts/adapters select the builtin adapters.
         path: Optional[Path]
             The dir where the script exists. Required if it does not exist
-            system wide, or under script/adapters.
+            system wide, or under script/adapters. A script is always used when it is set.
         -
         """
         super().__init__(name=name, path=path)
-        self.fname = ensure_exists(name, path, self.ENV_VAR)
+        self.fn = get_adapter(name) if path is None else None
+        self.fname = ensure_exists(name, path, self.ENV_VAR) if self.fn is None else None
 
-    def adapt(self, output: str) -> str:
-        # This is a blocking call
-        result = subprocess.run([self.fname], text=True, capture_output=True, input=output)
+    def adapt(self, output: TextIO) -> str:
+        """
+        Transforms the output of a benchmark, read from the given file.
+        """
+        if self.fn is not None:
+            return self.fn(output)
+        # This is a blocking call, the script reads the file directly
+        result = subprocess.run([self.fname], text=True, capture_output=True, stdin=output)
         return result.stdout
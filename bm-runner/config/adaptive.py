@@ -0,0 +1,62 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import sys
+from utils.logger import bm_log, LogType
+
+
+class AdaptiveConfig(dict):
+    def __init__(
+        self,
+        metric: str,
+        max_rel_ci: float = 0.05,
+        confidence: float = 0.95,
+        min_repeat: int = 3,
+        max_repeat: int = 10,
+    ):
+        """
+        Repeats each point of the campaign until its results are stable, instead of a fixed
+        number of times. A point is stable once the confidence interval of the mean of `metric`
+        over the repetitions is within `max_rel_ci` of the mean. The value of a repetition is
+        the average of `metric` over the execution units.
+
+        Parameters
+        ----------
+        metric: str
+            The result used to decide stability.
+            JSON example: `"metric": "throughput_min"`
+        max_rel_ci: float
+            Maximum half width of the confidence interval, relative to the mean.
+            JSON example: `"max_rel_ci": 0.05` for +/-5%
+        confidence: float
+            Confidence level of the interval.
+        min_repeat: int
+            Minimum number of repetitions of each point, at least 2.
+        max_repeat: int
+            Maximum number of repetitions of each point, even if it is not stable.
+        -
+        """
+        super().__init__(
+            metric=metric,
+            max_rel_ci=max_rel_ci,
+            confidence=confidence,
+            min_repeat=min_repeat,
+            max_repeat=max_repeat,
+        )
+        self.metric = metric
+        self.max_rel_ci = max_rel_ci
+        self.confidence = confidence
+        self.min_repeat = min_repeat
+        self.max_repeat = max_repeat
+        if not 2 <= min_repeat <= max_repeat:
+            bm_log(
+                f"adaptive repeats require 2 <= min_repeat <= max_repeat, got {min_repeat} and {max_repeat}",
+                LogType.FATAL,
+            )
+            sys.exit(1)
+        if not 0 < confidence < 1 or max_rel_ci <= 0:
+            bm_log(
+                f"adaptive repeats require 0 < confidence < 1 and max_rel_ci > 0, got {confidence} and {max_rel_ci}",
+                LogType.FATAL,
+            )
+            sys.exit(1)
@@ -13,6 +13,8 @@ class Application(dict):
     CONFIG_KEY: str = "applications"
     DISTRIBUTION_SUM = 1024
     BUILTIN_APP_DIR = "build/bench"
+    # the builtin benchmarks print their results as a JSON record, decoded by the runner
+    BUILTIN_OUTPUT_ARG = "-o=json"
 
     def __init__(
         self,
@@ -55,6 +57,9 @@ class Application(dict):
             duration of the benchmark in seconds, the index of the execution unit in the current benchmarking run, and initial size of the data structure respectively.
             If any of the above is relevant for the external application they can be used in the args
             string. Otherwise they can be omitted.
+            The default arguments of the builtin benchmarks, i.e. with `operations`, also include
+            `-o=json`. The benchmark then prints its results as a JSON record, which is decoded
+            faster than its text output. Use `-o=text` in the args for the text output.
         adapter: Optional[Adapter] = {}
             An adapter object.
             This is only relevant for external applications/benchmarks.
@@ -78,6 +83,8 @@ class Application(dict):
         self.args = (
             "-t={threads} -n={noise} -d={duration} -s={initial_size}" if args is None else args
         )
+        if args is None and len(self.operations) > 0:
+            self.args += f" {self.BUILTIN_OUTPUT_ARG}"
         self.adapter = Adapter(**adapter) if adapter is not None else None
         if len(self.operations) > 0 and sum(self.operations) != self.DISTRIBUTION_SUM:
             bm_log(
@@ -4,6 +4,9 @@
 from enum import Enum
 from typing import Optional
 from config.list import ListConfig
+from config.adaptive import AdaptiveConfig
+from utils.logger import bm_log, LogType
+import sys
 
 
 class ExecutionType(str, Enum):
@@ -14,10 +17,45 @@ class ExecutionType(str, Enum):
     ----------
     NATIVE: Launches the benchmark(s) directly on the host OS.
     CONTAINER: Launches the benchmark(s) inside a container.
+    CGROUP: Launches the benchmark(s) on the host OS, each in its own cgroup v2, requires write access to the hierarchy (root).
+    NAMESPACE: Launches the benchmark(s) on the host OS in new namespaces, with `unshare`.
     """
 
     NATIVE = "native"  # indicates that the benchmark should run natively
     CONTAINER = "container"  # indicates that the benchmark should run inside the container
+    CGROUP = "cgroup"  # indicates that the benchmark should run natively in a dedicated cgroup
+    NAMESPACE = "namespace"  # indicates that the benchmark should run natively in new namespaces
+
+
+class Namespace(str, Enum):
+    """
+    Linux namespaces created for the `namespace` execution type.
+
+    Members
+    ----------
+    PID: Process IDs, `/proc` is remounted when MNT is also created.
+    MNT: Mount points.
+    NET: Network stack, only the loopback interface is available.
+    IPC: System V IPC and POSIX message queues.
+    UTS: Hostname and domain name.
+    USER: User and group IDs, the current user is mapped to root.
+    """
+
+    PID = "pid"
+    MNT = "mnt"
+    NET = "net"
+    IPC = "ipc"
+    UTS = "uts"
+    USER = "user"
+
+    @staticmethod
+    def parse_set(value: str) -> list["Namespace"]:
+        """
+        Parses a comma separated set of namespaces, `none` stands for the empty set.
+        """
+        if value.strip() in ("", "none"):
+            return []
+        return [Namespace(ns.strip()) for ns in value.split(",")]
 
 
 class MonitorType(str, Enum):
@@ -27,7 +65,7 @@ class MonitorType(str, Enum):
 
     Members
     ----------
-    MPSTAT: Runs mpstat and generates related graphs.
+    MPSTAT: Runs mpstat and generates related graphs, per cpu stats in `mpstat-table.csv` per run.
     PERF: Runs perf and generates flame-graphs.
     REDIS_BENCHMARK: parses the output of redis_benchmark.
     SAR_NET: monitors network traffic.
@@ -39,6 +77,10 @@ class MonitorType(str, Enum):
     SAR_NET = "sar_net"
 
 
+# namespaces of the `namespace` execution type, an unprivileged user can create them all
+DEFAULT_NAMESPACES = "pid,mnt,net,ipc,uts,user"
+
+
 class BenchmarkConfig(dict):
     CONFIG_KEY: str = "benchmark_config"
 
@@ -51,6 +93,11 @@ class BenchmarkConfig(dict):
         exec_env: list[ExecutionType] = [ExecutionType.NATIVE, ExecutionType.CONTAINER],
         monitors: dict[MonitorType, list[str]] = {},
         threads: Optional[ListConfig] = None,
+        ready_timeout: int = 60,
+        housekeeping_cores: Optional[list[int]] = None,
+        namespaces: Optional[list[str]] = None,
+        adaptive: Optional[AdaptiveConfig] = None,
+        partitions: int = 1,
     ):
         """
         General configuration for benchmarks, as well as a collection
@@ -63,6 +110,7 @@ class BenchmarkConfig(dict):
             JSON example: `"repeat": 3`
         repeat: int
             Number of times the benchmark should be repeated.
+            Ignored when `adaptive` is set.
             JSON example: `"repeat": 1`
         initial_size: list[int]
             The initial size parameter that should be passed
@@ -73,13 +121,44 @@ class BenchmarkConfig(dict):
             operations.
             JSON example: `"noise" : [0, 1000]`
         exec_env: list[ExecutionType] = ["native", "container"]
-            Whether to execute the benchmark in a container or
-            natively. JSON example: `"exec_env" : ["container", "native"]`
+            Whether to execute the benchmark in a container, natively or natively in a
+            dedicated cgroup. JSON example: `"exec_env" : ["container", "native"]`
         monitors: dict[MonitorType, list[str]]
             Monitors to run in the background.
         threads: ListConfig = {"values": [[1]]}
             Determines number of threads to run target benchmarks with.
             If not provided all applications will be run with 1 thread.
+        ready_timeout: int
+            Maximum time in seconds to wait for all execution units to report ready
+            before the start signal is given. The benchmark is aborted on timeout.
+            The time each unit took to become ready is reported as `ready_time_ms`, when it
+            woke up as `start_ts_ns` (CLOCK_BOOTTIME, since boot) and its delay after the first
+            unit as `start_skew_us`. The builtin benchmarks stamp their own start, the other
+            units are stamped with the 10ms resolution of `/proc/uptime`.
+        housekeeping_cores: Optional[list[int]] = []
+            Cores reserved for bm-runner, the monitors and the plugins. bm-runner is pinned to
+            these cores and the processes it starts inherit the pinning, while the benchmarks are
+            placed on the other cores. The CPU time spent on these cores during each run is
+            reported as `housekeeping_cpu_sec`. JSON example: `"housekeeping_cores" : [0, 1]`
+        namespaces: Optional[list[str]] = ["pid,mnt,net,ipc,uts,user"]
+            Sets of namespaces created for each unit of the `namespace` execution type, as
+            comma separated `Namespace` values or `none`. Each set is a point of the campaign
+            of the `namespace` execution type only, the other types report `none`. Without
+            `user`, creating the namespaces requires root.
+            JSON example: `"namespaces" : ["none", "pid", "net", "pid,mnt,net,ipc,uts,user"]`
+        adaptive: Optional[AdaptiveConfig]
+            Repeat each point until its results are stable instead of `repeat` times.
+            The relative confidence interval reached after each repetition is reported as
+            `rel_ci` (NaN until there are 2 repetitions), and the number of repetitions run so
+            far as `repeats_used`, i.e. the last repetition of a point reports how many were run.
+        partitions: int
+            Throughput mode: split the cores of the host, but the housekeeping cores, in this
+            many disjoint partitions, and run campaign points concurrently, one per partition.
+            The cores of the units are taken from the cores of their partition. Each partition
+            has its own start file, port range and results directory, the results are merged
+            at the end. Every result reports its `partition` and whether the partition shares
+            a physical core, a LLC or a NUMA node with another (`shared_core`, `shared_llc`,
+            `shared_numa`), since concurrent points may interfere with each other.
         -
         """
         self.duration = duration
@@ -88,6 +167,22 @@ class BenchmarkConfig(dict):
         self.noise = noise
         self.exec_env = exec_env
         self.monitors = monitors
+        self.ready_timeout = ready_timeout
+        self.housekeeping_cores = housekeeping_cores if housekeeping_cores is not None else []
+        if namespaces is None:
+            namespaces = [DEFAULT_NAMESPACES]
+        try:
+            for ns in namespaces:
+                Namespace.parse_set(ns)
+        except ValueError as e:
+            bm_log(f"invalid namespaces {namespaces}: {e}", LogType.FATAL)
+            sys.exit(1)
+        self.namespaces = namespaces
+        self.adaptive = AdaptiveConfig(**adaptive) if adaptive is not None else None
+        if partitions < 1:
+            bm_log(f"partitions must be at least 1, got {partitions}", LogType.FATAL)
+            sys.exit(1)
+        self.partitions = partitions
         self.threads = (
             ListConfig.from_dict(threads).get_list()
             if threads is not None
@@ -1,15 +1,41 @@
 # Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
 # SPDX-License-Identifier: MIT
 
+from enum import Enum
 from typing import Optional
 from config.list import ListConfig
+from config.knee import KneeSearchConfig
 import docker
+import re
 import docker.errors
 import sys
 from utils.logger import bm_log, LogType
+from utils.docker_client import get_docker_client
 from utils.platform import get_os, OperatingSystem
 
 
+class PlacementPolicy(str, Enum):
+    """
+    How the cores are assigned to the containers/processes.
+
+    Members
+    ----------
+    OFFSETS: Assigns `core_count` consecutive cores from each of the `core_affinity_offsets`.
+    COMPACT: Fills NUMA nodes, LLC domains and physical cores one after another, SMT siblings first.
+    SPREAD_NUMA: Distributes the units round robin across the NUMA nodes.
+    PHYSICAL_CORE: Uses a single hardware thread of each physical core.
+    LLC_ALIGNED: Keeps the cores of each unit within a single last level cache domain.
+    AVOID_HOUSEKEEPING: Uses the isolated cores only, or all cores but the physical core of CPU 0.
+    """
+
+    OFFSETS = "offsets"
+    COMPACT = "compact"
+    SPREAD_NUMA = "spread_numa"
+    PHYSICAL_CORE = "physical_core"
+    LLC_ALIGNED = "llc_aligned"
+    AVOID_HOUSEKEEPING = "avoid_housekeeping"
+
+
 class ContainersConfig(dict):
     CONFIG_KEY: str = "containers"
     DEFAULT_IMG: dict[OperatingSystem, str] = {
@@ -26,6 +52,15 @@ class ContainersConfig(dict):
         name: str = "",
         image: Optional[str] = None,
         port: Optional[int] = None,
+        parallelism: int = 1,
+        pool: bool = False,
+        stop_timeout: int = 1,
+        placement: PlacementPolicy = PlacementPolicy.OFFSETS,
+        bind_memory: bool = False,
+        cpu_max: Optional[str] = None,
+        memory_max: Optional[str] = None,
+        cgroup_root: str = "csb",
+        knee_search: Optional[KneeSearchConfig] = None,
     ):
         """
         ContainersConfig represents the configuration for multiple containers.
@@ -36,7 +71,9 @@ class ContainersConfig(dict):
             Specifies the number of containers to run.
         core_affinity_offsets: Optional[ListConfig] = core_count * [0, 1, 2, 3, ...]
             Specifies the cores that should be assigned to the containers.
-            Note that the assignment of cores happens in ascending order by default.
+            Note that the assignment of cores happens in ascending order by default, with one
+            offset per container up to the largest count of `container_list`, or of
+            `knee_search` when it is set. Only used with the `offsets` placement.
         core_count: int
             Number of cores to assign to each container.
         name: str
@@ -46,21 +83,100 @@ class ContainersConfig(dict):
         port: Optional[int]
             The starting port number to use for the first container.
             Subsequent containers will use incremented port numbers.
+            If some of these ports are in use, the next range of free ports is used instead.
             This configuration is relevant for networking benchmarks.
+        parallelism: int
+            Maximum number of containers that are created, verified and configured
+            concurrently. With `1` the containers are launched one after another.
+            If any container fails to reach the `running` status the benchmark is aborted.
+        pool: bool
+            Keep idle containers alive between campaign points and repetitions instead of
+            creating and removing them for every run. The benchmark commands are then run with
+            `docker exec` and the cpusets are updated in place. Processes left by a run are
+            killed before the next one, but files written inside the container (e.g. in `/tmp`)
+            persist. The pooled containers are removed when bm-runner exits.
+        stop_timeout: int
+            Grace period in seconds given to the containers to exit after SIGTERM at the end of
+            a run, before they are killed.
+        placement: PlacementPolicy = offsets
+            How the cores are assigned to the containers, or to the processes of native runs.
+            All policies but `offsets` are based on the CPU topology of the host, and the
+            chosen layout is saved in `placement.json` of each run.
+        bind_memory: bool
+            Restrict the memory of each unit to the NUMA nodes of its cores (`cpuset.mems`).
+        cpu_max: Optional[str] = "max"
+            CPU bandwidth limit of each unit of the `cgroup` execution type, written as is to
+            `cpu.max`: `"$MAX $PERIOD"` in microseconds. JSON example: `"cpu_max": "50000 100000"`
+        memory_max: Optional[str] = "max"
+            Memory limit of each unit of the `cgroup` execution type, written as is to
+            `memory.max`. JSON example: `"memory_max": "512M"`
+        cgroup_root: str
+            Parent cgroup of the units of the `cgroup` execution type, relative to the cgroup v2
+            mount point. Each unit gets its own cgroup below it, removed at the end of the run.
+        knee_search: Optional[KneeSearchConfig]
+            Search the container count where the linearity drops instead of running every count
+            of `container_list`, which is then ignored.
         -
         """
-        super().__init__(image=image, name=name, core_count=core_count, port=port)
+        super().__init__(
+            image=image,
+            name=name,
+            core_count=core_count,
+            port=port,
+            parallelism=parallelism,
+            pool=pool,
+            stop_timeout=stop_timeout,
+            placement=placement,
+            bind_memory=bind_memory,
+            cpu_max=cpu_max,
+            memory_max=memory_max,
+            cgroup_root=cgroup_root,
+            knee_search=knee_search,
+        )
         self.container_list = ListConfig.from_dict(container_list).get_list()
         self.core_count = core_count
+        self.knee_search = KneeSearchConfig(**knee_search) if knee_search is not None else None
+        # the knee search runs counts up to its max instead of those of the container list
+        max_count = max(
+            [self.container_list[-1]] + ([self.knee_search.max] if self.knee_search else [])
+        )
         self.core_affinity_offsets = (
             ListConfig.from_dict(core_affinity_offsets).get_list()
             if core_affinity_offsets is not None
-            else [core_count * i for i in range(0, self.container_list[-1])]
+            else [core_count * i for i in range(0, max_count)]
         )
+        if (
+            self.knee_search is not None
+            and PlacementPolicy(placement) == PlacementPolicy.OFFSETS
+            and len(self.core_affinity_offsets) < self.knee_search.max
+        ):
+            bm_log(
+                f"knee search up to {self.knee_search.max} containers requires as many "
+                f"core_affinity_offsets, got {len(self.core_affinity_offsets)}",
+                LogType.FATAL,
+            )
+            sys.exit(1)
         self.image = image if image is not None else self.DEFAULT_IMG[get_os()]
         bm_log(f"Selected image {self.image}", LogType.INFO)
         self.name = name
         self.port = port
+        if parallelism < 1:
+            bm_log(f"parallelism must be at least 1, got {parallelism}", LogType.FATAL)
+            sys.exit(1)
+        self.parallelism = parallelism
+        self.pool = pool
+        if stop_timeout < 0:
+            bm_log(f"stop_timeout must not be negative, got {stop_timeout}", LogType.FATAL)
+            sys.exit(1)
+        self.stop_timeout = stop_timeout
+        self.placement = PlacementPolicy(placement)
+        self.bind_memory = bind_memory
+        if cpu_max is not None and not re.fullmatch(r"(max|\d+)( \d+)?", cpu_max):
+            bm_log(f'cpu_max must be "$MAX $PERIOD", got {cpu_max}', LogType.FATAL)
+            sys.exit(1)
+        self.cpu_max = cpu_max
+        self.memory_max = memory_max
+        self.cgroup_root = cgroup_root
         self.__ensure_img_exists()
 
     def get_container_cnt_list(self) -> list[int]:
@@ -70,7 +186,7 @@ class ContainersConfig(dict):
         return self.core_affinity_offsets
 
     def __pull_image(self):
-        client = docker.from_env()
+        client = get_docker_client()
         bm_log(f"Docker image {self.image} does not exist. Pulling it now...\n", LogType.INFO)
         try:
             client.images.pull(self.image)
@@ -79,7 +195,7 @@ class ContainersConfig(dict):
             sys.exit(1)
 
     def __ensure_img_exists(self):
-        client = docker.from_env()
+        client = get_docker_client()
         try:
             client.images.get(self.image)
         except docker.errors.ImageNotFound:
@@ -13,7 +13,7 @@ class UniversalConfig(str, Enum):
 
     Members
     ----------
-    CSB_NO_CLEAN_BENCH: When set to `true`, it disables the cleaning of the build folder of builtin benchmarks.
+    CSB_NO_CLEAN_BENCH: When set to `false`, the build folder of builtin benchmarks is cleaned before building. By default, only the benchmarks whose sources changed are rebuilt.
     CSB_ANALYZE: When set to `false`, it disables the analysis monitors.
     """
 
@@ -23,7 +23,7 @@ class UniversalConfig(str, Enum):
 
 class EnvUniversalConfig:
     DEFAULT_ENV_CONFIG: dict[UniversalConfig, bool] = {
-        UniversalConfig.CSB_NO_CLEAN_BENCH: False,
+        UniversalConfig.CSB_NO_CLEAN_BENCH: True,
         UniversalConfig.CSB_ANALYZE: True,
     }
     TRUE_VALS: set[str] = {"true", "1", "yes", "on"}
@@ -0,0 +1,52 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import sys
+from utils.logger import bm_log, LogType
+
+
+class KneeSearchConfig(dict):
+    def __init__(
+        self,
+        metric: str,
+        max: int,
+        threshold: float = 0.8,
+        anchors: int = 3,
+        tolerance: int = 1,
+    ):
+        """
+        Searches the container count at which the linearity of `metric` drops below
+        `threshold`, instead of running every count of `container_list`. The campaign first runs
+        `anchors` counts spread between 1 and `max`, then bisects between the last count above
+        the threshold and the first count below it, one campaign per step.
+
+        Parameters
+        ----------
+        metric: str
+            The per unit result the linearity is computed on.
+            JSON example: `"metric": "throughput_min"`
+        max: int
+            Largest container count to consider.
+        threshold: float
+            Linearity below which the units are considered to slow each other down.
+            The linearity of a count is the lowest among the execution types, threads, etc.
+        anchors: int
+            Number of container counts run first, at least 2 (1 and `max`).
+        tolerance: int
+            The search stops once the knee is known within this many containers.
+        -
+        """
+        super().__init__(
+            metric=metric, max=max, threshold=threshold, anchors=anchors, tolerance=tolerance
+        )
+        self.metric = metric
+        self.max = max
+        self.threshold = threshold
+        self.anchors = anchors
+        self.tolerance = tolerance
+        if max < 2 or anchors < 2 or tolerance < 1:
+            bm_log(
+                f"knee search requires max >= 2, anchors >= 2 and tolerance >= 1, got {max}, {anchors} and {tolerance}",
+                LogType.FATAL,
+            )
+            sys.exit(1)
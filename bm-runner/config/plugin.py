@@ -63,8 +63,10 @@ class Plugin(dict):
             or if it is available system wide.
         args: list[str]
             List of arguments to be passed to the script/process.
-            It can include one place holder: `{homedir}`.
-            This is replaced at runtime with the path of the build directory of the CSB project.
+            It can include the place holders: `{homedir}`, replaced at runtime with the path
+            of the build directory of the CSB project, `{port}`, replaced with the first
+            port assigned to the execution units, and `{start_file}`, replaced with the path of
+            the start file relative to `{homedir}`.
         force_stop: bool
             Whether to forcefully stop the process if it is still running during cleanup.
         -
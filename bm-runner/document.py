@@ -3,12 +3,14 @@
 
 import inspect
 from config.application import Application, Adapter
-from config.benchmark import BenchmarkConfig, MonitorType, ExecutionType
-from config.container import ContainersConfig
+from config.benchmark import BenchmarkConfig, MonitorType, ExecutionType, Namespace
+from config.container import ContainersConfig, PlacementPolicy
 from config.plugin import Plugin, ExecutionTime
 from config.plot import PlotConfig, PlotType
 from config.list import ListConfig, RangeConfig
 from config.nics import NicsConfig
+from config.adaptive import AdaptiveConfig
+from config.knee import KneeSearchConfig
 from typing import get_origin, get_args
 from typing import Union, Optional
 from bm_config import CampaignConfig
@@ -16,8 +18,8 @@ from config.env_config import UniversalConfig
 import sys
 import re
 
-g_enums = [MonitorType, PlotType, ExecutionTime, ExecutionType]
-g_sub_types = [Adapter, ListConfig, RangeConfig]
+g_enums = [MonitorType, PlotType, ExecutionTime, ExecutionType, PlacementPolicy, Namespace]
+g_sub_types = [Adapter, ListConfig, RangeConfig, AdaptiveConfig, KneeSearchConfig]
 # main types are those that exist directly in JSON and have a CONFIG_KEY defined
 g_main_types = [BenchmarkConfig, Application, ContainersConfig, Plugin, PlotConfig, NicsConfig]
 main_config = CampaignConfig
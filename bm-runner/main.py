@@ -6,6 +6,7 @@ import pathlib
 import sys
 from pathlib import Path
 import bm_visualize
+from bm_index import ResultsIndex
 from benchmark import ScalabilityBenchmark
 from benchkit.benchmark import (
     CommandWrapper,
@@ -14,13 +15,21 @@ from benchkit.benchmark import (
     CommandAttachment,
 )
 from benchkit.campaign import CampaignCartesianProduct, CampaignSuite
+from benchkit.campaign import CampaignIterateVariables, CampaignTemplate
 from benchkit.utils.dir import get_curdir, parentdir
-from typing import Iterable, Optional, Dict, Any
+from typing import Iterable, Optional, Dict, Any, List
 import bm_config
 from bm_config import CampaignConfig
 from config.benchmark import ExecutionType
 import traceback
 from bm_utils import remove_files_by_ext
+from bm_knee import KneeSearch
+from bm_cache import PointCache, get_campaign_inputs
+from bm_throughput import run_partitioned, split_points
+import bm_utils
+from utils.partition import make_partitions
+from utils.results import merge_results
+from utils.topology import Topology
 from utils.logger import bm_log, LogType
 
 
@@ -38,25 +47,58 @@ def v_campaign(
     execution_type: Iterable[ExecutionType] = (ExecutionType.CONTAINER,),
     container_cnt: Iterable[int] = (1,),
     initial_size: Iterable[int] = (0,),
+    namespaces: Iterable[str] = ("none",),
     debug: bool = False,
     gdb: bool = False,
     enable_data_dir: bool = False,
     continuing: bool = False,
     constants: Optional[Dict[str, Any]] = None,
     pretty: Optional[Dict[str, str]] = None,
-) -> CampaignCartesianProduct:
+    points: Optional[List[Dict[str, Any]]] = None,
+) -> CampaignTemplate:
+    namespaces = list(namespaces)
     variables = {
         "nb_threads": nb_threads,
         "noise": noise,
         "initial_size": initial_size,
         "container_cnt": container_cnt,
         "execution_type": execution_type,
+        # the other execution types do not create namespaces, they only run with `none`
+        "namespaces": list(dict.fromkeys(namespaces + ["none"])),
     }
 
+    def filter_namespaces(point: Dict[str, Any]) -> bool:
+        if point["execution_type"] == ExecutionType.NAMESPACE:
+            return point["namespaces"] in namespaces
+        return point["namespaces"] == "none"
+
     pretty_dict = None
     if pretty is not None:
         pretty_dict = {"lock": pretty}
 
+    if points is not None:
+        # only the given points of the cartesian product are run
+        return CampaignIterateVariables(
+            name=name,
+            benchmark=ScalabilityBenchmark(
+                command_wrappers=command_wrappers,
+                command_attachments=command_attachments,
+                shared_libs=shared_libs,
+                post_run_hooks=post_run_hooks,
+                csb_dir=csb_dir,
+            ),
+            nb_runs=nb_runs,
+            variables=points,
+            constants=constants,
+            debug=debug,
+            gdb=gdb,
+            enable_data_dir=enable_data_dir,
+            continuing=continuing,
+            benchmark_duration_seconds=benchmark_duration_seconds,
+            pretty=pretty_dict,
+            results_dir="../results",
+        )
+
     return CampaignCartesianProduct(
         name=name,
         benchmark=ScalabilityBenchmark(
@@ -76,6 +118,7 @@ def v_campaign(
         benchmark_duration_seconds=benchmark_duration_seconds,
         pretty=pretty_dict,
         results_dir="../results",
+        filter_func=filter_namespaces,
     )
 
 
@@ -87,6 +130,11 @@ if __name__ == "__main__":
         help="Rebuild plots instead of running the benchmark.",
         action="store_true",
     )
+    parser.add_argument(
+        "--reuse",
+        help="Reuse the cached results of the campaign points whose inputs did not change.",
+        action="store_true",
+    )
     parser.add_argument("--title", help="The Benchmark title.", required=True)
     parser.add_argument(
         "--config",
@@ -97,6 +145,7 @@ if __name__ == "__main__":
     (args, dir_arg) = parser.parse_known_args()
 
     arg_continue = args.replot
+    arg_reuse = args.reuse
     arg_title = args.title
     arg_config = args.config
 
@@ -120,33 +169,124 @@ if __name__ == "__main__":
     benchmark_config = bm_config.g_config.get_benchmark_cfg()
     threads = benchmark_config.threads
 
-    # Create campaign
-    campaign = v_campaign(
-        benchmark_duration_seconds=benchmark_config.duration,
-        container_cnt=container_cfg.get_container_cnt_list(),
-        nb_threads=threads,
-        execution_type=benchmark_config.exec_env,
-        noise=benchmark_config.noise,
-        initial_size=benchmark_config.initial_size,
-        nb_runs=benchmark_config.repeat,
-        continuing=arg_continue,
-        enable_data_dir=True,
-        bench_subdir="bench",
-    )
+    def create_campaign(
+        container_cnt: Iterable[int],
+        points: Optional[List[Dict[str, Any]]] = None,
+        name: str = "v_campaign",
+    ) -> CampaignTemplate:
+        return v_campaign(
+            name=name,
+            points=points,
+            benchmark_duration_seconds=benchmark_config.duration,
+            container_cnt=container_cnt,
+            nb_threads=threads,
+            execution_type=benchmark_config.exec_env,
+            noise=benchmark_config.noise,
+            initial_size=benchmark_config.initial_size,
+            namespaces=benchmark_config.namespaces,
+            nb_runs=(
+                benchmark_config.adaptive.max_repeat
+                if benchmark_config.adaptive is not None
+                else benchmark_config.repeat
+            ),
+            continuing=arg_continue,
+            enable_data_dir=True,
+            bench_subdir="bench",
+        )
 
-    campaign_suite = CampaignSuite(campaigns=[campaign])
-    if not arg_continue:
-        campaign_suite.print_durations()
-        campaign_suite.run_suite()
-        results_dir = campaign.base_data_dir()
-    else:
+    def create_cache(campaign: CampaignTemplate) -> PointCache:
+        bench_targets = campaign.parameters["benchmark"].get_bench_targets()
+        return PointCache(get_campaign_inputs(csb_dir, bench_targets))
+
+    def get_missing_points(cache: PointCache, points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not arg_reuse:
+            return points
+        missing = cache.missing(points)
+        bm_log(
+            f"reusing the cached results of {len(points) - len(missing)}/{len(points)} points",
+            LogType.INFO,
+        )
+        return missing
+
+    if arg_continue:
         results_dir = dir_arg[0]
         remove_files_by_ext(results_dir, ["png", "pdf"])
         bm_log(f"re-visualizing results on {results_dir}, old plots will be removed.", LogType.INFO)
+    elif container_cfg.knee_search is not None:
+        # one campaign per step of the search, their results are visualized together
+        search = KneeSearch(container_cfg.knee_search)
+        counts = search.anchors()
+        first_results_dir = None
+        while counts:
+            bm_log(f"knee search: running {counts} containers", LogType.INFO)
+            campaign = create_campaign(counts)
+            CampaignSuite(campaigns=[campaign]).run_suite()
+            create_cache(campaign).store(
+                f"{campaign.base_data_dir()}.csv", campaign.parameters["variables"]
+            )
+            first_results_dir = first_results_dir or campaign.base_data_dir()
+            search.add_results(f"{campaign.base_data_dir()}.csv")
+            counts = search.next_counts()
+        results_dir = f"{first_results_dir}-knee"
+        search.save(results_dir)
+    elif benchmark_config.partitions > 1:
+        # throughput mode: the points of the campaign are spread over concurrent campaigns
+        campaign = create_campaign(container_cfg.get_container_cnt_list())
+        cache = create_cache(campaign)
+        all_points = campaign.parameters["variables"]
+        points = get_missing_points(cache, all_points)
+        campaigns = []
+        if points:
+            count = min(benchmark_config.partitions, len(points))
+            partitions = make_partitions(
+                Topology(),
+                count,
+                port_stride=max(container_cfg.get_container_cnt_list()),
+                exclude=set(benchmark_config.housekeeping_cores),
+            )
+            campaigns = [
+                create_campaign(
+                    container_cfg.get_container_cnt_list(), points=group, name=f"v_campaign_p{i}"
+                )
+                for i, group in enumerate(split_points(points, count))
+            ]
+            # built once, the partitions do not build the benchmarks concurrently
+            bm_utils.build_bench(csb_dir, campaign.parameters["benchmark"].get_bench_targets())
+            run_partitioned(campaigns, partitions)
+        csv_files = [f"{c.base_data_dir()}.csv" for c in campaigns]
+        for csv_file in csv_files:
+            cache.store(csv_file, points)
+        cached = [p for p in all_points if p not in points]
+        results_dir = f"{(campaigns[0] if campaigns else campaign).base_data_dir()}-throughput"
+        merge_results(csv_files + [cache.path(p) for p in cached], results_dir)
+    else:
+        # Create campaign
+        campaign = create_campaign(container_cfg.get_container_cnt_list())
+        cache = create_cache(campaign)
+        all_points = campaign.parameters["variables"]
+        points = get_missing_points(cache, all_points)
+        if len(points) < len(all_points) and points:
+            # only the points without cached results are run
+            campaign = create_campaign(container_cfg.get_container_cnt_list(), points=points)
+        if points:
+            campaign_suite = CampaignSuite(campaigns=[campaign])
+            campaign_suite.print_durations()
+            campaign_suite.run_suite()
+            cache.store(f"{campaign.base_data_dir()}.csv", points)
+        results_dir = campaign.base_data_dir()
+        if len(points) < len(all_points):
+            cached = [p for p in all_points if p not in points]
+            csv_files = [f"{campaign.base_data_dir()}.csv"] if points else []
+            results_dir = f"{campaign.base_data_dir()}-reuse"
+            merge_results(csv_files + [cache.path(p) for p in cached], results_dir)
 
     # generate an html with the results
     if results_dir is not None:
         bm_visualize.visualize_in_html(Path(results_dir), arg_title, bm_config.g_config.get_plots())
+        # index the finished campaigns, to query their results across campaigns
+        index = ResultsIndex()
+        index.ingest_dir()
+        index.close()
     else:
         bm_log("results_dir/base_data_dir is None, cannot visualize results.", LogType.FATAL)
         sys.exit(1)
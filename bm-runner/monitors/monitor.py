@@ -2,9 +2,14 @@
 # SPDX-License-Identifier: MIT
 
 from abc import abstractmethod
+from typing import Optional
+import pandas as pd
 
 
 class Monitor:
+    # name of the long-format table of the monitor, see `collect_table`
+    TABLE_NAME: Optional[str] = None
+
     def __init__(self, dir, args):
         self.dir = dir
         self.args = args
@@ -20,3 +25,11 @@ class Monitor:
     @abstractmethod
     def collect_results(self) -> str:
         pass
+
+    def collect_table(self) -> Optional[pd.DataFrame]:
+        """
+        Returns the per cpu results of the monitor as a long-format table with the columns
+        `cpu`, `metric` and `value`. It is stored once per run rather than added as columns
+        to the results of every execution unit.
+        """
+        return None
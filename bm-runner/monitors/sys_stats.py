@@ -43,6 +43,8 @@ class MpstatCmd:
 
 
 class SystemStats(Monitor):
+    TABLE_NAME = "mpstat"
+
     def __init__(self, output_dir: str, args: list[str] = ["-A"]):
         ensure_exists("mpstat")
         super().__init__(dir=output_dir, args=args)
@@ -55,24 +57,20 @@ class SystemStats(Monitor):
         if self.stat is not None:
             self.stat.stop()
 
-    def transform(self, df: pd.DataFrame) -> str:
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Flattens and transforms the table into a key=val; form
-        so that it can be appended to the results file(s)
+        Transforms the table with a column per metric into a long-format table
+        with a row per cpu and metric
         """
-        results: str = ""
-        for idx, row in df.iterrows():
-            cpu = row["cpu"]
-            for col, val in row.items():
-                results += f"{col}_c{cpu}={val};"
-        return results
+        df = df.astype({"cpu": str})
+        return df.melt(id_vars="cpu", var_name="metric", value_name="value")
 
     def query(self, data, query_str):
         query = parse(query_str)
         matches = [match.value for match in query.find(data)]
         return matches
 
-    def avg_results_p_cpu(self, matches) -> str:
+    def avg_results_p_cpu(self, matches) -> pd.DataFrame:
         df = pd.DataFrame(matches).groupby("cpu").mean().reset_index()
         return self.transform(df)
 
@@ -104,18 +102,29 @@ class SystemStats(Monitor):
         return self.transform(df)
 
     def collect_results(self) -> str:
+        # the per cpu stats are not added to the results, see `collect_table`
         if self.stat:
-            data = self.stat.read_output()
-            self.dump_plot(data)
-            results = self.get_cpu_load(data)
-            results += self.get_sum_interrupts(data)
-            results += self.get_soft_interrupts(data)
-            return results
+            self.dump_plot(self.stat.read_output())
         else:
             bm_log(
                 "Could not read output of sys stats, `self.stat` is not initialized!", LogType.ERROR
             )
-            return ""
+        return ""
+
+    def collect_table(self) -> Optional[pd.DataFrame]:
+        if not self.stat:
+            return None
+        data = self.stat.read_output()
+        tables = []
+        # only the statistics requested by the args of mpstat are reported
+        for get_stats in (self.get_cpu_load, self.get_sum_interrupts, self.get_soft_interrupts):
+            try:
+                tables.append(get_stats(data))
+            except KeyError:
+                pass
+        if not tables:
+            return None
+        return pd.concat(tables, ignore_index=True)
 
     # TODO: decide if the generate should stay here, and if it should be part of the final html
     def dump_plot(self, data):
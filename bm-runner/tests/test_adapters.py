@@ -0,0 +1,55 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import io
+from config.adapter import Adapter
+
+FIO_OUTPUT = """Run status group 0 (all jobs):
+   READ: bw=346MiB/s (363MB/s), 346MiB/s-346MiB/s (363MB/s-363MB/s), io=700MiB (734MB)
+  WRITE: bw=148MiB/s (155MB/s), 148MiB/s-148MiB/s (155MB/s-155MB/s), io=300MiB (315MB)
+"""
+
+STRESS_NG_OUTPUT = """stress-ng: info:  [1] dispatching hogs: 1 cpu
+stress-ng: metrc: [1] stressor       bogo ops real time  usr time  sys time   bogo ops/s     bogo ops/s CPU used per       RSS Max
+stress-ng: metrc: [1]                           (secs)    (secs)    (secs)   (real time) (usr+sys time) instance (%)          (KB)
+stress-ng: metrc: [1] cpu               12345      3.00      2.99      0.00      4115.00        4128.76        99.67          6656
+"""
+
+
+def test_builtin_adapter_replaces_script():
+    adapter = Adapter(name="fio-adapter.sh")
+    assert adapter.fn is not None
+    assert adapter.adapt(io.StringIO(FIO_OUTPUT)) == "read_MiB_bw=346;\n"
+
+
+def test_stress_ng_adapter():
+    adapter = Adapter(name="stress-ng")
+    assert adapter.adapt(io.StringIO(STRESS_NG_OUTPUT)) == (
+        "stressor=cpu;ops=12345;real_time=3.00;usr_time=2.99;sys_time=0.00;"
+        "throughput_real=4115.00;throughput_cpus=4128.76;cpu_percent=99.67;rss_max=6656;\n"
+    )
+
+
+def test_bench_json_adapter():
+    op = {"max": 9, "min": 1, "sum": 20, "count": 4, "succ_count": 4, "skipped_count": 0}
+    record = (
+        '{"version":2,"params":{"num_threads":2,"init_sz":0,"max_noise":0,"duration":1,'
+        '"op_dist":[1024]},"start_ts_ns":123,"target":"bm_empty","extra":"",'
+        '"ops":[{"name":"nop",'
+        + ",".join(f'"{k}":{v}' for k, v in op.items())
+        + ',"avg":5.0,"succ_percent":100.0,"histogram":[1,3]}],'
+        '"univ":{'
+        + ",".join(f'"{k}":{v}' for k, v in op.items())
+        + ',"avg":5.0,"succ_percent":100.0},'
+        '"throughput":{"max":4.0,"min":null},"ticks_to_ms":1,'
+        '"duration":{"max_ms":1000},"rusage":{"max_rss_kb":10}}\n'
+    )
+    line = Adapter(name="bench-json").adapt(io.StringIO(f"plugin output\n{record}"))
+    assert line.startswith(
+        "plugin output\nnum_threads=2;init_sz=0;max_noise=0;duration=1;op0_dist=1024;"
+    )
+    assert "algo_name=bm_empty;nop_max=9;nop_min=1;" in line
+    assert "nop_succ_percent=100.0;nop_histogram=1,3;univ_max=9;" in line
+    assert line.endswith(
+        "throughput_max=4.0;throughput_min=nan;ticks_to_ms=1;duration_max_ms=1000;max_rss_kb=10;\n"
+    )
@@ -0,0 +1,36 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from bm_cache import PointCache, get_point_key
+from config.benchmark import ExecutionType
+
+INPUTS = {"apps": [{"name": "hashmap"}], "host": "abc", "image": {"digest": "sha256:1"}}
+
+
+def point(count, execution_type=ExecutionType.NATIVE):
+    return {"container_cnt": count, "nb_threads": 1, "execution_type": execution_type}
+
+
+def test_point_key():
+    assert get_point_key(INPUTS, point(2)) == get_point_key(dict(INPUTS), point(2))
+    assert get_point_key(INPUTS, point(2)) != get_point_key(INPUTS, point(4))
+    assert get_point_key(INPUTS, point(2)) != get_point_key({**INPUTS, "host": "def"}, point(2))
+    # the image only changes the key of the points run in containers
+    other_image = {**INPUTS, "image": {"digest": "sha256:2"}}
+    assert get_point_key(INPUTS, point(2)) == get_point_key(other_image, point(2))
+    container = point(2, ExecutionType.CONTAINER)
+    assert get_point_key(INPUTS, container) != get_point_key(other_image, container)
+
+
+def test_point_cache(tmp_path):
+    csv_file = tmp_path / "campaign.csv"
+    lines = ["container_cnt;nb_threads;execution_type;throughput"]
+    lines += [f"{count};1;{ExecutionType.NATIVE};{count * 100}" for count in (1, 1, 2)]
+    csv_file.write_text("\n".join(lines) + "\n")
+    cache = PointCache(INPUTS, str(tmp_path / "points"))
+    points = [point(1), point(2), point(4)]
+    assert cache.missing(points) == points
+    assert cache.store(str(csv_file), points) == 2
+    assert cache.missing(points) == [point(4)]
+    with open(cache.path(point(1))) as f:
+        assert len(f.readlines()) == 3
@@ -0,0 +1,19 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from utils.cgroup import Cgroup, parse_stat
+
+
+def test_parse_stat():
+    stat = parse_stat("usage_usec 1200\nuser_usec 1000\nsystem_usec 200\n")
+    assert stat == {"usage_usec": 1200, "user_usec": 1000, "system_usec": 200}
+
+
+def test_create_enables_controllers(tmp_path):
+    cgroup = Cgroup(str(tmp_path / "csb" / "G000_app"), mount=str(tmp_path))
+    cgroup.create()
+    assert (tmp_path / "cgroup.subtree_control").read_text() == "+cpuset +cpu +memory"
+    assert (tmp_path / "csb" / "cgroup.subtree_control").read_text() == "+cpuset +cpu +memory"
+    assert not (tmp_path / "csb" / "G000_app" / "cgroup.subtree_control").exists()
+    assert cgroup.remove()
+    assert not (tmp_path / "csb" / "G000_app").exists()
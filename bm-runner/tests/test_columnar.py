@@ -0,0 +1,54 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import pytest
+from utils import columnar
+
+
+def test_to_records():
+    records = columnar.to_records(
+        [
+            {"container_cnt": 2, "throughput": "10.5", "lat_histogram": "1,0,2", "x": "a"},
+            {"container_cnt": 2, "throughput": "11", "lat_histogram": "", "x": "3"},
+        ]
+    )
+    assert records[0] == {
+        "container_cnt": 2,
+        "throughput": 10.5,
+        "lat_histogram": [1, 0, 2],
+        "x": "a",
+    }
+    # a column with numbers and strings is kept as strings
+    assert records[1] == {"container_cnt": 2, "throughput": 11, "lat_histogram": [], "x": "3"}
+    # identifiers are strings even when they look like numbers
+    assert columnar.to_records([{"point_id": "123e45", "app": 7}]) == [
+        {"point_id": "123e45", "app": "7"}
+    ]
+
+
+def test_store(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = columnar.get_store_path(tmp_path / "campaign")
+    columnar.append_rows(store, [{"hostname": "h", "container_cnt": 1, "thread_0": "7"}])
+    columnar.append_rows(store, [{"hostname": "h", "container_cnt": 2, "thread_1": "8"}])
+    df = columnar.read_columns(store, ["container_cnt", "missing"])
+    assert list(df.columns) == ["container_cnt"]
+    assert list(df["container_cnt"]) == [1, 2]
+    assert columnar.read_constant_columns(store) == {"hostname": "h"}
+
+
+def test_store_mixed_types(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = columnar.get_store_path(tmp_path / "campaign")
+    columnar.append_rows(store, [{"start_ts_ns": "12", "lat": "1", "lat_histogram": ""}])
+    first_part = (tmp_path / "campaign.parquet" / "part-000000.parquet").read_bytes()
+    columnar.append_rows(store, [{"start_ts_ns": "None", "lat": "1.5", "lat_histogram": "1,2"}])
+    # the parts are cast when they are read, never rewritten
+    assert (tmp_path / "campaign.parquet" / "part-000000.parquet").read_bytes() == first_part
+    df = columnar.read_columns(store)
+    assert list(df["start_ts_ns"]) == ["12", "None"]
+    assert list(df["lat"]) == [1.0, 1.5]
+    assert [list(h) for h in df["lat_histogram"]] == [[], [1, 2]]
+    merged = str(tmp_path / "merged.parquet")
+    columnar.merge_stores([store, store], merged)
+    assert len(columnar.read_columns(merged)) == 4
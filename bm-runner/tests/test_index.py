@@ -0,0 +1,49 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+from bm_index import ResultsIndex, get_started
+from config.benchmark import ExecutionType
+
+
+def make_campaign(results_dir, name, hostname, fingerprint, throughput):
+    base = results_dir / name
+    os.makedirs(base)
+    (base / "sys-config.json").write_text(json.dumps({"fingerprint": fingerprint}))
+    (results_dir / f"{name}.json").write_text("{}")
+    lines = ["hostname;app;execution_type;container_cnt;nb_threads;throughput_min;algo_name"]
+    lines += [
+        f"{hostname};mysql;{execution_type};{count};1;{throughput * count};rw"
+        for execution_type in (ExecutionType.NATIVE, ExecutionType.CONTAINER)
+        for count in (1, 2)
+    ]
+    (results_dir / f"{name}.csv").write_text("\n".join(lines) + "\n")
+
+
+def test_started():
+    assert get_started("v_mysql_host_20260102_030405_000006") == "2026-01-02T03:04:05.000006"
+    assert get_started("v_mysql_host_20260102_030405_000006-knee") is None
+
+
+def test_index(tmp_path):
+    for i in range(3):
+        make_campaign(tmp_path, f"v_mysql_h_2026010{i + 1}_000000_000000", "h1", "ab12", i + 1)
+    make_campaign(tmp_path, "v_mysql_h_20260104_000000_000000", "h2", "cd34", 10)
+    # merged results have no copied configuration
+    (tmp_path / "merged-knee.csv").write_text("app;throughput_min\nmysql;1\n")
+
+    index = ResultsIndex(str(tmp_path / "index.db"))
+    assert index.ingest_dir(str(tmp_path)) == 4
+    assert index.ingest_dir(str(tmp_path)) == 0
+
+    df = index.query("throughput_min", app="mysql", execution_type="container", container_cnt=1)
+    assert list(df["throughput_min"]) == [1, 2, 3, 10]
+    df = index.query("throughput_min", container_cnt=2, host="h1", last=2)
+    assert list(df["throughput_min"]) == [4, 4, 6, 6]
+    # the host fingerprint may be used instead of the hostname
+    df = index.query("throughput_min", execution_type="native", host="cd")
+    assert list(df["throughput_min"]) == [10, 20]
+    # only the numeric columns are metrics
+    assert index.query("algo_name").empty
+    index.close()
@@ -0,0 +1,61 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+from bm_knee import KneeSearch
+from bm_utils import get_placements
+from config.container import ContainersConfig, PlacementPolicy
+from config.knee import KneeSearchConfig
+
+
+def run_campaign(path, counts):
+    # every unit gets 100 ops/s up to 12 containers, then they share 1200 ops/s
+    lines = ["execution_type;container_cnt;throughput"]
+    for count in counts:
+        per_unit = 100 if count <= 12 else 1200 / count
+        lines += [f"container;{count};{per_unit}"] * count
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_knee_search(tmp_path):
+    search = KneeSearch(KneeSearchConfig(metric="throughput", max=64, threshold=0.8))
+    counts = search.anchors()
+    assert counts == [1, 33, 64]
+    campaigns = 0
+    while counts:
+        search.add_results(run_campaign(tmp_path / f"{campaigns}.csv", counts))
+        counts = search.next_counts()
+        campaigns += 1
+    # linearity drops below 0.8 at 16 containers
+    assert search.knee() == (15, 16)
+    assert campaigns < 10
+    search.save(str(tmp_path / "knee"))
+    with open(tmp_path / "knee" / "knee.json") as f:
+        assert json.load(f)["knee"] == [15, 16]
+
+
+def test_knee_search_default_offsets(tmp_path, monkeypatch):
+    # the image is not needed to place the units
+    monkeypatch.setattr(ContainersConfig, "_ContainersConfig__ensure_img_exists", lambda _: None)
+    config = ContainersConfig(
+        container_list={"values": [[1]]},
+        image="csb",
+        knee_search={"metric": "throughput", "max": 64},
+    )
+    search = KneeSearch(config.knee_search)
+    counts = search.anchors()
+    campaigns = 0
+    while counts:
+        for count in counts:
+            placements = get_placements(
+                PlacementPolicy.OFFSETS,
+                count=count,
+                core_count=config.core_count,
+                offsets=config.get_core_affinity_offset_list(),
+            )
+            assert len(placements) == count
+        search.add_results(run_campaign(tmp_path / f"{campaigns}.csv", counts))
+        counts = search.next_counts()
+        campaigns += 1
+    assert search.knee() == (15, 16)
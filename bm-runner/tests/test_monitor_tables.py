@@ -0,0 +1,59 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import pandas as pd
+from monitors.sys_stats import SystemStats
+from utils.results import get_point_id, get_table_path, join_table, read_table, save_table
+
+
+class MpstatOutput:
+    def __init__(self, statistics):
+        self.statistics = statistics
+
+    def read_output(self) -> dict:
+        return {"sysstat": {"hosts": [{"statistics": self.statistics}]}}
+
+
+def sample(usr: float) -> dict:
+    return {
+        "timestamp": "10:00:00 AM",
+        "cpu-load": [
+            {"cpu": "0", "usr": usr, "sys": 1.0},
+            {"cpu": "1", "usr": usr * 2, "sys": 2.0},
+        ],
+        "soft-interrupts": [
+            {"cpu": "0", "intr": [{"name": "HI", "value": 1.0}, {"name": "NET_RX", "value": 3.0}]},
+        ],
+    }
+
+
+def test_mpstat_table(tmp_path):
+    stats = SystemStats.__new__(SystemStats)
+    stats.stat = MpstatOutput([sample(10.0), sample(20.0)])
+    table = stats.collect_table()
+    assert set(table.columns) == {"cpu", "metric", "value"}
+    # one row per cpu and metric, averaged over the samples
+    usr = table[table["metric"] == "usr"].set_index("cpu")["value"]
+    assert usr.to_dict() == {"0": 15.0, "1": 30.0}
+    assert set(table["metric"]) == {"usr", "sys", "HI", "NET_RX"}
+
+    run_dir = tmp_path / "campaign" / "run-1"
+    run_dir.mkdir(parents=True)
+    save_table(run_dir, "mpstat", table)
+    results = pd.DataFrame({"point_id": [get_point_id(run_dir)] * 2, "throughput": [1, 2]})
+    joined = join_table(results, read_table(tmp_path / "campaign", "mpstat"), metrics=["usr"])
+    assert list(joined.columns) == ["point_id", "throughput", "usr_c0", "usr_c1"]
+    assert list(joined["usr_c1"]) == [30.0, 30.0]
+
+
+def test_numeric_point_id(tmp_path):
+    table = pd.DataFrame({"cpu": ["0"], "metric": ["usr"], "value": [1.0]})
+    (tmp_path / "run-1").mkdir()
+    save_table(tmp_path / "run-1", "mpstat", table)
+    path = get_table_path(tmp_path / "run-1", "mpstat")
+    for point_id in ("123456789012", "12e456789012"):
+        df = pd.read_csv(path, sep=";", dtype=str).assign(point_id=point_id)
+        df.to_csv(path, sep=";", index=False)
+        results = pd.DataFrame({"point_id": [point_id], "throughput": [1]})
+        joined = join_table(results, read_table(tmp_path, "mpstat"))
+        assert list(joined["usr_c0"]) == [1.0]
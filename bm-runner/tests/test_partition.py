@@ -0,0 +1,30 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from bm_throughput import split_points
+from test_topology import make_sysfs
+from utils.partition import make_partitions
+
+
+def test_partitions_follow_numa_nodes(tmp_path):
+    partitions = make_partitions(make_sysfs(tmp_path), count=2, port_stride=10)
+    assert [p.cpus for p in partitions] == [[0, 4, 1, 5], [2, 6, 3, 7]]
+    assert [p.port_offset for p in partitions] == [0, 10]
+    assert not any(p.shared_core or p.shared_llc or p.shared_numa for p in partitions)
+
+
+def test_partitions_sharing_a_core(tmp_path):
+    partitions = make_partitions(make_sysfs(tmp_path), count=3, port_stride=10)
+    assert [p.cpus for p in partitions] == [[0, 4, 1], [5, 2, 6], [3, 7]]
+    # cpus 1 and 5 are siblings, 3 and 7 are on another core of the second node
+    assert [(p.shared_core, p.shared_numa) for p in partitions] == [
+        (True, True),
+        (True, True),
+        (False, True),
+    ]
+
+
+def test_split_points():
+    points = [{"container_cnt": c, "nb_threads": 1} for c in (1, 2, 4, 8)]
+    groups = split_points(points, 2)
+    assert [[p["container_cnt"] for p in g] for g in groups] == [[8], [4, 2, 1]]
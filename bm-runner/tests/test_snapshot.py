@@ -0,0 +1,53 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from bm_snapshot import SnapshotCache, fingerprint, diff
+
+
+def test_fingerprint_ignores_volatile():
+    snapshot = {"kernel.release": "6.6", "loadavg": "0.10 0.20 0.30 1/100 42"}
+    other = dict(
+        snapshot,
+        loadavg="9.00 9.00 9.00 5/100 43",
+        **{"sysctl.kernel.perf_event_max_sample_rate": "25000"},
+    )
+    assert fingerprint(snapshot) == fingerprint(other)
+    assert fingerprint(snapshot) != fingerprint(dict(snapshot, **{"kernel.release": "6.8"}))
+
+
+def test_fingerprint_ignores_containers():
+    snapshot = {"kernel.release": "6.6", "sysctl.net.ipv4.conf.all.forwarding": "1"}
+    running = dict(
+        snapshot,
+        **{
+            "mount./var/lib/docker/overlay2/abc/merged": "overlay overlay rw",
+            "mount./run/docker/netns/abc": "nsfs nsfs rw",
+            "sysctl.net.ipv4.conf.veth1a2b.forwarding": "1",
+            "sysctl.net.ipv6.neigh.veth1a2b.retrans_time_ms": "1000",
+            "sysctl.fs.aio-nr": "12",
+            "irq.42.smp_affinity": "f",
+        },
+    )
+    assert fingerprint(snapshot) == fingerprint(running)
+    forwarding = {"sysctl.net.ipv4.conf.all.forwarding": "0"}
+    assert fingerprint(snapshot) != fingerprint(dict(snapshot, **forwarding))
+
+
+def test_diff():
+    old = {"a": "1", "b": "2"}
+    new = {"b": "3", "c": "4"}
+    expected = {"a": ["1", None], "b": ["2", "3"], "c": [None, "4"]}
+    assert diff(old, new) == expected
+
+
+def test_cache_stores_changes_only(tmp_path):
+    cache = SnapshotCache(str(tmp_path))
+    base = {"kernel.release": "6.6", "sysctl.vm.swappiness": "60"}
+    base_fp = cache.store(base)
+    changed = dict(base, **{"sysctl.vm.swappiness": "10"})
+    changed_fp = cache.store(changed)
+
+    assert cache.latest() == changed_fp
+    assert cache.load(base_fp) == base
+    assert cache.load(changed_fp) == changed
+    assert cache.store(changed) == changed_fp
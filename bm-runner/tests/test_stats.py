@@ -0,0 +1,21 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import math
+from utils.stats import relative_ci, t_quantile
+
+
+def test_t_quantile():
+    # exact values of the 97.5% quantile
+    for df, t in [(2, 4.303), (3, 3.182), (5, 2.571), (30, 2.042)]:
+        assert abs(t_quantile(0.975, df) - t) / t < 0.01
+    assert abs(t_quantile(0.975, 1) - 12.706) < 0.001
+    assert abs(t_quantile(0.975, 2) - 4.303) < 0.001
+
+
+def test_relative_ci():
+    assert relative_ci([100.0]) == math.inf
+    assert relative_ci([100.0, 100.0, 100.0]) == 0
+    # mean 100, stdev 10, 4 samples: 3.182 * 10 / 2 / 100
+    samples = [100 + 10 * x / math.sqrt(4 / 3) for x in (-1, -1, 1, 1)]
+    assert abs(relative_ci(samples) - 0.1591) < 0.001
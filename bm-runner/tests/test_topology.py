@@ -0,0 +1,70 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from config.container import PlacementPolicy
+from utils.topology import Topology, parse_cpu_list, place
+
+
+def make_sysfs(root, isolated=""):
+    # 2 packages/NUMA nodes with 2 cores of 2 hardware threads each,
+    # siblings are numbered cpu and cpu + 4 like on most x86 hosts.
+    (root / "online").write_text("0-7\n")
+    (root / "isolated").write_text(f"{isolated}\n")
+    for cpu in range(8):
+        package = (cpu % 4) // 2
+        cpu_dir = root / f"cpu{cpu}"
+        (cpu_dir / "topology").mkdir(parents=True)
+        (cpu_dir / "topology" / "physical_package_id").write_text(f"{package}\n")
+        (cpu_dir / "topology" / "core_id").write_text(f"{cpu % 2}\n")
+        (cpu_dir / f"node{package}").mkdir()
+        llc = cpu_dir / "cache" / "index3"
+        llc.mkdir(parents=True)
+        (llc / "level").write_text("3\n")
+        (llc / "shared_cpu_list").write_text("0-1,4-5\n" if package == 0 else "2-3,6-7\n")
+    return Topology(str(root))
+
+
+def cpus_of(placements):
+    return [p.cpus for p in placements]
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("0-2,5,7-8\n") == [0, 1, 2, 5, 7, 8]
+
+
+def test_compact(tmp_path):
+    topology = make_sysfs(tmp_path)
+    placements = place(topology, PlacementPolicy.COMPACT, count=2, cores_per_unit=2)
+    assert cpus_of(placements) == [[0, 4], [1, 5]]
+    assert [p.mems for p in placements] == [[0], [0]]
+
+
+def test_spread_numa(tmp_path):
+    topology = make_sysfs(tmp_path)
+    placements = place(topology, PlacementPolicy.SPREAD_NUMA, count=3, cores_per_unit=1)
+    assert cpus_of(placements) == [[0], [2], [4]]
+
+
+def test_physical_core(tmp_path):
+    topology = make_sysfs(tmp_path)
+    placements = place(topology, PlacementPolicy.PHYSICAL_CORE, count=4, cores_per_unit=1)
+    assert cpus_of(placements) == [[0], [1], [2], [3]]
+
+
+def test_llc_aligned(tmp_path):
+    topology = make_sysfs(tmp_path)
+    placements = place(topology, PlacementPolicy.LLC_ALIGNED, count=2, cores_per_unit=3)
+    assert cpus_of(placements) == [[0, 4, 1], [2, 6, 3]]
+
+
+def test_avoid_housekeeping(tmp_path):
+    topology = make_sysfs(tmp_path)
+    placements = place(topology, PlacementPolicy.AVOID_HOUSEKEEPING, count=1, cores_per_unit=2)
+    assert cpus_of(placements) == [[1, 5]]
+
+    (tmp_path / "isolcpus").mkdir()
+    topology = make_sysfs(tmp_path / "isolcpus", isolated="6-7")
+    placements = place(topology, PlacementPolicy.AVOID_HOUSEKEEPING, count=1, cores_per_unit=2)
+    assert cpus_of(placements) == [[6, 7]]
+    placements = place(topology, PlacementPolicy.COMPACT, count=4, cores_per_unit=2)
+    assert all(6 not in cpus and 7 not in cpus for cpus in cpus_of(placements[:3]))
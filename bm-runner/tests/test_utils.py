@@ -3,7 +3,7 @@
 
 import os
 from pathlib import Path
-from bm_utils import resolve_path, ensure_exists
+from bm_utils import resolve_path, ensure_exists, mask_keys, find_free_port_range
 
 
 def csb_dir() -> Path:
@@ -84,3 +84,32 @@ def test_ensure_exists_env_var():
     expected = os.path.join(real_dir, input_name)
     actual = ensure_exists(name=input_name, dir=input_path, env_var_dir=input_env_var)
     assert actual == expected
+
+
+#################################
+# mask_keys tests
+#################################
+def test_mask_keys_nested():
+    input_ = {"Id": "abc", "State": {"Pid": 42, "Status": "running"}, "Mounts": [{"ID": "x"}]}
+    expected = {
+        "Id": "MASKED",
+        "State": {"Pid": "MASKED", "Status": "running"},
+        "Mounts": [{"ID": "MASKED"}],
+    }
+    actual = mask_keys(input_, {"Id", "ID", "Pid"}, mask="MASKED")
+    assert actual == expected
+
+
+#################################
+# find_free_port_range tests
+#################################
+def test_find_free_port_range_free():
+    assert find_free_port_range(8000, 4, used={7999, 8004}) == 8000
+
+
+def test_find_free_port_range_skips_busy():
+    assert find_free_port_range(8000, 4, used={8001, 8005}) == 8006
+
+
+def test_find_free_port_range_none():
+    assert find_free_port_range(65534, 4, used=set()) is None
@@ -0,0 +1,43 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import glob
+import os
+import matplotlib
+from bm_visualize import visualize_in_html
+from config.plot import PlotConfig, PlotType
+
+# switches the backend of pyplot, already imported by bm_visualize
+matplotlib.use("Agg")
+
+
+def test_report_links_each_figure_once(tmp_path):
+    output_dir = tmp_path / "campaign"
+    os.makedirs(output_dir / "run")
+    svg = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="321"></svg>'
+    (output_dir / "run" / "flamegraph.svg").write_text(svg)
+    lines = [
+        "hostname;noise;nb_threads;container_cnt;execution_unit;throughput_min;op_count;op_succ_count"
+    ]
+    lines += [
+        f"h;{noise};{threads};{count};native;{count * 10};10;{count * 5}"
+        for noise in (0, 1)
+        for threads in (1, 2)
+        for count in (1, 2)
+    ]
+    (tmp_path / "campaign.csv").write_text("\n".join(lines) + "\n")
+
+    plots = [PlotConfig(), PlotConfig(y="op", type=PlotType.SUCCESS_PERCENT)]
+    visualize_in_html(output_dir, "test", plots)
+
+    html = (tmp_path / "campaign.html").read_text()
+    assert "base64" not in html and "srcdoc" not in html
+    graphs = glob.glob(str(output_dir / "**" / "*.png"), recursive=True)
+    # the plots of each noise and threads combination, and the flamegraph
+    assert len(graphs) == 8
+    for key in ("n=0-t=1", "n=0-t=2", "n=1-t=1", "n=1-t=2"):
+        assert len([g for g in graphs if key in g]) == 2
+    for graph in graphs + [str(output_dir / "run" / "flamegraph.svg")]:
+        assert html.count(f'src="{os.path.relpath(graph, tmp_path)}"') == 1
+    assert html.count('loading="lazy"') == 9
+    assert 'height="321px"' in html
@@ -0,0 +1,144 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+import re
+from typing import Callable, Iterable, Optional
+
+# An adapter reads the output of a benchmark line by line, and returns it
+# as `<key>=<val>;` pairs, one line per result.
+AdapterFn = Callable[[Iterable[str]], str]
+
+ADAPTERS: dict[str, AdapterFn] = {}
+
+
+def register(*names: str):
+    """
+    Registers the decorated function as the adapter of the given names. The shipped adapters are
+    also registered under the name of the script in scripts/adapters they replace.
+    """
+
+    def decorator(fn: AdapterFn) -> AdapterFn:
+        for name in names:
+            ADAPTERS[name] = fn
+        return fn
+
+    return decorator
+
+
+def get_adapter(name: str) -> Optional[AdapterFn]:
+    return ADAPTERS.get(name)
+
+
+@register("fio", "fio-adapter.sh")
+def adapt_fio(lines: Iterable[str]) -> str:
+    # e.g. `   READ: bw=346MiB/s (363MB/s), 346MiB/s-346MiB/s (363MB/s-363MB/s), io=...`
+    result = ""
+    for line in lines:
+        if "READ:" in line:
+            fields = line.split()
+            bw = fields[1].replace("MiB/s", "", 1) if len(fields) > 1 else ""
+            result += f"read_MiB_{bw};"
+    return f"{result}\n" if result else ""
+
+
+@register("stress-ng", "stress-ng-adapter.sh")
+def adapt_stress_ng(lines: Iterable[str]) -> str:
+    # the third metrics line is the first stressor, after the two header lines
+    keys = [
+        "stressor",
+        "ops",
+        "real_time",
+        "usr_time",
+        "sys_time",
+        "throughput_real",
+        "throughput_cpus",
+        "cpu_percent",
+        "rss_max",
+    ]
+    count = 0
+    for line in lines:
+        if "stress-ng: metrc:" in line:
+            count += 1
+            if count == 3:
+                fields = line.split()[3:12]
+                fields += [""] * (len(keys) - len(fields))
+                return "".join(f"{k}={v};" for k, v in zip(keys, fields)) + "\n"
+    return ""
+
+
+@register("will-it-scale", "will-it-scale-adapter.sh")
+def adapt_will_it_scale(lines: Iterable[str]) -> str:
+    result = ""
+    for line in lines:
+        if "average:" in line:
+            fields = line.rstrip("\n").split(":")
+            result += f"average={fields[1]};\n"
+    return result
+
+
+LPS_RE = re.compile(r"([0-9.]+)\s+lps")
+
+
+@register("byte-unixbench", "byte-unixbench-adapter.sh")
+def adapt_byte_unixbench(lines: Iterable[str]) -> str:
+    result = ""
+    for line in lines:
+        m = LPS_RE.search(line)
+        if m:
+            result += f"throughput_lps={m.group(1)};\n"
+    return result
+
+
+@register("redis-server", "redis-server-adapter.sh")
+def adapt_redis_server(lines: Iterable[str]) -> str:
+    # the results of redis are collected by the redis_benchmark monitor
+    return "average=0;\n"
+
+
+# version of the JSON record of the builtin benchmarks run with `-o=json`
+BENCH_RECORD_VERSION = 2
+BENCH_RECORD_PREFIX = '{"version":'
+OP_STATS = ["max", "min", "sum", "count", "succ_count", "skipped_count", "avg", "succ_percent"]
+
+
+def _fmt(value) -> str:
+    # the record has no infinity and NaN, they are null
+    return "nan" if value is None else str(value)
+
+
+def decode_bench_record(record: dict) -> str:
+    """
+    Decodes the JSON record of a builtin benchmark in the `<key>=<val>;` pairs of its text output.
+    """
+    version = record.get("version")
+    if version != BENCH_RECORD_VERSION:
+        raise ValueError(f"unsupported benchmark record version {version}")
+    params = record["params"]
+    pairs = [f"{k}={params[k]};" for k in ("num_threads", "init_sz", "max_noise", "duration")]
+    pairs += [f"op{i}_dist={v};" for i, v in enumerate(params["op_dist"])]
+    pairs.append(f"algo_name={record['target']};")
+    if record["extra"]:
+        pairs.append(f"{record['extra'].rstrip(';')};")
+    for op in record["ops"]:
+        name = op["name"]
+        pairs += [f"{name}_{k}={_fmt(op[k])};" for k in OP_STATS]
+        pairs.append(f"{name}_histogram={','.join(map(str, op['histogram']))};")
+    pairs += [f"univ_{k}={_fmt(record['univ'][k])};" for k in OP_STATS]
+    pairs += [f"throughput_{k}={_fmt(v)};" for k, v in record["throughput"].items()]
+    pairs.append(f"ticks_to_ms={record['ticks_to_ms']};")
+    pairs += [f"duration_{k}={v};" for k, v in record["duration"].items()]
+    pairs += [f"{k}={v};" for k, v in record["rusage"].items()]
+    return "".join(pairs)
+
+
+@register("bench-json")
+def adapt_bench_json(lines: Iterable[str]) -> str:
+    # the other lines, e.g. the output of the external applications, are kept as they are
+    result = ""
+    for line in lines:
+        if line.startswith(BENCH_RECORD_PREFIX):
+            result += f"{decode_bench_record(json.loads(line))}\n"
+        else:
+            result += line
+    return result
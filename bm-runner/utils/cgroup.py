@@ -0,0 +1,103 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+### Reference: https://docs.kernel.org/admin-guide/cgroup-v2.html
+import os
+import time
+from typing import Optional
+
+CGROUP_MOUNT = "/sys/fs/cgroup"
+# controllers enabled for the cgroups of the execution units
+CONTROLLERS = ["cpuset", "cpu", "memory"]
+
+
+def is_cgroup2(mount: str = CGROUP_MOUNT) -> bool:
+    """
+    Whether the unified cgroup v2 hierarchy is mounted at `mount`.
+    """
+    return os.path.exists(os.path.join(mount, "cgroup.controllers"))
+
+
+def parse_stat(text: str) -> dict[str, int]:
+    """
+    Parses a flat keyed cgroup file like `cpu.stat` or `memory.stat`.
+    """
+    stat = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(" ")
+        if value.strip().isdigit():
+            stat[key] = int(value)
+    return stat
+
+
+class Cgroup:
+    """
+    A cgroup v2 created and configured directly through cgroupfs.
+    """
+
+    REMOVE_TIMEOUT_IN_SEC = 5
+
+    def __init__(self, path: str, mount: str = CGROUP_MOUNT):
+        self.mount = mount
+        self.path = path
+
+    def read(self, fname: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.path, fname)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def write(self, fname: str, value: str):
+        with open(os.path.join(self.path, fname), "w") as f:
+            f.write(value)
+
+    def read_stat(self, fname: str) -> dict[str, int]:
+        return parse_stat(self.read(fname) or "")
+
+    def create(self, controllers: list[str] = CONTROLLERS):
+        """
+        Creates the cgroup with its missing parents, and enables the controllers
+        for the cgroup on every level from the root of the hierarchy.
+        """
+        relative = os.path.relpath(self.path, self.mount)
+        parent = self.mount
+        enable = " ".join(f"+{c}" for c in controllers)
+        for part in relative.split(os.sep):
+            with open(os.path.join(parent, "cgroup.subtree_control"), "w") as f:
+                f.write(enable)
+            parent = os.path.join(parent, part)
+            os.makedirs(parent, exist_ok=True)
+
+    def attach(self, pid: int):
+        """
+        Moves a process into the cgroup, the children it forks afterwards stay in it.
+        """
+        self.write("cgroup.procs", str(pid))
+
+    def is_populated(self) -> bool:
+        events = self.read_stat("cgroup.events")
+        return events.get("populated", 0) == 1
+
+    def kill(self):
+        """
+        Kills all the processes of the cgroup. `cgroup.kill` requires Linux 5.14,
+        the caller is responsible for killing the processes on older kernels.
+        """
+        if os.path.exists(os.path.join(self.path, "cgroup.kill")):
+            self.write("cgroup.kill", "1")
+
+    def remove(self) -> bool:
+        """
+        Removes the cgroup once its processes are gone, returns False if it is still populated
+        after `REMOVE_TIMEOUT_IN_SEC`.
+        """
+        if not os.path.exists(self.path):
+            return True
+        deadline = time.time() + self.REMOVE_TIMEOUT_IN_SEC
+        while self.is_populated():
+            if time.time() > deadline:
+                return False
+            time.sleep(0.01)
+        os.rmdir(self.path)
+        return True
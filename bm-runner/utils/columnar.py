@@ -0,0 +1,180 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+### Reference: https://arrow.apache.org/docs/python/parquet.html
+import glob
+import importlib.util
+import os
+import shutil
+from typing import Any, Iterable, Optional
+import pandas as pd
+
+# Typed columnar copy of the results CSV of a campaign, `<base_data_dir>.parquet`.
+# Parquet files cannot be appended to, each run writes its rows in a part file of the directory.
+PARQUET_EXT = "parquet"
+HISTOGRAM_SUFFIX = "_histogram"
+# identifiers are kept as strings even when they look like numbers, e.g. a hex `point_id`
+STRING_COLUMNS = {
+    "point_id",
+    "hostname",
+    "app",
+    "algo_name",
+    "execution_unit",
+    "execution_type",
+    "namespaces",
+}
+
+
+def is_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def get_store_path(base_data_dir) -> str:
+    return f"{base_data_dir}.{PARQUET_EXT}"
+
+
+def to_value(key: str, value: Any) -> Any:
+    """
+    Converts a result value, written as a string by the adapters and the monitors, to its type.
+    Histograms become lists of bucket counts, the other values are kept as they are written
+    in the CSV when they are not numbers.
+    """
+    if key in STRING_COLUMNS:
+        return str(value)
+    if isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    if key.endswith(HISTOGRAM_SUFFIX):
+        return [int(count) for count in text.split(",") if count.strip() != ""]
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def to_records(lines: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Converts the values of the result lines, a column with both numbers and strings
+    is kept as strings.
+    """
+    records = [{k: to_value(k, v) for k, v in line.items()} for line in lines]
+    mixed = {
+        k
+        for k in set().union(*records)
+        if len({isinstance(r[k], str) for r in records if r.get(k) is not None}) > 1
+    }
+    for record in records:
+        for k in mixed & set(record):
+            record[k] = str(record[k])
+    return records
+
+
+def _get_common_type(types: list):
+    import pyarrow as pa
+
+    types = [t for t in types if not pa.types.is_null(t)]
+    if not types:
+        return pa.null()
+    if all(t == types[0] for t in types):
+        return types[0]
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    if all(pa.types.is_list(t) for t in types):
+        # the empty histograms have no value type
+        return next((t for t in types if not pa.types.is_null(t.value_type)), types[0])
+    return pa.string()
+
+
+def _get_common_types(schemas: list) -> dict[str, Any]:
+    types: dict[str, list] = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, []).append(field.type)
+    return {name: _get_common_type(column_types) for name, column_types in types.items()}
+
+
+def append_rows(store_path: str, lines: list[dict[str, Any]]):
+    """
+    Appends the result lines of a run to the store as a new part file.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(store_path, exist_ok=True)
+    part = len(glob.glob(os.path.join(store_path, f"*.{PARQUET_EXT}")))
+    table = pa.Table.from_pylist(to_records(lines))
+    pq.write_table(table, os.path.join(store_path, f"part-{part:06d}.{PARQUET_EXT}"))
+
+
+def merge_stores(store_paths: list[str], output_path: str):
+    """
+    Merges the stores of several campaigns by copying their part files in `output_path`.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    part = 0
+    for store_path in store_paths:
+        for f in sorted(glob.glob(os.path.join(store_path, f"*.{PARQUET_EXT}"))):
+            shutil.copyfile(f, os.path.join(output_path, f"part-{part:06d}.{PARQUET_EXT}"))
+            part += 1
+
+
+def read_columns(store_path: str, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Reads the store, only loading the given columns that exist in it. The runs do not all have
+    the same columns, e.g. the per thread ones, and the types of a column may differ between
+    runs, e.g. integers in a run and strings in another: the parts are cast to a common type.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    files = sorted(glob.glob(os.path.join(store_path, f"*.{PARQUET_EXT}")))
+    schemas = [pq.read_schema(f) for f in files]
+    types = _get_common_types(schemas)
+    names = list(types) if columns is None else [c for c in dict.fromkeys(columns) if c in types]
+    tables = []
+    for f, schema in zip(files, schemas):
+        table = pq.read_table(f, columns=[n for n in names if n in schema.names])
+        tables.append(table.cast(pa.schema([(n, types[n]) for n in table.column_names])))
+    # the columns missing from a part are null
+    return pa.concat_tables(tables, promote_options="default").select(names).to_pandas()
+
+
+def read_constant_columns(store_path: str) -> dict[str, Any]:
+    """
+    Returns the columns that have the same value in all the rows of the store, from the
+    statistics of the part files, without reading their data.
+    """
+    import pyarrow.parquet as pq
+
+    parts = []
+    for part in sorted(glob.glob(os.path.join(store_path, f"*.{PARQUET_EXT}"))):
+        metadata = pq.ParquetFile(part).metadata
+        values: dict[str, Any] = {}
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                # the nested columns, i.e. the histograms, are never constant
+                if "." in column.path_in_schema:
+                    continue
+                stats = column.statistics
+                constant = (
+                    stats is not None
+                    and stats.has_min_max
+                    and stats.null_count == 0
+                    and stats.min == stats.max
+                )
+                value = stats.min if constant else None
+                if i > 0 and values.get(column.path_in_schema) != value:
+                    value = None
+                values[column.path_in_schema] = value
+        parts.append(values)
+    if not parts:
+        return {}
+    return {
+        k: v
+        for k, v in parts[0].items()
+        if v is not None and all(part.get(k) == v for part in parts[1:])
+    }
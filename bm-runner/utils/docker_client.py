@@ -0,0 +1,57 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+### Reference: https://docker-py.readthedocs.io/en/stable/client.html
+import docker
+import threading
+from typing import Optional, Tuple
+
+# Number of connections kept open to the docker daemon socket. It bounds the number of
+# concurrent API calls, e.g. when containers are launched with a high `parallelism`.
+MAX_POOL_SIZE = 64
+
+_client: Optional[docker.DockerClient] = None
+_lock = threading.Lock()
+_api_calls = 0
+_api_time_sec = 0.0
+
+
+def _count_api_call(response, *args, **kwargs):
+    global _api_calls, _api_time_sec
+    with _lock:
+        _api_calls += 1
+        _api_time_sec += response.elapsed.total_seconds()
+
+
+def get_docker_client() -> docker.DockerClient:
+    """
+    Returns the docker client shared by the whole process, creating it on first use.
+    The low level API is available through its `api` attribute.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = docker.from_env(max_pool_size=MAX_POOL_SIZE)
+            _client.api.hooks["response"].append(_count_api_call)
+        return _client
+
+
+def get_docker_api_stats() -> Tuple[int, float]:
+    """
+    Returns the number of docker API calls made so far and the total time in seconds
+    spent waiting for the daemon to answer them.
+    """
+    with _lock:
+        return _api_calls, _api_time_sec
+
+
+def reset_docker_client():
+    """
+    Drops the client inherited from the parent process, e.g. after a fork, without closing
+    its connections that the parent still uses. A new client is created on next use.
+    """
+    global _client, _api_calls, _api_time_sec
+    with _lock:
+        _client = None
+        _api_calls = 0
+        _api_time_sec = 0.0
@@ -0,0 +1,47 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from typing import Optional
+import pandas as pd
+from pandas import DataFrame
+from utils.logger import bm_log, LogType
+
+
+def compute_linearity(
+    df: DataFrame, count_col: str, subject_col: str, group_cols: list[str]
+) -> Optional[DataFrame]:
+    """
+    Returns the linearity of `subject_col` for each count of `count_col` within each group of
+    `group_cols`: the mean result of the execution units at a count, divided by the result of
+    the single execution unit. A linearity of 1 means that the units do not slow each other down.
+    Returns None when there are no results for a single execution unit.
+    """
+    assert pd.api.types.is_integer_dtype(df[count_col]), f"{count_col} column must be integer dtype"
+    assert pd.api.types.is_numeric_dtype(df[subject_col]), f"{subject_col} must be a number"
+
+    rows = []
+    for group, group_df in df.groupby(group_cols, sort=False):
+        group = group if isinstance(group, tuple) else (group,)
+        # get the values mapped to one execution unit
+        one_eu = group_df.loc[group_df[count_col] == 1, subject_col].values
+        # deduce the performance of one container/execution unit
+        if len(one_eu) == 0:
+            bm_log(
+                "Cannot compute linearity. Make sure to add 1 to the container count in `container_list`",
+                LogType.ERROR,
+            )
+            return None
+        one_avg = one_eu[0]
+        if one_avg == 0.0:
+            bm_log(
+                "Cannot compute linearity. Result for 1 container is 0.0, avoiding division by zero.",
+                LogType.ERROR,
+            )
+            return None
+        for c in group_df[count_col].unique():
+            # calculate the avg/mean for the given count and group
+            n_avg = group_df.loc[group_df[count_col] == c, subject_col].mean()
+            rows.append(
+                {**dict(zip(group_cols, group)), count_col: c, "linearity": n_avg / one_avg}
+            )
+    return DataFrame(rows, columns=group_cols + [count_col, "linearity"])
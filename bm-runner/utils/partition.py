@@ -0,0 +1,74 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from typing import Optional
+from utils.topology import Cpu, Topology
+
+
+class Partition:
+    """
+    A disjoint share of the cpus of the host, running campaign points concurrently
+    with the other partitions in throughput mode.
+    """
+
+    def __init__(self, index: int, count: int, cpus: list[int], port_offset: int = 0):
+        self.index = index
+        self.count = count
+        self.cpus = cpus
+        # added to the first port of the units, the partitions use disjoint port ranges
+        self.port_offset = port_offset
+        # whether the partition shares a physical core, a last level cache or a NUMA node
+        # with another partition, i.e. the points it runs may interfere with the others
+        self.shared_core = False
+        self.shared_llc = False
+        self.shared_numa = False
+
+    def get_flags(self) -> str:
+        return (
+            f"partition={self.index};partitions={self.count};"
+            f"shared_core={int(self.shared_core)};shared_llc={int(self.shared_llc)};"
+            f"shared_numa={int(self.shared_numa)};"
+        )
+
+
+def make_partitions(
+    topology: Topology, count: int, port_stride: int, exclude: Optional[set[int]] = None
+) -> list[Partition]:
+    """
+    Splits the cpus of the host, but those in `exclude`, into `count` partitions of consecutive
+    cpus in topology order, so that partitions follow NUMA nodes and LLC domains when the
+    number of cpus allows it.
+    """
+    exclude = exclude or set()
+    cpus = sorted(
+        (cpu for cpu in topology.cpus.values() if cpu.id not in exclude), key=Cpu.sort_key
+    )
+    assert len(cpus) >= count, f"{len(cpus)} cpus cannot be split in {count} partitions"
+    size, extra = divmod(len(cpus), count)
+    partitions = []
+    groups: list[list[Cpu]] = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(cpus[start:end])
+        partitions.append(
+            Partition(
+                index=i,
+                count=count,
+                cpus=[cpu.id for cpu in cpus[start:end]],
+                port_offset=i * port_stride,
+            )
+        )
+        start = end
+    for partition, group in zip(partitions, groups):
+        others = [cpu for other in groups if other is not group for cpu in other]
+        partition.shared_core = bool(
+            {(c.package, c.core) for c in group} & {(c.package, c.core) for c in others}
+        )
+        partition.shared_llc = bool({c.llc for c in group} & {c.llc for c in others})
+        partition.shared_numa = bool({c.node for c in group} & {c.node for c in others})
+    return partitions
+
+
+# partition of the current process, None when the campaign points run one after another
+g_partition: Optional[Partition] = None
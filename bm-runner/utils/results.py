@@ -0,0 +1,107 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import glob
+import hashlib
+import os
+from typing import Iterable, Optional
+import pandas as pd
+from utils.columnar import get_store_path, merge_stores
+
+# the hex `point_id` may look like a number, e.g. `123456789012` or `12e456789012`
+POINT_ID_DTYPE = {"point_id": str}
+
+
+def read_results(csv_file: str, dtype: Optional[type] = None) -> pd.DataFrame:
+    """
+    Reads the results CSV of a campaign, skipping the comment lines of its header.
+    """
+    return pd.read_csv(
+        csv_file, sep=";", comment="#", engine="python", dtype=dtype or POINT_ID_DTYPE
+    )
+
+
+def merge_results(csv_files: list[str], output_dir: str):
+    """
+    Merges the results of several campaigns in `<output_dir>.csv`, to visualize them together.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    df = pd.concat([read_results(f) for f in csv_files], ignore_index=True)
+    df.to_csv(f"{output_dir}.csv", sep=";", index=False)
+    for name in get_table_names(csv_files):
+        tables = [read_table(os.path.splitext(f)[0], name) for f in csv_files]
+        pd.concat(tables, ignore_index=True).to_csv(
+            get_table_path(output_dir, name), sep=";", index=False
+        )
+    # the columnar stores are merged too when every campaign has one
+    stores = [get_store_path(os.path.splitext(f)[0]) for f in csv_files]
+    if stores and all(os.path.isdir(store) for store in stores):
+        merge_stores(stores, get_store_path(output_dir))
+
+
+# Long-format tables of the monitors, e.g. the per cpu stats of mpstat. They are stored once
+# per run in its record directory, and are joined to the results by `point_id` on demand.
+TABLE_SUFFIX = "-table.csv"
+TABLE_COLUMNS = ["point_id", "cpu", "metric", "value"]
+
+
+def get_point_id(record_data_dir) -> str:
+    """
+    Returns the id of a run of a campaign point, from its record directory.
+    """
+    return hashlib.sha1(str(record_data_dir).encode()).hexdigest()[:12]
+
+
+def get_table_path(record_data_dir, name: str) -> str:
+    return os.path.join(record_data_dir, f"{name}{TABLE_SUFFIX}")
+
+
+def save_table(record_data_dir, name: str, table: pd.DataFrame):
+    """
+    Saves the `cpu`, `metric` and `value` columns of the table of a monitor for a run.
+    """
+    table = table[TABLE_COLUMNS[1:]].copy()
+    table.insert(0, "point_id", get_point_id(record_data_dir))
+    table.to_csv(get_table_path(record_data_dir, name), sep=";", index=False)
+
+
+def get_table_names(csv_files: Iterable[str]) -> list[str]:
+    names = set()
+    for f in csv_files:
+        for path in glob.glob(
+            os.path.join(os.path.splitext(f)[0], "**", f"*{TABLE_SUFFIX}"), recursive=True
+        ):
+            names.add(os.path.basename(path)[: -len(TABLE_SUFFIX)])
+    return sorted(names)
+
+
+def read_table(base_data_dir, name: str) -> pd.DataFrame:
+    """
+    Reads the table of a monitor for all the runs of a campaign.
+    """
+    paths = glob.glob(os.path.join(base_data_dir, "**", f"{name}{TABLE_SUFFIX}"), recursive=True)
+    if not paths:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+    return pd.concat(
+        [pd.read_csv(p, sep=";", dtype={**POINT_ID_DTYPE, "cpu": str}) for p in paths],
+        ignore_index=True,
+    )
+
+
+def join_table(
+    results: pd.DataFrame,
+    table: pd.DataFrame,
+    metrics: Optional[list[str]] = None,
+    cpus: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    """
+    Joins the given metrics and cpus of a monitor table to the results, as `<metric>_c<cpu>`
+    columns. All of them are joined when `metrics` or `cpus` is None.
+    """
+    if metrics is not None:
+        table = table[table["metric"].isin(metrics)]
+    if cpus is not None:
+        table = table[table["cpu"].isin([str(cpu) for cpu in cpus])]
+    wide = table.pivot_table(index="point_id", columns=["metric", "cpu"], values="value")
+    wide.columns = [f"{metric}_c{cpu}" for metric, cpu in wide.columns]
+    return results.merge(wide.reset_index(), on="point_id", how="left")
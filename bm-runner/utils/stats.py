@@ -0,0 +1,36 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import math
+from statistics import NormalDist, mean, stdev
+
+
+def t_quantile(p: float, df: int) -> float:
+    """
+    Quantile of the Student t distribution. It is exact for `df` 1 and 2, and otherwise from
+    the expansion of Abramowitz and Stegun 26.7.5, within 1% of the exact value for `df` >= 3.
+    """
+    # the closed forms of the quantile, the expansion is too narrow for so few samples
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z**3 + z) / (4 * df)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3)
+        + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * df**4)
+    )
+
+
+def relative_ci(samples: list[float], confidence: float = 0.95) -> float:
+    """
+    Returns the half width of the confidence interval of the mean of the samples,
+    relative to the mean. It is infinite with less than 2 samples or a zero mean.
+    """
+    if len(samples) < 2 or mean(samples) == 0:
+        return math.inf
+    t = t_quantile((1 + confidence) / 2, len(samples) - 1)
+    return t * stdev(samples) / math.sqrt(len(samples)) / abs(mean(samples))
@@ -0,0 +1,192 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import glob
+import os
+import re
+from typing import Optional
+from config.container import PlacementPolicy
+from utils.logger import bm_log, LogType
+
+SYS_CPU_DIR = "/sys/devices/system/cpu"
+
+
+def parse_cpu_list(text: str) -> list[int]:
+    """
+    Parses a kernel cpu list like `0-3,8,10-11`.
+    """
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def format_cpu_list(cpus: list[int]) -> str:
+    return ",".join(str(cpu) for cpu in cpus)
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class Cpu:
+    def __init__(self, id: int, package: int, core: int, node: int, llc: int):
+        self.id = id
+        self.package = package
+        self.core = core
+        self.node = node
+        # the lowest cpu sharing the last level cache identifies the LLC domain
+        self.llc = llc
+
+    def sort_key(self):
+        return (self.node, self.llc, self.package, self.core, self.id)
+
+
+class Topology:
+    """
+    CPU topology of the host, read from sysfs.
+    """
+
+    def __init__(self, sys_cpu_dir: str = SYS_CPU_DIR):
+        online = _read(os.path.join(sys_cpu_dir, "online"))
+        ids = (
+            parse_cpu_list(online)
+            if online
+            else sorted(
+                int(m.group(1))
+                for d in glob.glob(os.path.join(sys_cpu_dir, "cpu[0-9]*"))
+                if (m := re.search(r"cpu(\d+)$", d))
+            )
+        )
+        self.cpus = {id: self.__read_cpu(sys_cpu_dir, id) for id in ids}
+        self.isolated = set(parse_cpu_list(_read(os.path.join(sys_cpu_dir, "isolated")) or ""))
+        self.isolated |= set(parse_cpu_list(_read(os.path.join(sys_cpu_dir, "nohz_full")) or ""))
+        self.isolated &= set(self.cpus)
+
+    @staticmethod
+    def __read_cpu(sys_cpu_dir: str, id: int) -> Cpu:
+        cpu_dir = os.path.join(sys_cpu_dir, f"cpu{id}")
+        package = int(_read(os.path.join(cpu_dir, "topology", "physical_package_id")) or 0)
+        core = int(_read(os.path.join(cpu_dir, "topology", "core_id")) or id)
+        nodes = glob.glob(os.path.join(cpu_dir, "node[0-9]*"))
+        node = int(os.path.basename(nodes[0])[len("node") :]) if nodes else 0
+        llc, llc_level = package, -1
+        for index in glob.glob(os.path.join(cpu_dir, "cache", "index[0-9]*")):
+            level = int(_read(os.path.join(index, "level")) or 0)
+            shared = _read(os.path.join(index, "shared_cpu_list"))
+            if shared and level > llc_level:
+                llc, llc_level = min(parse_cpu_list(shared)), level
+        return Cpu(id=id, package=package, core=core, node=node, llc=llc)
+
+    def siblings(self, id: int) -> list[int]:
+        cpu = self.cpus[id]
+        return [c.id for c in self.cpus.values() if (c.package, c.core) == (cpu.package, cpu.core)]
+
+    def nodes_of(self, cpus: list[int]) -> list[int]:
+        return sorted({self.cpus[cpu].node for cpu in cpus if cpu in self.cpus})
+
+
+class Placement:
+    def __init__(self, cpus: list[int], mems: list[int]):
+        self.cpus = cpus
+        self.mems = mems
+
+    @property
+    def cpuset(self) -> str:
+        return format_cpu_list(self.cpus)
+
+    @property
+    def cpuset_mems(self) -> str:
+        return format_cpu_list(self.mems)
+
+
+class _Allocator:
+    """
+    Hands out the cpus of a list in order. Once all of them have been handed out,
+    the cpus are reused from the beginning of the list.
+    """
+
+    def __init__(self, cpus: list[int]):
+        assert len(cpus) > 0, "there should be at least one cpu to place the units on"
+        self.cpus = cpus
+        self.free = list(cpus)
+
+    def take(self, count: int, candidates: Optional[list[int]] = None) -> list[int]:
+        taken = []
+        while len(taken) < count:
+            pool = [cpu for cpu in (candidates or self.free) if cpu in self.free]
+            if not pool:
+                if candidates:
+                    candidates = None
+                    continue
+                bm_log("not enough cores for all the units, reusing cores", LogType.WARNING)
+                self.free = list(self.cpus)
+                continue
+            cpu = pool[0]
+            self.free.remove(cpu)
+            taken.append(cpu)
+        return taken
+
+
+def place(
+    topology: Topology,
+    policy: PlacementPolicy,
+    count: int,
+    cores_per_unit: int,
+    exclude: Optional[set[int]] = None,
+) -> list[Placement]:
+    """
+    Returns the cpus and memory nodes of `count` units of `cores_per_unit` cores each,
+    following the given policy. The cpus in `exclude` are never used.
+    Isolated cpus are only used by the AVOID_HOUSEKEEPING policy.
+    """
+    assert policy != PlacementPolicy.OFFSETS, "offsets are not placed with the topology"
+    exclude = exclude or set()
+    cpus = sorted(
+        (cpu for cpu in topology.cpus.values() if cpu.id not in exclude),
+        key=Cpu.sort_key,
+    )
+    if policy == PlacementPolicy.AVOID_HOUSEKEEPING:
+        isolated = [cpu for cpu in cpus if cpu.id in topology.isolated]
+        if isolated:
+            cpus = isolated
+        else:
+            housekeeping = set(topology.siblings(0)) if 0 in topology.cpus else set()
+            cpus = [cpu for cpu in cpus if cpu.id not in housekeeping] or cpus
+    else:
+        cpus = [cpu for cpu in cpus if cpu.id not in topology.isolated] or cpus
+    if policy == PlacementPolicy.PHYSICAL_CORE:
+        seen = set()
+        first_threads = []
+        for cpu in cpus:
+            if (cpu.package, cpu.core) not in seen:
+                seen.add((cpu.package, cpu.core))
+                first_threads.append(cpu)
+        cpus = first_threads
+
+    allocator = _Allocator([cpu.id for cpu in cpus])
+    nodes = sorted({cpu.node for cpu in cpus})
+    llcs = sorted({cpu.llc for cpu in cpus})
+    placements = []
+    for i in range(count):
+        candidates = None
+        if policy == PlacementPolicy.SPREAD_NUMA:
+            node = nodes[i % len(nodes)]
+            candidates = [cpu.id for cpu in cpus if cpu.node == node]
+        elif policy == PlacementPolicy.LLC_ALIGNED:
+            # the first LLC domain with enough free cpus for the whole unit
+            for llc in llcs:
+                domain = [cpu.id for cpu in cpus if cpu.llc == llc and cpu.id in allocator.free]
+                if len(domain) >= cores_per_unit:
+                    candidates = domain
+                    break
+        unit_cpus = allocator.take(cores_per_unit, candidates)
+        placements.append(Placement(cpus=unit_cpus, mems=topology.nodes_of(unit_cpus)))
+    return placements